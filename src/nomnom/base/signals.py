@@ -1,3 +1,7 @@
 from django.dispatch import Signal
 
 index_content_load = Signal()
+
+# Sent with the category when the proposed work names of all of its nominations may have
+# changed, after their normalized names have been brought up to date.
+nomination_names_changed = Signal()
@@ -2,6 +2,7 @@ import contextvars
 import csv
 import functools
 import io
+import pickle
 from collections import Counter
 from collections.abc import Iterable
 from itertools import groupby
@@ -12,10 +13,12 @@ import sentry_sdk
 from django import forms
 from django.contrib import admin, messages
 from django.contrib.auth.decorators import permission_required, user_passes_test
+from django.contrib.postgres.aggregates import StringAgg
+from django.core.cache import cache
 from django.db import IntegrityError, transaction
-from django.db.models import CharField, Count, F, Q, QuerySet
+from django.db.models import CharField, Count, F, Q, QuerySet, Sum, TextField
 from django.db.models.expressions import Value
-from django.db.models.functions import Concat
+from django.db.models.functions import MD5, Cast, Coalesce, Concat
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
@@ -27,18 +30,26 @@ from django_admin_action_forms import (
     AdminActionFormsMixin,
     action_with_form,
 )
+from django_svcs.apps import svcs_from
 from waffle.decorators import waffle_switch
 
-from nomnom.canonicalize import models
+from nomnom.canonicalize import clustering, models
 from nomnom.canonicalize.feature_switches import (
     SWITCH_FINALIST_CSV_TABLE,
     SWITCH_SANKEY_DIAGRAM,
 )
 from nomnom.canonicalize.sankey import transform_eph_to_sankey
+from nomnom.convention import HugoAwards, NominationCounter
+from nomnom.nominate import changes
 from nomnom.nominate import models as nominate
 from nomnom.reporting import Report, ReportView
-from nomnom.wsfs.rules import eph
-from nomnom.wsfs.rules.constitution_2023 import CountData
+from nomnom.wsfs.rules import incremental_eph
+from nomnom.wsfs.rules.constitution_2023 import (
+    EPHBallots,
+    InternedBallots,
+    StepLog,
+    deduplicate_ballots,
+)
 
 # This contextvar is used to plumb the current request down into the rendering for the list view
 # template, which otherwise can't see it. That allows the view code to make the button include a
@@ -130,29 +141,10 @@ class GroupNominationsForm(AdminActionForm):
                 "The nominations selected must come from exactly one election"
             )
 
-        similarity_totals: dict[int, float] = {}
-        similarity_counts: dict[int, int] = {}
-        works_by_pk: dict[int, models.Work] = {}
-        nomination_count = queryset.count()
-        for nomination in queryset:
-            works = models.Work.find_fuzzy_matches(
-                nomination.proposed_work_name(), nomination.category
-            )
-            for work in works:
-                similarity_totals[work.pk] = (
-                    similarity_totals.get(work.pk, 0) + work.similarity
-                )
-                similarity_counts[work.pk] = similarity_counts.get(work.pk, 0) + 1
-                works_by_pk[work.pk] = work
-
-        avg_similarity: dict[int, float] = {
-            pk: similarity_totals[pk] / nomination_count for pk in works_by_pk
-        }
-        self.matching_works = sorted(
-            works_by_pk.values(), key=lambda w: avg_similarity[w.pk], reverse=True
-        )
+        # every nomination is scored against the works at once, however many there are
+        self.matching_works = models.Work.find_group_matches(queryset)
         for work in self.matching_works:
-            work.similarity_pct = round(avg_similarity[work.pk] * 100)
+            work.similarity_pct = round(work.similarity * 100)
 
     class Meta:
         help_text = "Select work to group under"
@@ -469,9 +461,105 @@ class NominationGroupingView(AdminActionFormsMixin, admin.ModelAdmin):
         return request.get_full_path() if request else ""
 
 
+class ProposedGroupNameInline(admin.TabularInline):
+    model = models.ProposedGroupName
+    extra = 0
+    can_delete = False
+    fields = ["name", "nominations", "similarity_pct"]
+    readonly_fields = fields
+
+    @admin.display(description="Similarity")
+    def similarity_pct(self, obj):
+        return f"{obj.similarity:.0%}"
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+class AcceptProposedGroupsForm(AdminActionForm):
+    class Meta:
+        help_text = "Group the nominations of each of these proposals?"
+        list_objects = True
+
+
+@action_with_form(AcceptProposedGroupsForm, description="Accept proposed groups")
+def accept_proposed_groups(
+    modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet, data: dict
+) -> None:
+    grouped = 0
+    for group in queryset.select_related("category", "work"):
+        if clustering.accept_group(group) is not None:
+            grouped += 1
+    messages.success(request, f"Grouped the nominations of {grouped} proposals")
+
+
+@admin.action(description="Dismiss proposed groups")
+def dismiss_proposed_groups(
+    modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet
+) -> None:
+    queryset.delete()
+
+
+class ProposedGroupAdmin(AdminActionFormsMixin, admin.ModelAdmin):
+    """The review screen for the groups proposed by `nomnom.canonicalize.clustering`."""
+
+    list_display = [
+        "name",
+        "proposed_work",
+        "category",
+        "confidence_pct",
+        "names_count",
+        "nominations_count",
+    ]
+    list_filter = [ElectionFilter, CategoryFilter]
+    fields = ["name", "category", "work", "confidence_pct", "proposed_at"]
+    readonly_fields = fields
+    inlines = [ProposedGroupNameInline]
+
+    actions = [accept_proposed_groups, dismiss_proposed_groups]
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet:
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("category", "work")
+            .annotate(
+                names_count=Count("names"),
+                nominations_count=Sum("names__nominations"),
+            )
+            .order_by("-confidence", "name")
+        )
+
+    @admin.display(description="Group Under", ordering="work__name")
+    def proposed_work(self, obj):
+        if obj.work is None:
+            return "(new work)"
+        link = reverse("admin:canonicalize_work_change", args=[obj.work.id])
+        return format_html('<a href="{}">{}</a>', link, obj.work.name)
+
+    @admin.display(description="Confidence", ordering="confidence")
+    def confidence_pct(self, obj):
+        return f"{obj.confidence:.0%}"
+
+    @admin.display(description="Names", ordering="names_count")
+    def names_count(self, obj):
+        return obj.names_count
+
+    @admin.display(description="Nominations", ordering="nominations_count")
+    def nominations_count(self, obj):
+        return obj.nominations_count
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 # Register your models here.
 admin.site.register(models.Work, WorkAdmin)
 admin.site.register(models.CanonicalizedNomination, NominationGroupingView)
+admin.site.register(models.ProposedGroup, ProposedGroupAdmin)
 
 report_decorators = [
     user_passes_test(lambda u: u.is_staff, login_url="/admin/login/"),
@@ -542,26 +630,148 @@ class BallotReportView(ReportView):
         return self.get_report_class()(self.category())
 
 
-def nominating_ballots_from_category(category: nominate.Category) -> list[Counter[str]]:
+def nominating_ballots_from_category(category: nominate.Category) -> InternedBallots:
     ballot_builder = BallotReport(category)
     ballot_objs = [r[1:] for r in ballot_builder.get_report_rows()]
-    return [Counter(w.name for w in ballot) for ballot in ballot_objs]
+    # Many members cast identical ballots; EPH only needs to count each one once.
+    return InternedBallots.from_weighted_ballots(
+        deduplicate_ballots(Counter(w.name for w in ballot) for ballot in ballot_objs)
+    )
+
+
+def nomination_counter(request: HttpRequest | None = None) -> NominationCounter:
+    """The EPH implementation the convention has configured."""
+    awards = svcs_from(request).get(HugoAwards)
+    return awards.nomination_counter or incremental_eph
+
+
+# Cached counts are keyed on the category's fingerprint, so stale entries are never
+# read; this only bounds how long they linger in the cache. Counts are also stored in
+# FinalistCount, which outlives the cache.
+EPH_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def category_fingerprint(category: nominate.Category) -> str:
+    """A digest of everything the EPH count for *category* is computed from.
+
+    Every canonicalized nomination in the category is hashed along with its work's name,
+    its nominator and whether it is valid, so the digest changes whenever a `Work`,
+    `CanonicalizedNomination` or `NominationAdminData` row for the category changes,
+    including through bulk updates that send no signals.
+    """
+    row = Concat(
+        Cast("id", TextField()),
+        Value(":"),
+        Cast("nomination__nominator_id", TextField()),
+        Value(":"),
+        Coalesce(
+            Cast("nomination__admin__valid_nomination", TextField()),
+            Value("-"),
+            output_field=TextField(),
+        ),
+        Value(":"),
+        Cast("work_id", TextField()),
+        Value(":"),
+        "work__name",
+        output_field=TextField(),
+    )
+    digest = (
+        models.CanonicalizedNomination.objects.filter(work__category=category)
+        .annotate(row_digest=MD5(row))
+        .aggregate(digest=MD5(StringAgg("row_digest", "", order_by="id")))["digest"]
+    )
+    return digest or "empty"
+
+
+def _count_cache_key(
+    category: nominate.Category, finalist_count: int, fingerprint: str
+) -> str:
+    return f"canonicalize:eph:{category.pk}:{finalist_count}:{fingerprint}"
+
+
+def stored_counts(
+    categories: Iterable[nominate.Category], finalist_count: int = 6
+) -> dict[int, models.FinalistCount]:
+    """The stored count of each category that has one, keyed by category id.
+
+    Each is marked `stale` if the category's nominations have changed since it was
+    counted; that's read from the categories' latest changes, so this takes two
+    queries however many nominations there are.
+    """
+    category_ids = [category.pk for category in categories]
+    counts = {
+        count.category_id: count
+        for count in models.FinalistCount.objects.filter(
+            category_id__in=category_ids, finalist_count=finalist_count
+        ).defer("steps")
+    }
+    latest = changes.latest_changes(
+        nominate.CategoryChange.Kind.NOMINATIONS, category_ids
+    )
+    for category_id, count in counts.items():
+        count.stale = latest.get(category_id, 0) > count.through_change
+    return counts
+
+
+def count_category(
+    category: nominate.Category,
+    counter: NominationCounter = incremental_eph,
+    finalist_count: int = 6,
+) -> tuple[list[str] | None, StepLog]:
+    """Run EPH for *category*, returning the finalists and the step log.
+
+    The result is stored, and cached, until the category's fingerprint changes, so the
+    EPH page, the CSV report, the Sankey diagram and the election's finalists page all
+    share one count.
+    """
+    # the change is read before the fingerprint, so a change made while counting leaves
+    # the stored count stale rather than current
+    kind = nominate.CategoryChange.Kind.NOMINATIONS
+    through_change = changes.latest_changes(kind, [category.pk]).get(category.pk, 0)
+    fingerprint = category_fingerprint(category)
+    key = _count_cache_key(category, finalist_count, fingerprint)
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    stored = models.FinalistCount.objects.filter(
+        category=category, finalist_count=finalist_count, fingerprint=fingerprint
+    ).first()
+    if stored is not None:
+        # nothing counted has changed, whatever changes were noted since
+        if stored.through_change < through_change:
+            stored.through_change = through_change
+            stored.save(update_fields=["through_change"])
+        result = stored.result()
+    else:
+        steps = StepLog()
+        finalists = counter(
+            nominating_ballots_from_category(category),
+            finalist_count=finalist_count,
+            record_steps=steps,
+        )
+        result = (finalists, steps)
+        models.FinalistCount.objects.update_or_create(
+            category=category,
+            finalist_count=finalist_count,
+            defaults={
+                "fingerprint": fingerprint,
+                "through_change": through_change,
+                "finalists": finalists,
+                "steps": pickle.dumps(steps),
+            },
+        )
+
+    changes.forget_changes(kind, category.pk, before=through_change)
+    cache.set(key, result, EPH_CACHE_TIMEOUT)
+    return result
 
 
 @user_passes_test(lambda u: u.is_staff, login_url="/admin/login/")
 @permission_required("nominate.report")
 def finalists(request: HttpRequest, category_id: int) -> HttpResponse:
     category = get_object_or_404(nominate.Category, pk=category_id)
-    ballots = nominating_ballots_from_category(category)
-
-    steps = []
-
-    def recorder(
-        ballots: list[str], counts: dict[str, CountData], eliminations: list[str]
-    ):
-        steps.append((ballots, counts, eliminations))
-
-    finalists = eph(ballots, finalist_count=6, record_steps=recorder)
+    finalists, steps = count_category(category, nomination_counter(request))
     return render(
         request,
         "canonicalize/eph.html",
@@ -573,7 +783,11 @@ def finalists(request: HttpRequest, category_id: int) -> HttpResponse:
     )
 
 
-def build_eph_csv(ballots: list[Counter[str]], finalist_count: int = 6) -> str:
+def build_eph_csv(
+    ballots: EPHBallots,
+    finalist_count: int = 6,
+    counter: NominationCounter = incremental_eph,
+) -> str:
     """Run EPH on *ballots* and return the elimination report as a CSV string.
 
     Columns: Candidate, Final Score, Number of Ballots, Round 1 … Round N-1, Finalists.
@@ -582,34 +796,29 @@ def build_eph_csv(ballots: list[Counter[str]], finalist_count: int = 6) -> str:
     (i.e. at elimination or in the finalists round).  *Number of Ballots* is the
     raw count of ballots the candidate appeared on before EPH processing.
     """
-    steps: list[tuple[list, dict[str, CountData], list[str]]] = []
-    appearances = Counter()
-
-    for ballot in ballots:
-        for work in ballot:
-            appearances[work] += 1
-
-    def recorder(
-        ballots: list[str], counts: dict[str, CountData], eliminations: list[str]
-    ):
-        steps.append((ballots, counts, eliminations))
-
-    eph(ballots, finalist_count=finalist_count, record_steps=recorder)
-
-    # Determine the last round each candidate appears in counts (for sorting).
-    # Finalists appear in the final step; eliminated candidates disappear after
-    # their elimination round.
-    last_seen_round: dict[str, int] = {}
-    all_candidates_set: set[str] = set()
-    for round_idx, (_ballots, counts, _eliminations) in enumerate(steps):
-        for name in counts:
-            last_seen_round[name] = round_idx
-            all_candidates_set.add(name)
+    steps = StepLog()
+    counter(ballots, finalist_count=finalist_count, record_steps=steps)
+    return eph_csv_from_steps(steps)
+
+
+def eph_csv_from_steps(steps: StepLog) -> str:
+    """Build the elimination report CSV from a recorded EPH count."""
+    # Replay the rounds one at a time, collecting each candidate's points in every
+    # round they appear in. Eliminated candidates never reappear, so the length of a
+    # candidate's history is the number of rounds they survived.
+    history: dict[str, list[int]] = {}
+    # Every work is counted in the first round, before anything is eliminated, so its
+    # ballot count there is the number of ballots it appeared on.
+    appearances: dict[str, int] = {}
+    for _ballots, counts, _eliminations in steps:
+        for name, data in counts.items():
+            if name not in history:
+                history[name] = []
+                appearances[name] = data.ballot_count
+            history[name].append(data.points)
 
     # Sort: candidates who survived longest first, then alphabetically for ties.
-    all_candidates = sorted(
-        all_candidates_set, key=lambda name: (-last_seen_round[name], name)
-    )
+    all_candidates = sorted(history, key=lambda name: (-len(history[name]), name))
 
     num_rounds = len(steps)
 
@@ -626,22 +835,11 @@ def build_eph_csv(ballots: list[Counter[str]], finalist_count: int = 6) -> str:
     writer.writerow(header)
 
     # Data rows: show the candidate's points in every round where they appear in
-    # counts. Blank cells after the candidate is no longer present.
+    # counts, and as the "Final Score" their points in the last of those rounds.
+    # Blank cells after the candidate is no longer present.
     for name in all_candidates:
-        # Start with the name, and a placeholder for "Final Score" column, which is just the points
-        # from the last round they appear in.
-        row: list[str | int | None] = [name, None]
-
-        # add a "number of ballots the work appears on" column.
-        row.append(appearances[name])
-
-        for _ballots, counts, _eliminations in steps:
-            if name in counts:
-                row.append(counts[name].points)
-                row[1] = counts[name].points
-            else:
-                break  # candidate eliminated; leave remaining cells blank
-        writer.writerow(row)
+        points = history[name]
+        writer.writerow([name, points[-1], appearances[name], *points])
 
     return output.getvalue()
 
@@ -651,7 +849,8 @@ def build_eph_csv(ballots: list[Counter[str]], finalist_count: int = 6) -> str:
 @permission_required("nominate.report")
 def finalists_csv(request: HttpRequest, category_id: int) -> HttpResponse:
     category = get_object_or_404(nominate.Category, pk=category_id)
-    csv_content = build_eph_csv(nominating_ballots_from_category(category))
+    _finalists, steps = count_category(category, nomination_counter(request))
+    csv_content = eph_csv_from_steps(steps)
 
     filename = f"{category.election}-{category.id}-eph-elimination.csv"
     response = HttpResponse(csv_content, content_type="text/csv")
@@ -700,16 +899,7 @@ def sankey_data_view(request: HttpRequest, category_id: int) -> JsonResponse:
         mode = "compact"
 
     try:
-        ballots = nominating_ballots_from_category(category)
-
-        steps = []
-
-        def recorder(
-            ballots: list[str], counts: dict[str, CountData], eliminations: list[str]
-        ):
-            steps.append((ballots, counts, eliminations))
-
-        finalist_works = eph(ballots, finalist_count=6, record_steps=recorder)
+        finalist_works, steps = count_category(category, nomination_counter(request))
         sankey_data = transform_eph_to_sankey(steps, finalist_works, mode=mode)
 
         return JsonResponse(sankey_data)
@@ -718,6 +908,107 @@ def sankey_data_view(request: HttpRequest, category_id: int) -> JsonResponse:
         return JsonResponse({"error": str(e)}, status=500)
 
 
+@user_passes_test(lambda u: u.is_staff, login_url="/admin/login/")
+@permission_required("nominate.report")
+def election_finalists(request: HttpRequest, election_id: int) -> HttpResponse:
+    """The EPH finalists for every category of an election.
+
+    Posting to this view counts every category in the background; the page shows each
+    category's progress, and the finalists of its last count, marked if the category's
+    nominations have changed since.
+    """
+    from nomnom.canonicalize.tasks import COUNT_STATE, count_election, count_statuses
+
+    election = get_object_or_404(nominate.Election, pk=election_id)
+    if request.method == "POST":
+        count_election.delay(election.pk)
+        messages.info(
+            request, f"Counting the finalists for every category in {election}"
+        )
+        return redirect("canonicalize:election-finalists", election.pk)
+
+    categories = list(election.category_set.all())
+    statuses = count_statuses(categories)
+    counts = stored_counts(categories)
+    rows = [
+        {
+            "category": category,
+            "status": statuses.get(category.pk),
+            "count": counts.get(category.pk),
+        }
+        for category in categories
+    ]
+
+    return render(
+        request,
+        "canonicalize/election_finalists.html",
+        {
+            "election": election,
+            "rows": rows,
+            "in_progress": any(
+                status["state"] in (COUNT_STATE.QUEUED, COUNT_STATE.RUNNING)
+                for status in statuses.values()
+            ),
+        },
+    )
+
+
+@user_passes_test(lambda u: u.is_staff, login_url="/admin/login/")
+@permission_required("nominate.report")
+def election_proposals(request: HttpRequest, election_id: int) -> HttpResponse:
+    """The proposed groups of nominations for every category of an election.
+
+    Posting to this view brings every category's proposals up to date in the background.
+    """
+    from nomnom.canonicalize.tasks import propose_election_groups
+
+    election = get_object_or_404(nominate.Election, pk=election_id)
+    if request.method == "POST":
+        propose_election_groups.delay(election.pk)
+        messages.info(request, f"Proposing groups for every category in {election}")
+        return redirect("canonicalize:election-proposals", election.pk)
+
+    proposals = dict(
+        models.ProposedGroup.objects.filter(category__election=election)
+        .values_list("category_id")
+        .annotate(Count("id"))
+        .order_by()
+    )
+    unlinked = dict(
+        nominate.Nomination.objects.filter(
+            category__election=election, canonicalizednomination__isnull=True
+        )
+        .prefetch_related(None)
+        .values_list("category_id")
+        .annotate(Count("id"))
+        .order_by()
+    )
+    clustered_through = dict(
+        models.ClusteringState.objects.filter(category__election=election).values_list(
+            "category_id", "clustered_through"
+        )
+    )
+    rows = [
+        {
+            "category": category,
+            "unlinked": unlinked.get(category.pk, 0),
+            "proposals": proposals.get(category.pk, 0),
+            "clustered_through": clustered_through.get(category.pk),
+        }
+        for category in election.category_set.all()
+    ]
+
+    return render(
+        request,
+        "canonicalize/election_proposals.html",
+        {
+            "election": election,
+            "rows": rows,
+            "review_url": reverse("admin:canonicalize_proposedgroup_changelist"),
+        },
+    )
+
+
 @user_passes_test(lambda u: u.is_staff, login_url="/admin/login/")
 @permission_required("nominate.report")
 def make_work(request: HttpRequest, category_id: int, nominee_id: int) -> HttpResponse:
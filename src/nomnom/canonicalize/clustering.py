@@ -0,0 +1,328 @@
+"""Proposing groups of uncanonicalized nominations that look like the same work.
+
+Canonicalizing a category by hand means finding every spelling of each work among its
+nominations. This module does the finding ahead of time, as a background job for each
+category, and leaves `ProposedGroup`s for an admin to review and accept.
+
+The job works on the distinct normalized names of the category's uncanonicalized
+nominations:
+
+* names are blocked by the words they contain, so only names that share a word (other
+  than a very common one) are compared;
+* each pair in a block is scored by its trigram similarity, as `pg_trgm` does it, and
+  names at least `PROPOSAL_THRESHOLD` similar are clustered together;
+* each cluster is compared with the names of the existing works in the same way, and
+  proposed as a group under the most similar work, if any, or as a new work otherwise.
+
+The job is incremental: only the names of nominations saved since the last run are
+scored, against everything else. Clusters they don't touch are left as they were. When
+the category's nominations are renamed, because the fields used for canonicalization
+changed, the next run scores every name again.
+"""
+
+import re
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from nomnom.canonicalize import models
+from nomnom.nominate import models as nominate
+
+# How similar two names must be to be proposed as the same work
+PROPOSAL_THRESHOLD = 0.5
+
+# Words shared by more names than this are too common to tell works apart by
+MAX_BLOCK_SIZE = 200
+
+STOPWORDS = frozenset(["a", "an", "and", "by", "for", "in", "of", "on", "the", "to"])
+
+WORD_RE = re.compile(r"\w+")
+
+
+def words(name: str) -> list[str]:
+    return WORD_RE.findall(name.lower())
+
+
+def trigrams(name: str) -> frozenset[str]:
+    """The trigrams of *name*, as `pg_trgm` extracts them: each word is padded with two
+    spaces in front and one behind."""
+    return frozenset(
+        padded[i : i + 3]
+        for word in words(name)
+        for padded in [f"  {word} "]
+        for i in range(len(padded) - 2)
+    )
+
+
+def similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    """The similarity of two names' trigrams, as `pg_trgm`'s `similarity()`."""
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+def blocking_keys(name: str) -> set[str]:
+    keys = {word for word in words(name) if word not in STOPWORDS}
+    # names that are all stopwords (or punctuation) can still match themselves
+    return keys or {name}
+
+
+class NameIndex:
+    """Names blocked by their words, for finding the names similar to another."""
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self.trigrams: dict[str, frozenset[str]] = {}
+        self.blocks: dict[str, set[str]] = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        if name in self.trigrams:
+            return
+        self.trigrams[name] = trigrams(name)
+        for key in blocking_keys(name):
+            self.blocks.setdefault(key, set()).add(name)
+
+    def similar(
+        self, name: str, threshold: float = PROPOSAL_THRESHOLD
+    ) -> dict[str, float]:
+        """The names in the index at least *threshold* similar to *name*, with their
+        similarity."""
+        name_trigrams = self.trigrams.get(name) or trigrams(name)
+        candidates: set[str] = set()
+        for key in blocking_keys(name):
+            block = self.blocks.get(key, ())
+            if len(block) <= MAX_BLOCK_SIZE:
+                candidates.update(block)
+
+        found = {}
+        for candidate in candidates:
+            candidate_trigrams = self.trigrams[candidate]
+            # names of very different lengths can't be similar enough; skip scoring them
+            shorter, longer = sorted([len(name_trigrams), len(candidate_trigrams)])
+            if shorter < threshold * longer:
+                continue
+            score = similarity(name_trigrams, candidate_trigrams)
+            if score >= threshold:
+                found[candidate] = score
+        return found
+
+
+class Clusters:
+    """A union-find over names."""
+
+    def __init__(self) -> None:
+        self.parent: dict[str, str] = {}
+
+    def find(self, name: str) -> str:
+        root = self.parent.setdefault(name, name)
+        while root != self.parent[root]:
+            root = self.parent[root]
+        while name != root:
+            self.parent[name], name = root, self.parent[name]
+        return root
+
+    def union(self, a: str, b: str) -> None:
+        self.parent[self.find(a)] = self.find(b)
+
+    def members(self, roots: set[str]) -> dict[str, list[str]]:
+        clusters: dict[str, list[str]] = {root: [] for root in roots}
+        for name in self.parent:
+            root = self.find(name)
+            if root in clusters:
+                clusters[root].append(name)
+        return clusters
+
+
+@dataclass
+class Proposal:
+    """A cluster of names, and where to group their nominations."""
+
+    names: Counter[str]
+    work_id: int | None = None
+    # how similar each name is to the work's, or else to the most nominated one
+    similarities: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        # the most nominated name, and of those the first alphabetically
+        return min(self.names, key=lambda name: (-self.names[name], name))
+
+    @property
+    def confidence(self) -> float:
+        """The average similarity of the nominations' names to the one they're proposed
+        under."""
+        total = self.names.total()
+        return sum(self.similarities[n] * c for n, c in self.names.items()) / total
+
+
+def propose(
+    names: Counter[str],
+    index: NameIndex,
+    work_index: NameIndex,
+    work_names: dict[str, int],
+) -> Proposal | None:
+    """Where to group the nominations going by *names*, with nominations counted.
+
+    A cluster of one name is only worth proposing if it looks like an existing work.
+    """
+    best_work, best_score = None, 0.0
+    for name in names:
+        for work_name, score in work_index.similar(name).items():
+            if score > best_score:
+                best_work, best_score = work_name, score
+
+    if best_work is None and len(names) < 2:
+        return None
+
+    proposal = Proposal(names=names)
+    if best_work is not None:
+        proposal.work_id = work_names[best_work]
+        anchor_trigrams = work_index.trigrams[best_work]
+    else:
+        anchor_trigrams = index.trigrams[proposal.name]
+    proposal.similarities = {
+        name: similarity(index.trigrams[name], anchor_trigrams) for name in names
+    }
+    return proposal
+
+
+def category_work_names(category: nominate.Category) -> dict[str, int]:
+    """The names the category's works go by, with the work each is best matched to."""
+    rows = (
+        models.WorkName.objects.filter(category=category)
+        .order_by("is_work_name", "-work_id")
+        .values_list("name", "work_id")
+    )
+    # later rows win, as in `nomnom.canonicalize.names.find_works`
+    return dict(rows)
+
+
+@transaction.atomic
+def propose_groups(category: nominate.Category) -> int:
+    """Bring the category's proposed groups up to date with its nominations.
+
+    Returns the number of names that were scored."""
+    started = timezone.now()
+    # one run at a time for each category
+    models.ClusteringState.objects.get_or_create(category=category)
+    state = models.ClusteringState.objects.select_for_update().get(category=category)
+
+    unlinked = nominate.Nomination.objects.filter(
+        category=category, canonicalizednomination__isnull=True
+    ).prefetch_related(None)
+    counts = Counter(
+        dict(
+            unlinked.values_list("normalized_name")
+            .annotate(nominations=Count("id"))
+            .order_by()
+        )
+    )
+    if state.clustered_through is None:
+        new = set(counts)
+    else:
+        new = set(
+            unlinked.filter(nomination_date__gte=state.clustered_through)
+            .values_list("normalized_name", flat=True)
+            .distinct()
+        )
+
+    index = NameIndex(counts)
+    clusters = Clusters()
+    for name in counts:
+        clusters.find(name)
+
+    # the names already proposed together stay together
+    existing: dict[str, int] = dict(
+        models.ProposedGroupName.objects.filter(category=category).values_list(
+            "name", "group_id"
+        )
+    )
+    first_name: dict[int, str] = {}
+    for name, group_id in existing.items():
+        if name in counts:
+            clusters.union(name, first_name.setdefault(group_id, name))
+
+    for name in new:
+        for similar in index.similar(name):
+            clusters.union(name, similar)
+
+    # groups that have lost names since they were proposed are proposed again, as are
+    # any that the new names have joined
+    stale_groups = {
+        group_id for name, group_id in existing.items() if name not in counts
+    }
+    touched = {clusters.find(name) for name in new} | {
+        clusters.find(name)
+        for name, group_id in existing.items()
+        if group_id in stale_groups and name in counts
+    }
+    touched_clusters = list(clusters.members(touched).values())
+
+    models.ProposedGroup.objects.filter(
+        pk__in=stale_groups
+        | {existing[n] for names in touched_clusters for n in names if n in existing}
+    ).delete()
+
+    work_names = category_work_names(category)
+    work_index = NameIndex(work_names)
+    for names in touched_clusters:
+        proposal = propose(
+            Counter({name: counts[name] for name in names}),
+            index,
+            work_index,
+            work_names,
+        )
+        if proposal is None:
+            continue
+
+        group = models.ProposedGroup.objects.create(
+            category=category,
+            name=proposal.name,
+            work_id=proposal.work_id,
+            confidence=proposal.confidence,
+        )
+        models.ProposedGroupName.objects.bulk_create(
+            models.ProposedGroupName(
+                group=group,
+                category=category,
+                name=name,
+                nominations=count,
+                similarity=proposal.similarities[name],
+            )
+            for name, count in proposal.names.items()
+        )
+
+    state.clustered_through = started
+    state.save()
+
+    return len(new)
+
+
+@transaction.atomic
+def accept_group(group: models.ProposedGroup) -> models.Work | None:
+    """Group the nominations of a proposed group, and drop the proposal.
+
+    Returns the work the nominations were grouped under, or None if they have all been
+    canonicalized since the proposal was made."""
+    nomination_ids = list(group.nominations().values_list("id", flat=True))
+    nominations = nominate.Nomination.objects.filter(
+        pk__in=nomination_ids
+    ).select_related("canonicalizednomination__work")
+    # the new work is named as its nominations most often were
+    first = (
+        nominations.filter(normalized_name=group.name).first() or nominations.first()
+    )
+    group.delete()
+    if first is None:
+        return None
+
+    work = group.work or models.Work.objects.create(
+        name=first.proposed_work_name(), category=group.category
+    )
+    return models.group_nominations(nominations, work)
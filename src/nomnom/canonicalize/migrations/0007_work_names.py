@@ -0,0 +1,95 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def proposed_work_name(nomination) -> str:
+    # Nomination.proposed_work_name, which the historical model doesn't have
+    category = nomination.category
+    fields = [nomination.field_1]
+    if category.fields >= 2 and category.field_2_used_for_canonicalization:
+        fields.append(nomination.field_2)
+    if category.fields >= 3 and category.field_3_used_for_canonicalization:
+        fields.append(nomination.field_3)
+    return " ".join(f for f in fields if f)
+
+
+def index_work_names(apps, schema_editor):
+    Work = apps.get_model("canonicalize", "Work")
+    CanonicalizedNomination = apps.get_model("canonicalize", "CanonicalizedNomination")
+    WorkName = apps.get_model("canonicalize", "WorkName")
+
+    names = {}
+    for work in Work.objects.iterator():
+        name = work.name.strip().lower()
+        names[work.pk, name] = WorkName(
+            work_id=work.pk, category_id=work.category_id, name=name, is_work_name=True
+        )
+
+    links = CanonicalizedNomination.objects.select_related("nomination__category")
+    for link in links.iterator():
+        name = proposed_work_name(link.nomination).strip().lower()
+        work_name = names.get((link.work_id, name))
+        if work_name is None:
+            work_name = names[link.work_id, name] = WorkName(
+                work_id=link.work_id,
+                category_id=link.nomination.category_id,
+                name=name,
+            )
+        work_name.nominations += 1
+
+    WorkName.objects.bulk_create(names.values(), batch_size=5000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("canonicalize", "0006_create_sankey_switch"),
+        ("nominate", "0031_ballot_submissions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorkName",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.TextField()),
+                ("nominations", models.PositiveIntegerField(default=0)),
+                ("is_work_name", models.BooleanField(default=False)),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="nominate.category",
+                    ),
+                ),
+                (
+                    "work",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="names",
+                        to="canonicalize.work",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["category", "name"], name="work_name_lookup")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("work", "name"), name="unique_work_name"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(index_work_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:34
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("canonicalize", "0007_work_names"),
+        ("nominate", "0032_nomination_normalized_name"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="work",
+            index=models.Index(
+                models.F("category"),
+                django.db.models.functions.text.Lower("name"),
+                name="work_lower_name",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="work",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"], name="work_name_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("canonicalize", "0008_work_name_indexes"),
+        ("nominate", "0032_nomination_normalized_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ClusteringState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("clustered_through", models.DateTimeField(null=True)),
+                (
+                    "category",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="nominate.category",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ProposedGroup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.TextField()),
+                ("confidence", models.FloatField()),
+                ("proposed_at", models.DateTimeField(auto_now=True)),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="nominate.category",
+                    ),
+                ),
+                (
+                    "work",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="canonicalize.work",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Proposed Group",
+                "verbose_name_plural": "Proposed Groups",
+            },
+        ),
+        migrations.CreateModel(
+            name="ProposedGroupName",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.TextField()),
+                ("nominations", models.PositiveIntegerField()),
+                ("similarity", models.FloatField()),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="nominate.category",
+                    ),
+                ),
+                (
+                    "group",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="names",
+                        to="canonicalize.proposedgroup",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("category", "name"), name="unique_proposed_name"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("canonicalize", "0009_proposed_groups"),
+        ("nominate", "0033_categorychange"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FinalistCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("finalist_count", models.PositiveSmallIntegerField()),
+                ("fingerprint", models.CharField(max_length=32)),
+                ("through_change", models.PositiveBigIntegerField(default=0)),
+                ("finalists", models.JSONField(null=True)),
+                ("steps", models.BinaryField()),
+                ("counted_at", models.DateTimeField(auto_now=True)),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="nominate.category",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("category", "finalist_count"),
+                        name="unique_finalist_count",
+                    )
+                ],
+            },
+        ),
+    ]
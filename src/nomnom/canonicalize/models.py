@@ -1,13 +1,86 @@
+import pickle
+from collections import Counter
+from contextlib import contextmanager
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramWordSimilarity
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.db.models import F, Q, Value
-from django.db.models.functions import Concat, Lower
+from django.db import connection, models, transaction
+from django.db.models import F, Max, Q
+from django.db.models.functions import Greatest, Lower
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from django.contrib.postgres.search import TrigramWordSimilarity
-from django.db.models.functions import Greatest
 
 from nomnom.nominate import models as nominate
+from nomnom.wsfs.rules.constitution_2023 import StepLog
+
+# How similar a name must be to a work's for it to be offered as a match
+FUZZY_MATCH_THRESHOLD = 0.3
+
+# Work.find_fuzzy_matches for each distinct (category, name) of a group of nominations,
+# weighted by how many of them go by it, in one query
+GROUP_MATCHES_SQL = """
+SELECT work.*, SUM(match.similarity * selected.nominations) / %s AS similarity
+FROM unnest(%s::integer[], %s::text[], %s::integer[])
+    AS selected (category_id, name, nominations)
+CROSS JOIN LATERAL (
+    SELECT * FROM (
+        SELECT candidate.id, GREATEST(
+            word_similarity(selected.name, candidate.name),
+            MAX(word_similarity(selected.name, nomination.normalized_name))
+        ) AS similarity
+        FROM {work} candidate
+        LEFT JOIN {link} link ON link.work_id = candidate.id
+        LEFT JOIN {nomination} nomination ON nomination.id = link.nomination_id
+        WHERE candidate.category_id = selected.category_id
+            AND (
+                candidate.name %%> selected.name
+                OR candidate.id IN (
+                    SELECT other_link.work_id
+                    FROM {nomination} other
+                    JOIN {link} other_link ON other_link.nomination_id = other.id
+                    WHERE other.category_id = selected.category_id
+                        AND other.normalized_name %%> selected.name
+                )
+            )
+        GROUP BY candidate.id
+    ) scored
+    WHERE scored.similarity > %s
+    ORDER BY scored.similarity DESC, scored.id
+    LIMIT %s
+) match
+JOIN {work} work ON work.id = match.id
+GROUP BY work.id
+ORDER BY similarity DESC, work.id
+"""
+
+
+@contextmanager
+def fuzzy_match_threshold():
+    """Have the trigram index operators match at `FUZZY_MATCH_THRESHOLD`, rather than
+    the stricter default of 0.6, inside the block.
+
+    The setting is local to the transaction, which may go on after the block, so the
+    threshold it had before is put back on the way out."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        # pg_trgm's settings only exist once it's loaded, which calling into it does
+        cursor.execute("SELECT similarity('', '')")
+        cursor.execute(
+            "SELECT current_setting('pg_trgm.word_similarity_threshold', true)"
+        )
+        [(saved,)] = cursor.fetchall()
+        cursor.execute(
+            "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+            [str(FUZZY_MATCH_THRESHOLD)],
+        )
+        yield
+        # a block that raises leaves by rolling back, which puts the threshold back
+        # along with everything else it did
+        cursor.execute(
+            "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+            [saved],
+        )
 
 
 # the Work can reference the nominate app's models. The other direction is
@@ -19,6 +92,12 @@ class Work(models.Model):
     class Meta:
         verbose_name = "Canonicalized Work"
         verbose_name_plural = "Canonicalized Works"
+        indexes = [
+            models.Index(F("category"), Lower("name"), name="work_lower_name"),
+            GinIndex(
+                fields=["name"], name="work_name_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ]
 
     name = models.CharField(max_length=255)
     category = models.ForeignKey("nominate.Category", on_delete=models.PROTECT)
@@ -39,61 +118,100 @@ class Work(models.Model):
     def __str__(self) -> str:
         return self.name
 
-    @staticmethod
-    def _combined_nomination_name(category: "nominate.Category"):
-        field_count = category.fields
-        if field_count == 1:
-            return Lower(F("nominations__field_1"))
-        elif field_count == 2:
-            return Lower(
-                Concat(
-                    "nominations__field_1",
-                    Value(" "),
-                    "nominations__field_2",
-                )
-            )
-        elif field_count == 3:
-            return Lower(
-                Concat(
-                    "nominations__field_1",
-                    Value(" "),
-                    "nominations__field_2",
-                    Value(" "),
-                    "nominations__field_3",
-                )
-            )
-        else:
-            raise ValueError("Unsupported field count")
-
     @classmethod
     def find_match_based_on_identical_nomination(
         cls, name: str, category: "nominate.Category"
     ) -> "Work | None":
-        combined_name = cls._combined_nomination_name(category)
-        query = (
-            cls.objects.filter(category=category)
-            .annotate(combined_name=combined_name, work_name=Lower(F("name")))
-            .filter(Q(combined_name=name.lower()) | Q(work_name=name.lower()))
-        )
-        return query.first()
+        """The work in *category* named *name*, or with a nomination that proposes it.
+
+        Both are looked up case-insensitively, in the `work_lower_name` and
+        `nomination_name_lookup` indexes."""
+        name = nominate.normalize_work_name(name)
+        works = cls.objects.filter(category=category)
+
+        work = works.alias(lower_name=Lower("name")).filter(lower_name=name).first()
+        if work is not None:
+            return work
+
+        return works.filter(
+            pk__in=nominate.Nomination.objects.filter(
+                category=category,
+                normalized_name=name,
+                canonicalizednomination__isnull=False,
+            ).values("canonicalizednomination__work_id")
+        ).first()
 
     @classmethod
     def find_fuzzy_matches(
         cls, name: str, category: "nominate.Category", limit: int = 3
     ) -> list["Work"]:
-        combined_name = cls._combined_nomination_name(category)
+        """The works in *category* whose name, or the name of one of whose nominations,
+        is most similar to *name*, best first.
+
+        The candidates are found with the trigram indexes on `Work.name` and
+        `Nomination.normalized_name`, and then ranked by their word similarity."""
+        # the `%>` lookups are used directly; django.contrib.postgres, which registers
+        # them on every field, needn't be installed
+        similar_nominations = nominate.Nomination.objects.filter(
+            TrigramWordSimilar(F("normalized_name"), name),
+            category=category,
+            canonicalizednomination__isnull=False,
+        ).values("canonicalizednomination__work_id")
+        candidates = cls.objects.filter(category=category).filter(
+            Q(TrigramWordSimilar(F("name"), name)) | Q(pk__in=similar_nominations)
+        )
 
         name_similarity = TrigramWordSimilarity(name, "name")
-        nomination_similarity = TrigramWordSimilarity(name, combined_name)
+        nomination_similarity = Max(
+            TrigramWordSimilarity(name, "nominations__normalized_name")
+        )
+        # GREATEST skips the NULL similarity of a work without nominations
         best_similarity = Greatest(name_similarity, nomination_similarity)
 
-        return list(
-            cls.objects.filter(category=category)
-            .annotate(similarity=best_similarity)
-            .filter(similarity__gt=0.3)
-            .order_by("-similarity")
-            .distinct()[:limit]
+        with fuzzy_match_threshold():
+            return list(
+                candidates.annotate(similarity=best_similarity)
+                .filter(similarity__gt=FUZZY_MATCH_THRESHOLD)
+                .order_by("-similarity", "pk")[:limit]
+            )
+
+    @classmethod
+    def find_group_matches(
+        cls, nominations: models.QuerySet["nominate.Nomination"], limit: int = 3
+    ) -> list["Work"]:
+        """The works most similar to a group of *nominations*, best first, in one query.
+
+        Each nomination's *limit* best matches are found as by `find_fuzzy_matches`. A
+        work's `similarity` is its average over all of the nominations, counting those
+        it isn't a match for as zero."""
+        names = Counter(
+            nominations.prefetch_related(None).values_list(
+                "category_id", "normalized_name"
+            )
         )
+        if not names:
+            return []
+
+        category_ids = [category_id for category_id, _ in names]
+        normalized_names = [name for _, name in names]
+        with fuzzy_match_threshold():
+            return list(
+                cls.objects.raw(
+                    GROUP_MATCHES_SQL.format(
+                        work=cls._meta.db_table,
+                        link=CanonicalizedNomination._meta.db_table,
+                        nomination=nominate.Nomination._meta.db_table,
+                    ),
+                    [
+                        names.total(),
+                        category_ids,
+                        normalized_names,
+                        list(names.values()),
+                        FUZZY_MATCH_THRESHOLD,
+                        limit,
+                    ],
+                )
+            )
 
     def combine_works(self, other_works) -> None:
         """Combine this work with other works.
@@ -138,6 +256,128 @@ class CanonicalizedNomination(models.Model):
         verbose_name_plural = "Raw Nominations"
 
 
+class WorkName(models.Model):
+    """A name a work goes by in its category: its own, or one it was nominated under.
+
+    Names are normalized with `nomnom.canonicalize.names.normalized_name`, and kept up to
+    date by `nomnom.canonicalize.receivers`, so new nominations can be linked to works
+    without reading every work in the category."""
+
+    work = models.ForeignKey(Work, on_delete=models.CASCADE, related_name="names")
+    category = models.ForeignKey("nominate.Category", on_delete=models.CASCADE)
+    name = models.TextField()
+    # the number of the work's nominations that go by this name
+    nominations = models.PositiveIntegerField(default=0)
+    is_work_name = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["work", "name"], name="unique_work_name"),
+        ]
+        indexes = [
+            models.Index(fields=["category", "name"], name="work_name_lookup"),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class ProposedGroup(models.Model):
+    """Uncanonicalized nominations that look like the same work, proposed for an admin
+    to group.
+
+    The nominations are those in the category that go by one of the group's names, and
+    aren't linked to a work yet. Proposals are made, and kept up to date, by
+    `nomnom.canonicalize.clustering`."""
+
+    category = models.ForeignKey("nominate.Category", on_delete=models.CASCADE)
+    # the normalized name most of the nominations go by
+    name = models.TextField()
+    # an existing work that goes by a similar name, to group the nominations under
+    work = models.ForeignKey(Work, on_delete=models.CASCADE, null=True, blank=True)
+    # the average similarity of the nominations' names to the work's, or to `name`
+    confidence = models.FloatField()
+    proposed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Proposed Group"
+        verbose_name_plural = "Proposed Groups"
+
+    def __str__(self) -> str:
+        return self.name
+
+    def nominations(self) -> models.QuerySet["nominate.Nomination"]:
+        return nominate.Nomination.objects.filter(
+            category_id=self.category_id,
+            normalized_name__in=self.names.values("name"),
+            canonicalizednomination__isnull=True,
+        )
+
+
+class ProposedGroupName(models.Model):
+    """A name the nominations of a proposed group go by."""
+
+    group = models.ForeignKey(
+        ProposedGroup, on_delete=models.CASCADE, related_name="names"
+    )
+    category = models.ForeignKey("nominate.Category", on_delete=models.CASCADE)
+    name = models.TextField()
+    # the number of uncanonicalized nominations that went by this name when proposed
+    nominations = models.PositiveIntegerField()
+    # how similar this name is to the one the group is proposed under
+    similarity = models.FloatField()
+
+    class Meta:
+        constraints = [
+            # a name is only ever proposed for one group
+            models.UniqueConstraint(
+                fields=["category", "name"], name="unique_proposed_name"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class ClusteringState(models.Model):
+    """How far `nomnom.canonicalize.clustering` has got through a category's
+    nominations."""
+
+    category = models.OneToOneField("nominate.Category", on_delete=models.CASCADE)
+    # nominations saved since this haven't been considered for a group yet
+    clustered_through = models.DateTimeField(null=True)
+
+
+class FinalistCount(models.Model):
+    """The finalists of a category, as last counted by EPH, and the count's step log.
+
+    Counts are made by `nomnom.canonicalize.admin.count_category`, and kept here rather
+    than only in the cache so that they outlive it. A count is for the category as it
+    was when its `fingerprint` was taken; it is stale once the category has a
+    `CategoryChange` of its nominations later than `through_change`."""
+
+    category = models.ForeignKey("nominate.Category", on_delete=models.CASCADE)
+    finalist_count = models.PositiveSmallIntegerField()
+    # see nomnom.canonicalize.admin.category_fingerprint
+    fingerprint = models.CharField(max_length=32)
+    # the latest CategoryChange of the category's nominations when it was counted
+    through_change = models.PositiveBigIntegerField(default=0)
+    finalists = models.JSONField(null=True)
+    # the pickled StepLog of the count
+    steps = models.BinaryField()
+    counted_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["category", "finalist_count"], name="unique_finalist_count"
+            ),
+        ]
+
+    def result(self) -> tuple[list[str] | None, StepLog]:
+        return self.finalists, pickle.loads(self.steps)
+
+
 @receiver(post_save, sender=nominate.Nomination)
 def link_work_to_nomination(sender, instance, created, **kwargs):
     if not created:
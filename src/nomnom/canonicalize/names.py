@@ -0,0 +1,161 @@
+"""Work names: the names each work goes by, for linking new nominations to works.
+
+A nomination is linked to the work in its category that goes by its proposed name: either
+the work's own name, or the name of a nomination already linked to it. Those names are
+kept in `WorkName` rows, one per work and name, counting the work's nominations under
+that name:
+
+* saving a `Work` updates its own name;
+* linking or unlinking a single nomination adds or removes its name (see
+  `nomnom.canonicalize.receivers`);
+* bulk writes to the links, which send no signals, must call `add_names` or
+  `refresh_work_names` themselves;
+* changing which fields of a category are used for canonicalization changes the names
+  of all of its nominations, and rebuilds the category's names.
+
+A nomination's name is its stored `Nomination.normalized_name`.
+"""
+
+from collections import Counter
+from collections.abc import Iterable
+
+from django.db.models import F
+
+from nomnom.canonicalize import models
+from nomnom.nominate import models as nominate
+
+normalized_name = nominate.normalize_work_name
+
+
+def nomination_name(nomination: nominate.Nomination) -> str:
+    return nomination.normalized_name
+
+
+def find_works(names: Iterable[tuple[int, str]]) -> dict[tuple[int, str], int]:
+    """The ID of the work each of *names*, as (category ID, normalized name), goes by.
+
+    A work's own name is preferred to the names it was nominated under; among works that
+    go by the same name, the oldest is chosen. Names no work goes by are left out."""
+    names = set(names)
+    if not names:
+        return {}
+
+    rows = (
+        models.WorkName.objects.filter(
+            category_id__in={category_id for category_id, _ in names},
+            name__in={name for _, name in names},
+        )
+        .order_by("is_work_name", "-work_id")
+        .values_list("category_id", "name", "work_id")
+    )
+    # later rows win, so the best match for each name is written last
+    found = {(category_id, name): work_id for category_id, name, work_id in rows}
+    return {key: work_id for key, work_id in found.items() if key in names}
+
+
+def add_names(
+    work_id: int, category_id: int, names: Iterable[str], change: int = 1
+) -> None:
+    """Count *change* more of the work's nominations under each of *names*."""
+    changes: Counter[str] = Counter()
+    for name in names:
+        changes[name] += change
+    _apply_changes(work_id, category_id, changes)
+
+
+def remove_names(work_id: int, category_id: int, names: Iterable[str]) -> None:
+    """Count one fewer of the work's nominations under each of *names*."""
+    add_names(work_id, category_id, names, change=-1)
+
+
+def _apply_changes(work_id: int, category_id: int, changes: Counter[str]) -> None:
+    changes = Counter({name: change for name, change in changes.items() if change})
+    if not changes:
+        return
+
+    models.WorkName.objects.bulk_create(
+        [
+            models.WorkName(work_id=work_id, category_id=category_id, name=name)
+            for name, change in changes.items()
+            if change > 0
+        ],
+        ignore_conflicts=True,
+    )
+    for name, change in changes.items():
+        models.WorkName.objects.filter(work_id=work_id, name=name).update(
+            nominations=F("nominations") + change
+        )
+    models.WorkName.objects.filter(
+        work_id=work_id, nominations__lte=0, is_work_name=False
+    ).delete()
+
+
+def set_work_name(work: models.Work) -> None:
+    """Bring the name *work* goes by under its own name up to date."""
+    name = normalized_name(work.name)
+    names = models.WorkName.objects.filter(work=work)
+    if names.filter(is_work_name=True, name=name).exists():
+        return
+
+    names.filter(is_work_name=True).update(is_work_name=False)
+    names.filter(nominations__lte=0, is_work_name=False).delete()
+    models.WorkName.objects.bulk_create(
+        [models.WorkName(work=work, category_id=work.category_id, name=name)],
+        ignore_conflicts=True,
+    )
+    names.filter(name=name).update(is_work_name=True)
+
+
+def current_names(
+    works: Iterable[models.Work],
+) -> dict[tuple[int, str], models.WorkName]:
+    """The names *works* go by, from the works and their nominations, keyed by
+    (work ID, normalized name)."""
+    names: dict[tuple[int, str], models.WorkName] = {}
+    works = list(works)
+    for work in works:
+        name = normalized_name(work.name)
+        names[work.pk, name] = models.WorkName(
+            work_id=work.pk, category_id=work.category_id, name=name, is_work_name=True
+        )
+
+    links = models.CanonicalizedNomination.objects.filter(work__in=works).values_list(
+        "work_id", "nomination__category_id", "nomination__normalized_name"
+    )
+    for work_id, category_id, name in links.iterator():
+        work_name = names.get((work_id, name))
+        if work_name is None:
+            work_name = names[work_id, name] = models.WorkName(
+                work_id=work_id, category_id=category_id, name=name
+            )
+        work_name.nominations += 1
+
+    return names
+
+
+def refresh_work_names(work_ids: Iterable[int]) -> None:
+    """Recount the names of *work_ids* from the works and their nominations."""
+    work_ids = set(work_ids)
+    if not work_ids:
+        return
+
+    models.WorkName.objects.filter(work_id__in=work_ids).delete()
+    models.WorkName.objects.bulk_create(
+        current_names(models.Work.objects.filter(pk__in=work_ids)).values(),
+        batch_size=5000,
+    )
+
+
+def rebuild_work_names(category_ids: Iterable[int]) -> None:
+    """Recount the names of every work in *category_ids*."""
+    category_ids = set(category_ids)
+    if not category_ids:
+        return
+
+    models.WorkName.objects.filter(category_id__in=category_ids).delete()
+    models.WorkName.objects.bulk_create(
+        current_names(
+            models.Work.objects.filter(category_id__in=category_ids)
+        ).values(),
+        batch_size=5000,
+    )
@@ -1 +1,121 @@
-# none yet
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from nomnom.base.signals import nomination_names_changed
+from nomnom.canonicalize import names
+from nomnom.canonicalize.models import CanonicalizedNomination, ClusteringState, Work
+from nomnom.nominate.changes import note_changes
+from nomnom.nominate.models import CategoryChange, Nomination, NominationAdminData
+
+# the finalists are counted from the canonicalized nominations, so any change to those
+# leaves the category's stored count stale; see FinalistCount
+NOMINATIONS = CategoryChange.Kind.NOMINATIONS
+
+
+@receiver(post_save, sender=Work)
+def work_saved(sender, instance: Work, raw: bool = False, **kwargs):
+    if raw:
+        return
+
+    names.set_work_name(instance)
+    note_changes(NOMINATIONS, [instance.category_id])
+
+
+@receiver(post_delete, sender=Work)
+def work_deleted(sender, instance: Work, **kwargs):
+    note_changes(NOMINATIONS, [instance.category_id])
+
+
+@receiver(post_save, sender=CanonicalizedNomination)
+def nomination_linked(
+    sender,
+    instance: CanonicalizedNomination,
+    created: bool,
+    raw: bool = False,
+    **kwargs,
+):
+    if raw or not created:
+        return
+
+    nomination = instance.nomination
+    names.add_names(
+        instance.work_id, nomination.category_id, [names.nomination_name(nomination)]
+    )
+    note_changes(NOMINATIONS, [nomination.category_id])
+
+
+@receiver(m2m_changed, sender=Work.nominations.through)
+def nominations_added(sender, instance, action, reverse, pk_set, **kwargs):
+    # Work.nominations.add() writes the links in bulk, without saving each one
+    if action != "post_add" or not pk_set:
+        return
+
+    if reverse:
+        name = names.nomination_name(instance)
+        for work_id in pk_set:
+            names.add_names(work_id, instance.category_id, [name])
+    else:
+        names.add_names(
+            instance.pk,
+            instance.category_id,
+            Nomination.objects.filter(pk__in=pk_set).values_list(
+                "normalized_name", flat=True
+            ),
+        )
+    # works and nominations both belong to the category
+    note_changes(NOMINATIONS, [instance.category_id])
+
+
+@receiver(post_delete, sender=CanonicalizedNomination)
+def nomination_unlinked(sender, instance: CanonicalizedNomination, **kwargs):
+    # links are deleted before the nominations they belong to, so the nomination is
+    # still here even when it is the one being deleted
+    nomination = (
+        Nomination.objects.filter(pk=instance.nomination_id)
+        .values_list("category_id", "normalized_name")
+        .first()
+    )
+    if nomination is None:
+        return
+
+    category_id, name = nomination
+    names.remove_names(instance.work_id, category_id, [name])
+    note_changes(NOMINATIONS, [category_id])
+
+
+@receiver(post_save, sender=NominationAdminData)
+@receiver(post_delete, sender=NominationAdminData)
+def nomination_validity_changed(
+    sender, instance: NominationAdminData, raw: bool = False, **kwargs
+):
+    if raw:
+        return
+
+    note_changes(
+        NOMINATIONS,
+        Nomination.objects.filter(pk=instance.nomination_id).values_list(
+            "category_id", flat=True
+        ),
+    )
+
+
+@receiver(post_save, sender=Nomination)
+def nomination_saved(sender, instance: Nomination, created: bool, raw=False, **kwargs):
+    # an edited nomination may go by a different name
+    if raw or created:
+        return
+
+    work_ids = list(
+        CanonicalizedNomination.objects.filter(nomination=instance).values_list(
+            "work_id", flat=True
+        )
+    )
+    names.refresh_work_names(work_ids)
+
+
+@receiver(nomination_names_changed)
+def category_names_changed(sender, category, **kwargs):
+    names.rebuild_work_names([category.pk])
+    # the renamed nominations keep their dates, so the next clustering run has to
+    # rescore all of them
+    ClusteringState.objects.filter(category=category).update(clustered_through=None)
@@ -2,7 +2,7 @@
 
 from typing import Literal, TypedDict
 
-from nomnom.wsfs.rules.constitution_2023 import CountData, NominatingBallots
+from nomnom.wsfs.rules.constitution_2023 import CountData, NominatingBallots, StepLog
 
 
 class SankeyNode(TypedDict):
@@ -33,13 +33,22 @@ class SankeyData(TypedDict):
 type EphStep = tuple[list, dict[str, CountData], list[str]]
 
 
+def _step_sizes(steps: list[EphStep] | StepLog) -> list[int]:
+    """The number of works counted at each step."""
+    if isinstance(steps, StepLog):
+        return steps.sizes()
+    return [len(counts) for _, counts, _ in steps]
+
+
 def _select_visible_steps(
-    steps: list[EphStep], mode: Literal["compact"] | Literal["full"]
+    steps: list[EphStep] | StepLog, mode: Literal["compact"] | Literal["full"]
 ) -> tuple[list[EphStep], int]:
-    """Return the visible steps and the absolute index of the first visible step."""
+    """Return the visible steps and the absolute index of the first visible step.
+
+    Only the visible steps are rebuilt from a `StepLog`."""
     if mode == "compact":
         # compact mode shows the set from when there are 15 or fewer candidates remaining
-        step_sizes = [(i, len(counts)) for i, (_, counts, _) in enumerate(steps)]
+        step_sizes = list(enumerate(_step_sizes(steps)))
         idx = (
             len(steps) - 10
         )  # default to last 10 steps if we never find a step with <=15 candidates
@@ -50,7 +59,7 @@ def _select_visible_steps(
         visible = steps[idx:]
         first_visible_idx = max(0, len(steps) - len(visible))
     else:
-        visible = steps
+        visible = steps[:]
         first_visible_idx = 0
     return visible, first_visible_idx
 
@@ -333,14 +342,15 @@ def _create_other_node_and_link(
 
 
 def transform_eph_to_sankey(
-    steps: list[EphStep],
+    steps: list[EphStep] | StepLog,
     finalists: set[str],
     mode: Literal["compact"] | Literal["full"] = "compact",
 ) -> SankeyData:
     """Transform EPH elimination steps into Sankey diagram data.
 
     Args:
-        steps: EPH elimination steps from constitution_2023.eph().
+        steps: EPH elimination steps from constitution_2023.eph(), either as a
+            list or as the `StepLog` that recorded them.
         finalists: Set of finalist work names.
         mode: Display mode -- "compact" (last 15 candidates) or "full" (all steps).
 
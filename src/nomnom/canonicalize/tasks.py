@@ -0,0 +1,108 @@
+from datetime import UTC, datetime
+
+import sentry_sdk
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.core.cache import cache
+
+from nomnom.canonicalize import clustering
+from nomnom.canonicalize.admin import (
+    EPH_CACHE_TIMEOUT,
+    count_category,
+    nomination_counter,
+)
+from nomnom.nominate import models as nominate
+
+logger = get_task_logger(__name__)
+
+
+class COUNT_STATE:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+def _status_key(category_id: int) -> str:
+    return f"canonicalize:eph-status:{category_id}"
+
+
+def set_count_status(category_id: int, state: str, **details) -> None:
+    cache.set(
+        _status_key(category_id),
+        {"state": state, "updated": datetime.now(UTC), **details},
+        EPH_CACHE_TIMEOUT,
+    )
+
+
+def count_statuses(categories: list[nominate.Category]) -> dict[int, dict]:
+    """The progress of the background count for each category, keyed by category id."""
+    statuses = cache.get_many([_status_key(category.pk) for category in categories])
+    return {
+        category.pk: statuses[_status_key(category.pk)]
+        for category in categories
+        if _status_key(category.pk) in statuses
+    }
+
+
+@shared_task
+def count_election(election_id: int):
+    """Count the finalists for every category of an election.
+
+    Each category is counted by its own task, so the categories are spread across the
+    worker pool's processes rather than counted one after another.
+    """
+    category_ids = list(
+        nominate.Category.objects.filter(election_id=election_id).values_list(
+            "id", flat=True
+        )
+    )
+    for category_id in category_ids:
+        set_count_status(category_id, COUNT_STATE.QUEUED)
+    for category_id in category_ids:
+        count_category_finalists.delay(category_id)
+
+
+@shared_task
+def count_category_finalists(category_id: int):
+    """Count the finalists for a category, storing the result in a `FinalistCount`."""
+    try:
+        category = nominate.Category.objects.get(pk=category_id)
+    except nominate.Category.DoesNotExist:
+        logger.warning("Category with id=%d does not exist", category_id)
+        return
+
+    set_count_status(category_id, COUNT_STATE.RUNNING)
+    try:
+        _finalists, steps = count_category(category, nomination_counter())
+    except Exception as e:
+        sentry_sdk.capture_exception(e)
+        set_count_status(category_id, COUNT_STATE.FAILED, error=str(e))
+        raise
+
+    set_count_status(category_id, COUNT_STATE.DONE, rounds=len(steps))
+
+
+@shared_task
+def propose_election_groups(election_id: int):
+    """Propose groups of nominations for every category of an election, each category
+    in its own task."""
+    category_ids = nominate.Category.objects.filter(
+        election_id=election_id
+    ).values_list("id", flat=True)
+    for category_id in category_ids:
+        propose_category_groups.delay(category_id)
+
+
+@shared_task
+def propose_category_groups(category_id: int):
+    """Bring a category's proposed groups up to date with the nominations saved since
+    the last run."""
+    try:
+        category = nominate.Category.objects.get(pk=category_id)
+    except nominate.Category.DoesNotExist:
+        logger.warning("Category with id=%d does not exist", category_id)
+        return
+
+    scored = clustering.propose_groups(category)
+    logger.info("Scored %d new names in category %d", scored, category_id)
@@ -1,12 +1,16 @@
 import csv
+import dataclasses
 import io
 import random
 from collections import Counter
 
 import pytest
 from django.contrib import admin
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from waffle.testutils import override_switch
 
@@ -15,15 +19,20 @@ from nomnom.canonicalize.admin import (
     GroupNominationsForm,
     NominationGroupingView,
     build_eph_csv,
+    category_fingerprint,
 )
 from nomnom.canonicalize.factories import WorkFactory
-from nomnom.canonicalize.models import CanonicalizedNomination
+from nomnom.canonicalize.models import CanonicalizedNomination, remove_canonicalization
+from nomnom.convention import HugoAwards
+from nomnom.nominate.admin import set_validation
 from nomnom.nominate.factories import (
     CategoryFactory,
     NominatingMemberProfileFactory,
     NominationFactory,
 )
 from nomnom.nominate.models import Nomination
+from nomnom.wsfs.rules import incremental_eph
+from nomnom.wsfs.rules.constitution_2023 import InternedBallots
 
 pytestmark = pytest.mark.usefixtures("db")
 
@@ -202,6 +211,30 @@ def test_matching_works_uses_average_similarity_across_nominations(
     assert form.matching_works[0] == dune_work
 
 
+def test_matching_works_scores_the_selection_in_one_query(
+    work_factory, nomination_factory, category_factory, modeladmin
+):
+    category = category_factory()
+    dune = work_factory(name="Dune", category=category)
+    for title in ["Dune", "Dune ", "dune", "Dune!", "Dunes"] * 10:
+        nomination_factory(category=category, field_1=title)
+    request = RequestFactory().get("/admin/canonicalize/canonicalizednomination/")
+
+    with CaptureQueriesContext(connection) as queries:
+        form = GroupNominationsForm(
+            modeladmin=modeladmin,
+            action="group_works",
+            request=request,
+            queryset=Nomination.objects.all(),
+        )
+
+    assert form.matching_works[0] == dune
+    similarity_queries = [
+        q for q in queries.captured_queries if "word_similarity(" in q["sql"].lower()
+    ]
+    assert len(similarity_queries) == 1
+
+
 @pytest.mark.django_db
 class TestFinalistsCsv:
     """Test the EPH elimination CSV report includes Final Score and Number of Ballots columns."""
@@ -263,6 +296,21 @@ class TestFinalistsCsv:
             )
             assert int(row[2]) > 0, "Every candidate must appear on at least one ballot"
 
+    def test_csv_uses_the_configured_nomination_counter(
+        self, staff_client, eph_category, registry
+    ):
+        eph_numpy = pytest.importorskip("nomnom.wsfs.rules.eph_numpy")
+        url = reverse("canonicalize:finalist_report", args=[eph_category.pk])
+        reference = staff_client.get(url).content
+
+        registry.register_value(HugoAwards, eph_numpy.hugo_awards)
+        # the first count is cached; make sure the configured counter runs
+        cache.clear()
+        response = staff_client.get(url)
+
+        assert response.status_code == 200
+        assert response.content == reference
+
     def test_csv_values_with_elimination_rounds(self):
         """Hand-verified EPH scenario with elimination rounds.
 
@@ -336,3 +384,105 @@ class TestFinalistsCsv:
         # A is named by 2 ballots, written down 3 times
         assert ballot_counts["A"] == "2"
         assert ballot_counts["B"] == "3"
+
+    def test_interned_ballots_produce_the_same_csv(self):
+        ballots = [
+            Counter(["A", "B", "C"]),
+            Counter(["A", "B", "C"]),
+            Counter(["A", "A", "B", "D"]),
+            Counter(["A"]),
+        ]
+
+        assert build_eph_csv(
+            InternedBallots.from_ballots(ballots), finalist_count=2
+        ) == build_eph_csv(ballots, finalist_count=2)
+
+
+@pytest.mark.django_db
+class TestEphCache:
+    """The EPH views share one cached count until the category's nominations change."""
+
+    @pytest.fixture(autouse=True)
+    def enable_switches(self):
+        cache.clear()
+        with (
+            override_switch(feature_switches.SWITCH_FINALIST_CSV_TABLE, active=True),
+            override_switch(feature_switches.SWITCH_SANKEY_DIAGRAM, active=True),
+        ):
+            yield
+
+    @pytest.fixture
+    def counted(self, registry, constitution):
+        """Count the EPH runs made through the registered HugoAwards."""
+        runs = []
+
+        def counter(ballots, **kwargs):
+            runs.append(ballots)
+            return incremental_eph(ballots, **kwargs)
+
+        registry.register_value(
+            HugoAwards,
+            dataclasses.replace(constitution.hugo_awards, nomination_counter=counter),
+        )
+        return runs
+
+    @pytest.fixture
+    def eph_category(self, election):
+        category = CategoryFactory.create(
+            election=election, fields=1, ballot_position=1
+        )
+        works = [WorkFactory(category=category, name=f"Work {i}") for i in range(8)]
+
+        rng = random.Random(7)
+        for _ in range(10):
+            nominator = NominatingMemberProfileFactory()
+            for work in rng.sample(works, 4):
+                NominationFactory(
+                    category=category, nominator=nominator, field_1=work.name
+                )
+
+        return category
+
+    def test_views_share_one_count(self, admin_client, eph_category, counted):
+        for name in ["finalists", "finalist_report", "sankey-data", "finalists"]:
+            response = admin_client.get(
+                reverse(f"canonicalize:{name}", args=[eph_category.pk])
+            )
+            assert response.status_code == 200
+
+        assert len(counted) == 1
+
+    def test_invalidating_a_nomination_recounts(
+        self, admin_client, eph_category, counted
+    ):
+        url = reverse("canonicalize:finalist_report", args=[eph_category.pk])
+        admin_client.get(url)
+
+        nomination = Nomination.objects.filter(
+            category=eph_category, works__isnull=False
+        ).first()
+        set_validation(Nomination.objects.filter(pk=nomination.pk), False)
+        admin_client.get(url)
+
+        assert len(counted) == 2
+
+    def test_fingerprint_tracks_canonicalization_changes(self, eph_category):
+        fingerprint = category_fingerprint(eph_category)
+        assert category_fingerprint(eph_category) == fingerprint
+
+        work = eph_category.work_set.first()
+        work.name = "Renamed"
+        work.save()
+        renamed = category_fingerprint(eph_category)
+        assert renamed != fingerprint
+
+        remove_canonicalization(Nomination.objects.filter(works=work)[:1])
+        assert category_fingerprint(eph_category) != renamed
+
+    def test_fingerprint_is_per_category(self, election, eph_category):
+        other = CategoryFactory.create(election=election, fields=1, ballot_position=2)
+        before = category_fingerprint(other)
+
+        set_validation(Nomination.objects.filter(category=eph_category), False)
+
+        assert category_fingerprint(other) == before
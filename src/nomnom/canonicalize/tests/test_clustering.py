@@ -0,0 +1,174 @@
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+
+from nomnom.canonicalize import clustering
+from nomnom.canonicalize.factories import WorkFactory
+from nomnom.canonicalize.models import (
+    CanonicalizedNomination,
+    ProposedGroup,
+    group_nominations,
+)
+from nomnom.nominate import models as nominate
+from nomnom.nominate.factories import NominationFactory, TwoFieldCategoryFactory
+
+pytestmark = pytest.mark.usefixtures("db")
+
+
+def nominate_as(category, title: str, times: int = 1) -> list[nominate.Nomination]:
+    return [
+        NominationFactory.create(category=category, field_1=title, field_2="")
+        for _ in range(times)
+    ]
+
+
+def proposed(category) -> dict[str, set[str]]:
+    return {
+        group.name: {n.name for n in group.names.all()}
+        for group in ProposedGroup.objects.filter(category=category)
+    }
+
+
+def test_similarity_is_pg_trgm_similarity():
+    assert clustering.similarity(
+        clustering.trigrams("word"), clustering.trigrams("two words")
+    ) == pytest.approx(4 / 11)
+
+
+def test_variant_spellings_are_proposed_together(category):
+    nominate_as(category, "The Starlight Covenant", 3)
+    nominate_as(category, "Starlight Covenent")
+    nominate_as(category, "Memory's Edge", 2)
+
+    clustering.propose_groups(category)
+
+    assert proposed(category) == {
+        "the starlight covenant": {"the starlight covenant", "starlight covenent"}
+    }
+    group = ProposedGroup.objects.get(category=category)
+    assert group.work is None
+    assert 0.5 < group.confidence < 1
+
+
+def test_names_like_an_existing_work_are_proposed_for_it(category):
+    work = WorkFactory.create(category=category, name="The Starlight Covenant")
+    nominate_as(category, "Starlight Covenent", 2)
+
+    clustering.propose_groups(category)
+
+    group = ProposedGroup.objects.get(category=category)
+    assert group.work == work
+    assert group.nominations().count() == 2
+
+
+def test_only_new_nominations_are_scored(category):
+    nominate_as(category, "The Starlight Covenant", 2)
+    nominate_as(category, "Starlight Covenent")
+    nominate_as(category, "Memory's Edge")
+    nominate_as(category, "Memorys Edge")
+    assert clustering.propose_groups(category) == 4
+    memory = ProposedGroup.objects.get(category=category, name="memory's edge")
+
+    assert clustering.propose_groups(category) == 0
+
+    nominate_as(category, "The Starlite Covenant")
+    assert clustering.propose_groups(category) == 1
+
+    assert proposed(category)["the starlight covenant"] == {
+        "the starlight covenant",
+        "starlight covenent",
+        "the starlite covenant",
+    }
+    # the group the new name didn't join was left alone
+    assert ProposedGroup.objects.filter(pk=memory.pk).exists()
+
+
+def test_renamed_nominations_are_scored_again():
+    category = TwoFieldCategoryFactory.create(field_2_used_for_canonicalization=False)
+    for title in [
+        "The Starlight Covenant",
+        "The Starlight Covenant",
+        "Starlight Covenent",
+    ]:
+        NominationFactory.create(category=category, field_1=title, field_2="A. Writer")
+    clustering.propose_groups(category)
+
+    category.field_2_used_for_canonicalization = True
+    category.save()
+
+    assert clustering.propose_groups(category) == 2
+    assert proposed(category) == {
+        "the starlight covenant a. writer": {
+            "the starlight covenant a. writer",
+            "starlight covenent a. writer",
+        }
+    }
+
+
+def test_canonicalized_names_drop_out_of_their_groups(category):
+    nominate_as(category, "The Starlight Covenant", 2)
+    nominate_as(category, "Starlight Covenent")
+    variant = nominate_as(category, "The Starlight Covenant!")
+    clustering.propose_groups(category)
+
+    group_nominations(
+        nominate.Nomination.objects.filter(pk__in=[n.pk for n in variant]), None
+    )
+    clustering.propose_groups(category)
+
+    assert proposed(category) == {
+        "the starlight covenant": {"the starlight covenant", "starlight covenent"}
+    }
+
+
+def test_accepting_a_group_links_its_nominations(category):
+    nominations = nominate_as(category, "The Starlight Covenant", 2)
+    nominations += nominate_as(category, "Starlight Covenent")
+    clustering.propose_groups(category)
+
+    work = clustering.accept_group(ProposedGroup.objects.get(category=category))
+
+    assert work.name == "The Starlight Covenant"
+    assert set(
+        CanonicalizedNomination.objects.filter(work=work).values_list(
+            "nomination_id", flat=True
+        )
+    ) == {n.pk for n in nominations}
+    assert not ProposedGroup.objects.exists()
+
+
+def test_accepting_a_group_under_a_work(category):
+    work = WorkFactory.create(category=category, name="The Starlight Covenant")
+    nominate_as(category, "Starlight Covenent", 2)
+    clustering.propose_groups(category)
+
+    assert clustering.accept_group(ProposedGroup.objects.get()) == work
+    assert work.nominations.count() == 2
+
+
+def test_election_page_queues_the_job(admin_client, election, category):
+    nominate_as(category, "The Starlight Covenant", 2)
+    nominate_as(category, "Starlight Covenent")
+    url = reverse("canonicalize:election-proposals", args=[election.pk])
+
+    with patch("nomnom.canonicalize.tasks.propose_category_groups") as mock_task:
+        response = admin_client.post(url)
+
+    assert response.status_code == 302
+    mock_task.delay.assert_called_once_with(category.pk)
+    assert admin_client.get(url).status_code == 200
+
+
+def test_review_screen_lists_the_proposals(admin_client, category):
+    nominate_as(category, "The Starlight Covenant", 2)
+    nominate_as(category, "Starlight Covenent")
+    clustering.propose_groups(category)
+
+    response = admin_client.get(
+        reverse("admin:canonicalize_proposedgroup_changelist"),
+        {"category": category.pk},
+    )
+
+    assert response.status_code == 200
+    assert "the starlight covenant" in response.content.decode()
@@ -362,6 +362,24 @@ def test_find_matches_ordered_by_similarity(db):
     assert fuzzy in results
 
 
+def test_fuzzy_matching_leaves_the_threshold_as_it_was(db):
+    category = CategoryFactory.create()
+    WorkFactory.create(name="The Hobbit", category=category)
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT similarity('', '')")
+        cursor.execute(
+            "SELECT set_config('pg_trgm.word_similarity_threshold', '0.5', true)"
+        )
+
+        Work.find_fuzzy_matches("The Hobbit", category)
+
+        cursor.execute(
+            "SELECT current_setting('pg_trgm.word_similarity_threshold', true)"
+        )
+        assert cursor.fetchone()[0] == "0.5"
+
+
 def test_find_matches_respects_limit(db):
     """Ensure find_fuzzy_matches respects the limit parameter."""
     category = CategoryFactory.create()
@@ -397,6 +415,19 @@ def test_find_matches_by_linked_nomination_fields(db):
     assert work in results
 
 
+def test_group_matches_average_over_the_nominations(db):
+    """A work's similarity to a group counts the nominations it doesn't match as 0."""
+    category = CategoryFactory.create()
+    hobbit = WorkFactory.create(name="The Hobbit", category=category)
+    for title in ["The Hobbit", "the hobbit", "Neuromancer", "Neuromancer"]:
+        NominationFactory.create(category=category, field_1=title)
+
+    results = Work.find_group_matches(nominate.Nomination.objects.all())
+
+    assert results == [hobbit]
+    assert results[0].similarity == pytest.approx(0.5)
+
+
 class TestCanonicalizationFlagPermutations:
     """Test that canonicalization flags control which fields contribute to work matching."""
 
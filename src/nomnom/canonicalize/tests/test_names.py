@@ -0,0 +1,165 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from nomnom.canonicalize import names
+from nomnom.canonicalize.factories import WorkFactory
+from nomnom.canonicalize.models import (
+    CanonicalizedNomination,
+    WorkName,
+    group_nominations,
+    remove_canonicalization,
+)
+from nomnom.nominate import models as nominate
+from nomnom.nominate.factories import NominationFactory, TwoFieldCategoryFactory
+from nomnom.nominate.tasks import link_nominations_to_works
+
+pytestmark = pytest.mark.usefixtures("db")
+
+
+def indexed(work) -> dict[str, tuple[int, bool]]:
+    return {
+        n.name: (n.nominations, n.is_work_name)
+        for n in WorkName.objects.filter(work=work)
+    }
+
+
+def nomination(category, title: str) -> nominate.Nomination:
+    return NominationFactory.create(category=category, field_1=title, field_2="")
+
+
+def test_work_goes_by_its_own_name(category):
+    work = WorkFactory.create(category=category, name="  The Starlight Covenant ")
+
+    assert indexed(work) == {"the starlight covenant": (0, True)}
+
+    work.name = "Starlight Covenant"
+    work.save()
+
+    assert indexed(work) == {"starlight covenant": (0, True)}
+
+
+def test_grouping_counts_nomination_names(category):
+    noms = [
+        nomination(category, "Starlight Covenant"),
+        nomination(category, "starlight covenant"),
+        nomination(category, "Star Light Covenant"),
+    ]
+
+    work = group_nominations(
+        nominate.Nomination.objects.filter(pk__in=[n.pk for n in noms]), None
+    )
+
+    assert indexed(work) == {
+        "starlight covenant": (2, True),
+        "star light covenant": (1, False),
+    }
+
+
+def test_unlinking_drops_names_no_nomination_goes_by(category):
+    kept = nomination(category, "Starlight Covenant")
+    dropped = nomination(category, "Star Light Covenant")
+    work = WorkFactory.create(category=category, name="The Starlight Covenant")
+    work.nominations.add(kept, dropped)
+
+    remove_canonicalization(nominate.Nomination.objects.filter(pk=dropped.pk))
+
+    assert indexed(work) == {
+        "the starlight covenant": (0, True),
+        "starlight covenant": (1, False),
+    }
+
+
+def test_combining_moves_names_to_the_primary_work(category):
+    primary = WorkFactory.create(category=category, name="Starlight Covenant")
+    other = WorkFactory.create(category=category, name="Star Light Covenant")
+    other.nominations.add(nomination(category, "Star Light Covenant"))
+
+    primary.combine_works([other])
+
+    assert indexed(primary) == {
+        "starlight covenant": (0, True),
+        "star light covenant": (1, False),
+    }
+    assert not WorkName.objects.filter(work_id=other.pk).exists()
+
+
+def test_editing_a_nomination_renames_it(category):
+    nom = nomination(category, "Starlight Covenent")
+    work = WorkFactory.create(category=category, name="Starlight Covenant")
+    work.nominations.add(nom)
+
+    nom.field_1 = "Starlight Covenant"
+    nom.save()
+
+    assert indexed(work) == {"starlight covenant": (1, True)}
+
+
+def test_find_works_prefers_own_names(category):
+    nominated = WorkFactory.create(category=category, name="Memory's Edge")
+    nominated.nominations.add(nomination(category, "Memories Edge"))
+    named = WorkFactory.create(category=category, name="Memories Edge")
+
+    assert names.find_works([(category.pk, "memories edge")]) == {
+        (category.pk, "memories edge"): named.pk
+    }
+    assert names.find_works([(category.pk, "memory's edge")]) == {
+        (category.pk, "memory's edge"): nominated.pk
+    }
+    assert names.find_works([(category.pk + 1, "memories edge")]) == {}
+
+
+def test_rebuild_matches_maintained_names(category):
+    work = WorkFactory.create(category=category, name="Starlight Covenant")
+    work.nominations.add(
+        nomination(category, "Starlight Covenant"),
+        nomination(category, "Star Light Covenant"),
+    )
+    maintained = indexed(work)
+
+    names.rebuild_work_names([category.pk])
+
+    assert indexed(work) == maintained
+
+
+def test_changing_canonicalization_fields_rebuilds_names():
+    category = TwoFieldCategoryFactory.create(field_2_used_for_canonicalization=False)
+    work = WorkFactory.create(category=category, name="Starlight Covenant")
+    work.nominations.add(
+        NominationFactory.create(
+            category=category, field_1="Starlight Covenant", field_2="A. Author"
+        )
+    )
+    assert indexed(work) == {"starlight covenant": (1, True)}
+
+    category.field_2_used_for_canonicalization = True
+    category.save()
+
+    assert indexed(work) == {
+        "starlight covenant": (0, True),
+        "starlight covenant a. author": (1, False),
+    }
+
+
+def test_linking_counts_the_linked_names(category):
+    work = WorkFactory.create(category=category, name="Starlight Covenant")
+    noms = [nomination(category, "starlight covenant") for _ in range(2)]
+
+    link_nominations_to_works([n.pk for n in noms])
+
+    assert CanonicalizedNomination.objects.filter(work=work).count() == 2
+    assert indexed(work) == {"starlight covenant": (2, True)}
+
+
+def test_linking_doesnt_read_the_whole_category(category):
+    WorkFactory.create_batch(20, category=category)
+    work = WorkFactory.create(category=category, name="Starlight Covenant")
+    nom = nomination(category, "Starlight Covenant")
+    CanonicalizedNomination.objects.filter(nomination=nom).delete()
+
+    with CaptureQueriesContext(connection) as queries:
+        link_nominations_to_works([nom.pk])
+
+    nom.refresh_from_db()
+    assert nom.work == work
+    assert not any('"canonicalize_work"' in q["sql"] for q in queries.captured_queries)
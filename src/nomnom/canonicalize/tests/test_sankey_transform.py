@@ -1151,3 +1151,20 @@ def test_display_step_preserves_absolute_index_compact_mode(sample_eph_steps):
             f"Node {node['id']}: step={node['step']} != "
             f"display_step={node['display_step']} - {first_visible_idx}"
         )
+
+
+@pytest.mark.parametrize("mode", ["compact", "full"])
+def test_transform_accepts_a_step_log(sample_eph_steps, mode):
+    """A StepLog produces the same diagram as the list of steps it recorded."""
+    from nomnom.canonicalize.sankey import transform_eph_to_sankey
+    from nomnom.wsfs.rules.constitution_2023 import StepLog
+
+    extended_steps = _make_extended_steps(sample_eph_steps)
+    log = StepLog()
+    for ballots, counts, eliminations in extended_steps:
+        log(ballots, counts, eliminations)
+
+    finalists = {"Work A", "Work B", "Work C"}
+    assert transform_eph_to_sankey(
+        log, finalists, mode=mode
+    ) == transform_eph_to_sankey(extended_steps, finalists, mode=mode)
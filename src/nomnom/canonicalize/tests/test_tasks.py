@@ -0,0 +1,173 @@
+import random
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from nomnom.canonicalize.admin import stored_counts
+from nomnom.canonicalize.factories import WorkFactory
+from nomnom.canonicalize.models import FinalistCount
+from nomnom.canonicalize.tasks import (
+    COUNT_STATE,
+    count_category_finalists,
+    count_election,
+    count_statuses,
+)
+from nomnom.nominate.admin import set_validation
+from nomnom.nominate.factories import (
+    CategoryFactory,
+    NominatingMemberProfileFactory,
+    NominationFactory,
+)
+from nomnom.nominate.models import Nomination
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def categories(election):
+    categories = [
+        CategoryFactory.create(election=election, fields=1, ballot_position=position)
+        for position in range(1, 4)
+    ]
+    rng = random.Random(11)
+    for category in categories:
+        works = [
+            WorkFactory(category=category, name=f"{category.name} {i}")
+            for i in range(8)
+        ]
+        for _ in range(10):
+            nominator = NominatingMemberProfileFactory()
+            for work in rng.sample(works, 4):
+                NominationFactory(
+                    category=category, nominator=nominator, field_1=work.name
+                )
+    return categories
+
+
+@pytest.mark.django_db
+class TestCountElection:
+    def test_dispatches_a_task_per_category(self, election, categories):
+        with patch("nomnom.canonicalize.tasks.count_category_finalists") as mock_task:
+            count_election(election.id)
+
+        assert sorted(
+            call.args[0] for call in mock_task.delay.call_args_list
+        ) == sorted(category.id for category in categories)
+        assert {status["state"] for status in count_statuses(categories).values()} == {
+            COUNT_STATE.QUEUED
+        }
+
+    def test_counts_every_category(self, election, categories):
+        count_election(election.id)
+
+        statuses = count_statuses(categories)
+        counts = stored_counts(categories)
+        for category in categories:
+            assert statuses[category.id]["state"] == COUNT_STATE.DONE
+            assert counts[category.id].finalists
+            assert not counts[category.id].stale
+
+    def test_counts_outlive_the_cache(self, election, categories):
+        count_election(election.id)
+        finalists = {
+            category.id: count.finalists
+            for category, count in zip(
+                categories, stored_counts(categories).values(), strict=True
+            )
+        }
+        cache.clear()
+
+        counts = stored_counts(categories)
+        assert {
+            category.id: counts[category.id].finalists for category in categories
+        } == finalists
+
+    def test_counts_are_stale_once_nominations_change(
+        self, election, categories, django_capture_on_commit_callbacks
+    ):
+        count_election(election.id)
+        changed, *unchanged = categories
+
+        work = changed.work_set.first()
+        work.name = "A New Name"
+        with django_capture_on_commit_callbacks(execute=True):
+            work.save()
+
+        counts = stored_counts(categories)
+        assert counts[changed.id].stale
+        assert not any(counts[category.id].stale for category in unchanged)
+
+        count_category_finalists(changed.id)
+        assert not stored_counts([changed])[changed.id].stale
+
+    def test_counts_are_stale_once_a_nomination_is_invalidated(
+        self, election, categories, django_capture_on_commit_callbacks
+    ):
+        count_election(election.id)
+        category = categories[0]
+        nomination = Nomination.objects.filter(category=category).first()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            set_validation(Nomination.objects.filter(pk=nomination.pk), False)
+
+        assert stored_counts([category])[category.id].stale
+
+    def test_an_unchanged_recount_is_not_stale(
+        self, election, categories, django_capture_on_commit_callbacks
+    ):
+        count_election(election.id)
+        category = categories[0]
+        work = category.work_set.first()
+        with django_capture_on_commit_callbacks(execute=True):
+            work.save()
+        assert stored_counts([category])[category.id].stale
+        cache.clear()
+
+        count_category_finalists(category.id)
+
+        assert not stored_counts([category])[category.id].stale
+        assert FinalistCount.objects.filter(category=category).count() == 1
+
+    def test_missing_category_is_skipped(self, categories):
+        count_category_finalists(-1)
+
+        assert count_statuses(categories) == {}
+
+
+@pytest.mark.django_db
+class TestElectionFinalistsView:
+    def test_lists_every_category(self, admin_client, election, categories):
+        url = reverse("canonicalize:election-finalists", args=[election.pk])
+        response = admin_client.get(url)
+
+        assert response.status_code == 200
+        for category in categories:
+            assert category.name in response.content.decode()
+
+    def test_post_counts_every_category(self, admin_client, election, categories):
+        url = reverse("canonicalize:election-finalists", args=[election.pk])
+        response = admin_client.post(url)
+
+        assert response.status_code == 302
+        assert set(stored_counts(categories)) == {
+            category.id for category in categories
+        }
+        response = admin_client.get(url)
+        assert all(row["count"] for row in response.context["rows"])
+
+    def test_does_not_fingerprint_the_categories(
+        self, admin_client, election, categories, django_assert_max_num_queries
+    ):
+        count_election(election.id)
+        url = reverse("canonicalize:election-finalists", args=[election.pk])
+
+        with django_assert_max_num_queries(20) as queries:
+            response = admin_client.get(url)
+
+        assert response.status_code == 200
+        assert not [q for q in queries.captured_queries if "MD5(" in q["sql"]]
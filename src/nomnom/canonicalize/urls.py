@@ -30,6 +30,16 @@ urlpatterns = [
         admin.sankey_view,
         name="sankey",
     ),
+    path(
+        "election/<int:election_id>/finalists/",
+        admin.election_finalists,
+        name="election-finalists",
+    ),
+    path(
+        "election/<int:election_id>/proposals/",
+        admin.election_proposals,
+        name="election-proposals",
+    ),
     path(
         "<int:category_id>/make-work/<int:nominee_id>/",
         admin.make_work,
@@ -6,7 +6,7 @@ import subprocess
 from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import date, datetime
-from typing import Protocol, TypedDict
+from typing import TYPE_CHECKING, Protocol, TypedDict
 from urllib.parse import urlparse
 
 from django.http import HttpRequest
@@ -15,6 +15,9 @@ from environ import bool_var, config, group, to_config, var
 from pyrankvote import Ballot, Candidate
 from pyrankvote.helpers import ElectionResults
 
+if TYPE_CHECKING:
+    from nomnom.wsfs.rules.constitution_2023 import EPHBallots, StepRecorder
+
 
 class ConventionException(Exception): ...
 
@@ -200,8 +203,20 @@ class HugoCounter(Protocol):
     ) -> ElectionResults: ...
 
 
+class NominationCounter(Protocol):
+    def __call__(
+        self,
+        ballots: "EPHBallots",
+        finalist_count: int = 6,
+        record_steps: "StepRecorder" = ...,
+    ) -> list[str] | None: ...
+
+
 @dataclass
 class HugoAwards:
     results_class: type[ElectionResults]
     counter: HugoCounter
     hugo_nominations_per_member: int
+    # The EPH implementation used to select finalists from the nominating ballots; if
+    # unset, the incremental engine from the 2023 constitution is used.
+    nomination_counter: NominationCounter | None = None
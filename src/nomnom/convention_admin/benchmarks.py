@@ -0,0 +1,338 @@
+"""Benchmarks for the nominating and final ballot counts at Worldcon scale.
+
+Each benchmark is run over synthetic ballots from nominators who pick works the way the
+seed commands do (with `WorkSelector` and `VariationGenerator`), for a grid of
+nominator and distinct work counts. The ballots are generated from a seed, so the same
+seed gives the same ballots on every run.
+
+For each implementation, a benchmark records the best wall-clock time of a few runs and
+the peak memory of a separate, traced run, and checks its output against the reference
+implementation:
+
+* eph: `incremental_eph` and, with NumPy installed, `eph_numpy.eph`, against `eph`;
+* hugo_voting: `hugo_voting` against `pyrankvote_hugo_voting`, on a final ballot of the
+  EPH finalists and No Award;
+* build_eph_csv: the report from `incremental_eph` against the one from `eph`;
+* transform_eph_to_sankey: both display modes, from the `StepLog` of `incremental_eph`
+  against the one from `eph`.
+
+The results are plain dicts, so they can be saved as JSON and compared with a later run
+by `compare_results`.
+"""
+
+import gc
+import random
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from pyrankvote import Ballot, Candidate
+
+from nomnom.canonicalize.admin import build_eph_csv, eph_csv_from_steps
+from nomnom.canonicalize.sankey import transform_eph_to_sankey
+from nomnom.convention_admin.seed_data.sample_works import CATEGORY_MAPPINGS
+from nomnom.convention_admin.utils import VariationGenerator, WorkSelector
+from nomnom.wsfs.rules.constitution_2023 import (
+    InternedBallots,
+    StepLog,
+    deduplicate_ballots,
+    eph,
+    hugo_voting,
+    incremental_eph,
+    pyrankvote_hugo_voting,
+)
+
+try:
+    from nomnom.wsfs.rules import eph_numpy
+except ImportError:
+    eph_numpy = None
+
+BENCHMARKS = ("eph", "hugo_voting", "build_eph_csv", "transform_eph_to_sankey")
+
+NOMINATOR_COUNTS = (1_000, 10_000, 50_000)
+WORK_COUNTS = (5, 50, 5_000)
+
+FINALIST_COUNT = 6
+
+# How many works each nominator writes down, as in the EPH tests: most fill the ballot
+NOMINATIONS_PER_BALLOT = [5] * 60 + [4] * 20 + [3] * 10 + [2] * 7 + [1] * 3
+
+# How often a voter ranks each finalist on the final ballot, as in fake_ballots
+FINALIST_VOTE_PROBABILITY = 0.90
+
+
+@contextmanager
+def seeded(seed: int) -> Iterator[None]:
+    """Seed `random` for the block, and put its state back afterwards.
+
+    `WorkSelector` and `VariationGenerator` draw from the module-level generator."""
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        yield
+    finally:
+        random.setstate(state)
+
+
+def synthetic_works(count: int) -> list[dict]:
+    """*count* works with distinct titles, in the format of the sample works.
+
+    The sample works, with their popularity and variations, come first; the rest are a
+    long tail of unpopular made-up titles.
+    """
+    works: dict[str, dict] = {}
+    for _required, _excluded, samples in CATEGORY_MAPPINGS:
+        for work in samples:
+            works.setdefault(work["canonical"]["field_1"], work)
+
+    tail = (
+        {
+            "canonical": {"field_1": f"Synthetic Work {n}"},
+            "popularity_weight": 1 + n % 5,
+        }
+        for n in range(count)
+    )
+    return [*works.values(), *tail][:count]
+
+
+def nominating_ballots(
+    nominators: int, works: list[dict], canonicalized: bool = True
+) -> list[Counter[str]]:
+    """One ballot per nominator, naming works from *works*.
+
+    Ballots name each work by its canonical title, as they are counted once the
+    nominations have been canonicalized. Otherwise, they name it as the nominator wrote
+    it down, which may be one of its variations.
+    """
+    selector = WorkSelector(works)
+    variations = VariationGenerator()
+    ballots = []
+    for _ in range(nominators):
+        picks = selector.select_works_for_member(random.choice(NOMINATIONS_PER_BALLOT))
+        if canonicalized:
+            names = (work["canonical"]["field_1"] for work in picks)
+        else:
+            names = (variations.select_variation(work)["field_1"] for work in picks)
+        ballots.append(Counter(names))
+    return ballots
+
+
+def interned(ballots: list[Counter[str]]) -> InternedBallots:
+    """*ballots* as the canonicalize admin counts them."""
+    return InternedBallots.from_weighted_ballots(deduplicate_ballots(ballots))
+
+
+def final_ballot(finalists: list[str]) -> list[Candidate]:
+    return [Candidate(name) for name in finalists] + [Candidate("No Award")]
+
+
+def voting_ballots(voters: int, candidates: list[Candidate]) -> list[Ballot]:
+    """One ranked ballot per voter, who ranks most of *candidates* in a random order."""
+    ballots = []
+    for _ in range(voters):
+        ranked = random.sample(candidates, k=len(candidates))
+        ballots.append(
+            Ballot([c for c in ranked if random.random() < FINALIST_VOTE_PROBABILITY])
+        )
+    return ballots
+
+
+@dataclass
+class BenchmarkResult:
+    benchmark: str
+    implementation: str
+    nominators: int
+    works: int
+    seconds: float
+    runs: list[float]
+    peak_memory_bytes: int
+    # None for the reference implementation itself
+    matches_reference: bool | None
+
+    @property
+    def key(self) -> tuple[str, str, int, int]:
+        return (self.benchmark, self.implementation, self.nominators, self.works)
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> tuple[Any, list[float], int]:
+    """Call *fn* *repeat* times, returning its result, the timings and the peak memory.
+
+    The peak is measured on one more, traced, call, so that tracing doesn't slow the
+    timed ones.
+    """
+    runs = []
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        runs.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, runs, peak
+
+
+def recorded(counter: Callable, ballots: Any, steps: Any) -> list[str] | None:
+    return counter(ballots, finalist_count=FINALIST_COUNT, record_steps=steps)
+
+
+def counted_finalists(counter: Callable, ballots: Any) -> Callable[[], Any]:
+    return lambda: counter(ballots, finalist_count=FINALIST_COUNT)
+
+
+def run_benchmarks(
+    nominator_counts: tuple[int, ...] = NOMINATOR_COUNTS,
+    work_counts: tuple[int, ...] = WORK_COUNTS,
+    benchmarks: tuple[str, ...] = BENCHMARKS,
+    repeat: int = 3,
+    seed: int = 0,
+    canonicalized: bool = True,
+    on_result: Callable[[BenchmarkResult], None] | None = None,
+) -> list[BenchmarkResult]:
+    """Run *benchmarks* for every combination of nominator and work counts."""
+    results: list[BenchmarkResult] = []
+
+    for nominators in nominator_counts:
+        for work_count in work_counts:
+            with seeded(seed):
+                ballots = interned(
+                    nominating_ballots(
+                        nominators, synthetic_works(work_count), canonicalized
+                    )
+                )
+
+            def record(
+                benchmark: str,
+                implementation: str,
+                fn: Callable[[], Any],
+                reference: Any = None,
+            ) -> Any:
+                result, runs, peak = measure(fn, repeat)
+                benchmark_result = BenchmarkResult(
+                    benchmark=benchmark,
+                    implementation=implementation,
+                    nominators=nominators,
+                    works=work_count,
+                    seconds=min(runs),
+                    runs=runs,
+                    peak_memory_bytes=peak,
+                    matches_reference=None
+                    if reference is None
+                    else result == reference,
+                )
+                results.append(benchmark_result)
+                if on_result:
+                    on_result(benchmark_result)
+                return result
+
+            # The reference count is needed by every benchmark to check against
+            reference_steps = StepLog()
+            finalists = recorded(eph, ballots, reference_steps)
+
+            if "eph" in benchmarks:
+                expected = record("eph", "eph", counted_finalists(eph, ballots))
+                record(
+                    "eph",
+                    "incremental_eph",
+                    counted_finalists(incremental_eph, ballots),
+                    expected,
+                )
+                if eph_numpy is not None:
+                    record(
+                        "eph",
+                        "eph_numpy",
+                        counted_finalists(eph_numpy.eph, ballots),
+                        expected,
+                    )
+
+            if "hugo_voting" in benchmarks:
+                candidates = final_ballot(finalists or [])
+                with seeded(seed):
+                    votes = voting_ballots(nominators, candidates)
+                expected = record(
+                    "hugo_voting",
+                    "pyrankvote_hugo_voting",
+                    lambda: round_results(pyrankvote_hugo_voting(candidates, votes)),
+                )
+                record(
+                    "hugo_voting",
+                    "hugo_voting",
+                    lambda: round_results(hugo_voting(candidates, votes)),
+                    expected,
+                )
+
+            if "build_eph_csv" in benchmarks:
+                expected = eph_csv_from_steps(reference_steps)
+                record(
+                    "build_eph_csv",
+                    "incremental_eph",
+                    lambda: build_eph_csv(ballots, FINALIST_COUNT),
+                    expected,
+                )
+
+            if "transform_eph_to_sankey" in benchmarks:
+                steps = StepLog()
+                recorded(incremental_eph, ballots, steps)
+                for mode in ("compact", "full"):
+                    expected = transform_eph_to_sankey(
+                        reference_steps, set(finalists or []), mode
+                    )
+                    record(
+                        "transform_eph_to_sankey",
+                        mode,
+                        lambda mode=mode: transform_eph_to_sankey(
+                            steps, set(finalists or []), mode
+                        ),
+                        expected,
+                    )
+
+    return results
+
+
+def round_results(results) -> list:
+    """The rounds of a final ballot count, in a form that can be compared."""
+    return [
+        (
+            [
+                (cr.candidate.name, cr.number_of_votes, cr.status)
+                for cr in round.candidate_results
+            ],
+            round.number_of_blank_votes,
+        )
+        for round in results.rounds
+    ]
+
+
+def results_to_json(results: list[BenchmarkResult], **metadata: Any) -> dict:
+    return {**metadata, "results": [asdict(result) for result in results]}
+
+
+def compare_results(
+    baseline: dict, results: list[BenchmarkResult], tolerance: float = 0.25
+) -> list[tuple[BenchmarkResult, float]]:
+    """The results that are more than *tolerance* slower than in *baseline*, with the
+    ratio of their time to the baseline's.
+
+    Only the benchmarks that are in both runs are compared."""
+    baseline_seconds = {
+        (r["benchmark"], r["implementation"], r["nominators"], r["works"]): r["seconds"]
+        for r in baseline["results"]
+    }
+
+    regressions = []
+    for result in results:
+        before = baseline_seconds.get(result.key)
+        if before and result.seconds > before * (1 + tolerance):
+            regressions.append((result, result.seconds / before))
+    return regressions
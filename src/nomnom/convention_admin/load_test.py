@@ -0,0 +1,316 @@
+"""A load-test harness for rehearsing the surges at nomination and voting close.
+
+Synthetic members log in with their username and password (which needs
+``NOMNOM_ALLOW_USERNAME_LOGIN_FOR_MEMBERS``) and replay ballot traffic against a
+running server over HTTP:
+
+* nominate: load the nominating ballot, then save a filled-in one;
+* vote: load the voting ballot, then cast a ranked one;
+* packet: browse the Hugo packet, then download a file from it.
+
+Some saves are sent twice with the same form, like a double-click. Every request is
+timed, and the results are summarized per endpoint as latency percentiles and error
+rates.
+
+The plan of what to send is built from the database by the ``load_test`` management
+command, so it uses whatever the seed commands created; this module only speaks HTTP.
+"""
+
+import http.cookiejar
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from nomnom.convention_admin.utils import VariationGenerator, WorkSelector
+
+SCENARIOS = ("nominate", "vote", "packet")
+
+SUBMISSION_KEY_RE = re.compile(r'name="submission_key" value="([^"]*)"')
+
+
+@dataclass(frozen=True)
+class CategoryPlan:
+    """What a member can nominate in one category."""
+
+    id: int
+    fields: int
+    required: tuple[bool, ...]
+    # sample works, in the format of nomnom.convention_admin.seed_data
+    works: tuple[dict, ...]
+
+
+@dataclass(frozen=True)
+class LoadTestPlan:
+    """Everything a synthetic member needs to know to exercise the site."""
+
+    login_url: str
+    members: tuple[tuple[str, str], ...]  # (username, password)
+    scenarios: dict[str, float]  # scenario name -> relative weight
+    nominate_url: str | None = None
+    nominating_categories: tuple[CategoryPlan, ...] = ()
+    vote_url: str | None = None
+    # finalist IDs by category ID
+    finalists: dict[int, tuple[int, ...]] = field(default_factory=dict)
+    packet_url: str | None = None
+    packet_file_urls: tuple[str, ...] = ()
+    category_participation: float = 0.75
+    double_submit_rate: float = 0.05
+    think_time: float = 0.0
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    def summary(self) -> dict[str, float | int]:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": self.errors / self.requests if self.requests else 0.0,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+        }
+
+
+class LoadTestResults:
+    """Request timings and errors by endpoint, safe to record from many threads."""
+
+    def __init__(self) -> None:
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, latency: float, ok: bool) -> None:
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, EndpointStats())
+            stats.latencies.append(latency)
+            if not ok:
+                stats.errors += 1
+
+    def summary(self) -> dict[str, dict[str, float | int]]:
+        return {
+            endpoint: stats.summary()
+            for endpoint, stats in sorted(self.endpoints.items())
+        }
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    """The *pct*th percentile of *ordered*, by the nearest-rank method."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+class _NoRedirects(urllib.request.HTTPRedirectHandler):
+    # a redirect is the response we're timing, not a hop to follow
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+@dataclass
+class Response:
+    status: int
+    body: str
+
+
+class MemberSession:
+    """One synthetic member's browser: cookies, CSRF and timing for each request."""
+
+    def __init__(self, base_url: str, results: LoadTestResults, timeout: float = 30):
+        self.base_url = base_url.rstrip("/")
+        self.results = results
+        self.timeout = timeout
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirects
+        )
+
+    def csrf_token(self) -> str:
+        return next((c.value for c in self.cookies if c.name == "csrftoken"), "")
+
+    def request(
+        self,
+        endpoint: str,
+        path: str,
+        data: dict[str, Any] | None = None,
+        ok: Callable[[int], bool] = lambda status: status < 400,
+    ) -> Response | None:
+        url = f"{self.base_url}{path}"
+        headers = {"Referer": url}
+        body = None
+        if data is not None:
+            body = urllib.parse.urlencode(
+                {"csrfmiddlewaretoken": self.csrf_token(), **data}
+            ).encode()
+            headers["X-CSRFToken"] = self.csrf_token()
+
+        start = time.perf_counter()
+        try:
+            with self.opener.open(
+                urllib.request.Request(url, data=body, headers=headers),
+                timeout=self.timeout,
+            ) as response:
+                status, content = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, content = e.code, e.read()
+        except OSError:
+            self.results.record(endpoint, time.perf_counter() - start, False)
+            return None
+
+        self.results.record(endpoint, time.perf_counter() - start, ok(status))
+        return Response(status, content.decode(errors="replace"))
+
+    def log_in(self, login_url: str, username: str, password: str) -> bool:
+        self.request("login form", login_url)
+        # a successful login redirects; a failed one shows the form again
+        response = self.request(
+            "login",
+            login_url,
+            {"username": username, "password": password},
+            ok=lambda status: status == 302,
+        )
+        return response is not None and response.status == 302
+
+
+def nominating_ballot_data(
+    categories: tuple[CategoryPlan, ...], participation: float
+) -> dict[str, str]:
+    """A filled-in nominating ballot, with the nominations the seed commands make."""
+    variations = VariationGenerator()
+    data: dict[str, str] = {}
+    for category in categories:
+        if not category.works or random.random() > participation:
+            continue
+
+        works = WorkSelector(list(category.works)).select_works_for_member(
+            random.randint(1, 5)
+        )
+        for entry, work_data in enumerate(works):
+            work = variations.select_variation(work_data)
+            values = [work.get(f"field_{n + 1}", "") for n in range(category.fields)]
+            if not all(v for v, required in zip(values, category.required) if required):
+                continue
+            for n, value in enumerate(values):
+                data[f"{category.id}-{entry}-field_{n + 1}"] = value
+    return data
+
+
+def voting_ballot_data(
+    finalists: dict[int, tuple[int, ...]], participation: float
+) -> dict[str, str]:
+    """A ranked voting ballot, ranking some of the finalists in some categories."""
+    data: dict[str, str] = {}
+    for category_id, finalist_ids in finalists.items():
+        if random.random() > participation:
+            continue
+        ranked = random.sample(finalist_ids, k=random.randint(1, len(finalist_ids)))
+        for position, finalist_id in enumerate(ranked, start=1):
+            data[f"{category_id}_{finalist_id}"] = str(position)
+    return data
+
+
+def submission_key(page: Response | None) -> dict[str, str]:
+    match = page and SUBMISSION_KEY_RE.search(page.body)
+    return {"submission_key": match.group(1)} if match else {}
+
+
+def save_ballot(
+    session: MemberSession, plan: LoadTestPlan, endpoint: str, path: str, data: dict
+) -> None:
+    session.request(endpoint, path, data)
+    if random.random() < plan.double_submit_rate:
+        session.request(f"{endpoint} (repeated)", path, data)
+
+
+def nominate(session: MemberSession, plan: LoadTestPlan) -> None:
+    assert plan.nominate_url is not None
+    page = session.request("nominate: ballot", plan.nominate_url)
+    data = nominating_ballot_data(
+        plan.nominating_categories, plan.category_participation
+    )
+    data.update(submission_key(page), save_all="")
+    save_ballot(session, plan, "nominate: save", plan.nominate_url, data)
+
+
+def vote(session: MemberSession, plan: LoadTestPlan) -> None:
+    assert plan.vote_url is not None
+    page = session.request("vote: ballot", plan.vote_url)
+    data = voting_ballot_data(plan.finalists, plan.category_participation)
+    data.update(submission_key(page))
+    save_ballot(session, plan, "vote: save", plan.vote_url, data)
+
+
+def packet(session: MemberSession, plan: LoadTestPlan) -> None:
+    assert plan.packet_url is not None
+    session.request("packet: index", plan.packet_url)
+    if plan.packet_file_urls:
+        session.request("packet: download", random.choice(plan.packet_file_urls))
+
+
+SCENARIO_RUNNERS: dict[str, Callable[[MemberSession, LoadTestPlan], None]] = {
+    "nominate": nominate,
+    "vote": vote,
+    "packet": packet,
+}
+
+
+def run_load_test(
+    plan: LoadTestPlan,
+    base_url: str,
+    concurrency: int,
+    duration: float,
+    on_progress: Callable[[LoadTestResults], None] | None = None,
+) -> LoadTestResults:
+    """Run *plan* against the server at *base_url* for *duration* seconds.
+
+    Each of *concurrency* workers logs in its share of the plan's members and, until
+    the time is up, has them run scenarios picked by weight, one after another.
+    """
+    results = LoadTestResults()
+    scenarios = list(plan.scenarios)
+    weights = [plan.scenarios[s] for s in scenarios]
+    deadline = time.monotonic() + duration
+
+    def worker(index: int) -> None:
+        members = plan.members[index::concurrency]
+        sessions = []
+        for username, password in members:
+            session = MemberSession(base_url, results)
+            if session.log_in(plan.login_url, username, password):
+                sessions.append(session)
+        while sessions and time.monotonic() < deadline:
+            session = random.choice(sessions)
+            scenario = random.choices(scenarios, weights)[0]
+            SCENARIO_RUNNERS[scenario](session, plan)
+            if plan.think_time:
+                time.sleep(random.expovariate(1 / plan.think_time))
+
+    start = time.monotonic()
+    workers = min(concurrency, len(plan.members))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(worker, i) for i in range(workers)]
+        while on_progress and not all(f.done() for f in futures):
+            time.sleep(1)
+            on_progress(results)
+        for future in futures:
+            future.result()
+    results.elapsed = time.monotonic() - start
+
+    return results
@@ -0,0 +1,181 @@
+"""Management command to benchmark the EPH and final ballot counts.
+
+Runs the benchmarks in `nomnom.convention_admin.benchmarks` over synthetic ballots, and
+reports the time and peak memory of each implementation, and whether it agreed with the
+reference implementation. The database isn't touched.
+
+Usage:
+    python manage.py benchmark_counts [--nominators N ...] [--works N ...]
+        [--benchmark NAME ...] [--repeat N] [--seed N] [--json FILE] [--compare FILE]
+
+Example, saving a baseline and checking a later run against it:
+    python manage.py benchmark_counts --json baseline.json
+    python manage.py benchmark_counts --compare baseline.json
+"""
+
+import json
+import platform
+from datetime import UTC, datetime
+
+import djclick as click
+from rich.console import Console
+from rich.table import Table
+
+from nomnom.convention_admin.benchmarks import (
+    BENCHMARKS,
+    NOMINATOR_COUNTS,
+    WORK_COUNTS,
+    BenchmarkResult,
+    compare_results,
+    results_to_json,
+    run_benchmarks,
+)
+
+
+def results_table(results: list[BenchmarkResult]) -> Table:
+    table = Table(title="Benchmark results")
+    table.add_column("Benchmark")
+    table.add_column("Implementation")
+    for column in ["Nominators", "Works", "Best", "Peak memory", "Matches"]:
+        table.add_column(column, justify="right")
+
+    for result in results:
+        table.add_row(
+            result.benchmark,
+            result.implementation,
+            f"{result.nominators:,}",
+            f"{result.works:,}",
+            f"{result.seconds * 1000:.1f}ms",
+            f"{result.peak_memory_bytes / 2**20:.1f}MiB",
+            {None: "reference", True: "✓", False: "[red]✗[/red]"}[
+                result.matches_reference
+            ],
+        )
+    return table
+
+
+@click.command()
+@click.option(
+    "--nominators",
+    multiple=True,
+    type=int,
+    help="Number of nominators; can be given more than once (default: 1k, 10k, 50k)",
+)
+@click.option(
+    "--works",
+    multiple=True,
+    type=int,
+    help="Number of distinct works; can be given more than once (default: 5, 50, 5000)",
+)
+@click.option(
+    "--benchmark",
+    "benchmarks",
+    multiple=True,
+    type=click.Choice(BENCHMARKS),
+    help="Benchmark to run; can be given more than once (default: all of them)",
+)
+@click.option(
+    "--repeat", default=3, type=int, help="Timed runs of each benchmark (default: 3)"
+)
+@click.option("--seed", default=0, type=int, help="Random seed for the ballots")
+@click.option(
+    "--uncanonicalized",
+    is_flag=True,
+    help="Count the works as the nominators wrote them, before canonicalization",
+)
+@click.option("--json", "json_path", help="Write the results as JSON to this file")
+@click.option(
+    "--compare",
+    "compare_path",
+    help="Compare the times with the results in this JSON file",
+)
+@click.option(
+    "--tolerance",
+    default=0.25,
+    type=float,
+    help="How much slower than --compare counts as a regression (default: 0.25)",
+)
+def main(
+    nominators: tuple[int, ...],
+    works: tuple[int, ...],
+    benchmarks: tuple[str, ...],
+    repeat: int,
+    seed: int,
+    uncanonicalized: bool,
+    json_path: str | None,
+    compare_path: str | None,
+    tolerance: float,
+):
+    """Benchmark EPH, the final ballot count, and the EPH reports.
+
+    Example:
+        python manage.py benchmark_counts --nominators 1000 --works 50
+        python manage.py benchmark_counts --benchmark eph --json eph.json
+    """
+    console = Console()
+
+    baseline = None
+    if compare_path:
+        with open(compare_path) as f:
+            baseline = json.load(f)
+
+    with console.status("Benchmarking...") as status:
+        results = run_benchmarks(
+            nominator_counts=nominators or NOMINATOR_COUNTS,
+            work_counts=works or WORK_COUNTS,
+            benchmarks=benchmarks or BENCHMARKS,
+            repeat=repeat,
+            seed=seed,
+            canonicalized=not uncanonicalized,
+            on_result=lambda r: status.update(
+                f"Benchmarking... {r.benchmark} with {r.nominators:,} nominators "
+                f"and {r.works:,} works"
+            ),
+        )
+
+    console.print(results_table(results))
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(
+                results_to_json(
+                    results,
+                    created=datetime.now(UTC).isoformat(),
+                    python=platform.python_version(),
+                    platform=platform.platform(),
+                    seed=seed,
+                    repeat=repeat,
+                    canonicalized=not uncanonicalized,
+                ),
+                f,
+                indent=2,
+            )
+        console.print(f"[green]   ✓ Wrote results to {json_path}[/green]")
+
+    problems = []
+
+    mismatches = [r for r in results if r.matches_reference is False]
+    for result in mismatches:
+        console.print(
+            f"[red]❌ {result.benchmark} ({result.implementation}) disagreed with the "
+            f"reference for {result.nominators:,} nominators and {result.works:,} "
+            "works[/red]"
+        )
+    if mismatches:
+        problems.append(f"{len(mismatches)} disagreed with the reference")
+
+    if baseline is not None:
+        regressions = compare_results(baseline, results, tolerance)
+        for result, ratio in regressions:
+            console.print(
+                f"[red]❌ {result.benchmark} ({result.implementation}) is {ratio:.2f}× "
+                f"slower for {result.nominators:,} nominators and {result.works:,} "
+                "works[/red]"
+            )
+        if regressions:
+            problems.append(f"{len(regressions)} slower than {compare_path}")
+        else:
+            console.print(f"[green]   ✓ No regressions against {compare_path}[/green]")
+
+    if problems:
+        raise click.ClickException("; ".join(problems))
@@ -0,0 +1,359 @@
+"""Management command to rehearse the nomination and voting close surges.
+
+Logs in synthetic members and replays nominate, vote and packet traffic against a
+running NomNom, then reports latency percentiles and error rates per endpoint. The
+members, categories, finalists and packet files come from the database, as created by
+the seed commands; the server is driven over HTTP, through its real URLs.
+
+Usage:
+    python manage.py load_test <election_slug> [--base-url URL] [--members N]
+        [--concurrency N] [--duration SECONDS] [--scenario NAME ...] [--prepare]
+
+Example, against the local docker-compose stack and `just serve`:
+    python manage.py load_test yugo-awards --prepare --members 200 --concurrency 50
+
+Only the members the seed commands created are used. --prepare resets their passwords,
+so it only runs with DEBUG on, or with --i-know-this-is-not-production.
+"""
+
+import json
+import os
+import random
+from dataclasses import replace
+
+import djclick as click
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.models import QuerySet
+from django.urls import reverse
+from rich.console import Console
+from rich.table import Table
+
+from nomnom.convention_admin.load_test import (
+    SCENARIOS,
+    CategoryPlan,
+    LoadTestPlan,
+    LoadTestResults,
+    run_load_test,
+)
+from nomnom.convention_admin.management.commands._seed_base import suppress_sql_logging
+from nomnom.convention_admin.seed_data.sample_works import get_samples_for_category_name
+from nomnom.hugopacket.models import ElectionPacket, PacketFile
+from nomnom.nominate.models import Election, Finalist, NominatingMemberProfile
+
+UserModel = get_user_model()
+
+# The password seed_nominations gives the members it creates
+SEEDED_PASSWORD = "password123"
+
+# The groups that grant nominating and voting rights, from seed/all/0001_groups.json
+MEMBER_GROUPS = ["Nominator", "Voter"]
+
+# The usernames seed_nominations and seed_ranks give the members they create, all of
+# them with an address at example.com
+SEEDED_USERNAME_RE = r"^(member\d{4}|voter_.+_\d{4})$"
+SEEDED_EMAIL_DOMAIN = "@example.com"
+
+
+def default_scenarios(election: Election) -> tuple[str, ...]:
+    """The traffic that surges at the close of the election's current phase."""
+    if election.state in (
+        Election.STATE.NOMINATION_PREVIEW,
+        Election.STATE.NOMINATIONS_OPEN,
+    ):
+        return ("nominate",)
+    if election.state in (Election.STATE.VOTING_PREVIEW, Election.STATE.VOTING):
+        return ("vote", "packet")
+    return ()
+
+
+def seeded_members() -> QuerySet[NominatingMemberProfile]:
+    """The members the seed commands created, by their usernames and addresses."""
+    return NominatingMemberProfile.objects.filter(
+        user__username__regex=SEEDED_USERNAME_RE,
+        user__email__endswith=SEEDED_EMAIL_DOMAIN,
+    )
+
+
+def prepare_members(members: list[NominatingMemberProfile], password: str) -> None:
+    """Give *members* the password and the rights the load test logs in with.
+
+    The password is hashed once and shared, rather than hashed for every member.
+    """
+    groups = list(Group.objects.filter(name__in=MEMBER_GROUPS))
+    user_ids = [member.user_id for member in members]
+    with transaction.atomic():
+        UserModel.objects.filter(pk__in=user_ids).update(
+            password=make_password(password)
+        )
+        UserModel.groups.through.objects.bulk_create(
+            [
+                UserModel.groups.through(user_id=user_id, group_id=group.pk)
+                for user_id in user_ids
+                for group in groups
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def build_plan(
+    election: Election,
+    members: list[NominatingMemberProfile],
+    password: str,
+    scenarios: tuple[str, ...],
+    double_submit_rate: float,
+    think_time: float,
+) -> LoadTestPlan:
+    slug = {"election_id": election.slug}
+    categories = list(election.category_set.all())
+
+    finalists: dict[int, list[int]] = {}
+    for category_id, finalist_id in Finalist.objects.filter(
+        category__election=election
+    ).values_list("category_id", "id"):
+        finalists.setdefault(category_id, []).append(finalist_id)
+
+    packet = ElectionPacket.objects.filter(election=election).first()
+    packet_file_urls = []
+    if packet is not None:
+        packet_file_urls = [
+            reverse(
+                "hugopacket:download_packet",
+                kwargs={**slug, "packet_file_id": packet_file_id},
+            )
+            for packet_file_id in PacketFile.objects.filter(
+                packet=packet, available=True
+            ).values_list("id", flat=True)
+        ]
+
+    return LoadTestPlan(
+        login_url=reverse("login"),
+        members=tuple((m.user.username, password) for m in members),
+        scenarios={scenario: 1.0 for scenario in scenarios},
+        nominate_url=reverse("election:nominate", kwargs=slug),
+        nominating_categories=tuple(
+            CategoryPlan(
+                id=category.id,
+                fields=category.fields,
+                required=tuple(
+                    category.field_required(n + 1) for n in range(category.fields)
+                ),
+                works=tuple(get_samples_for_category_name(category.name)),
+            )
+            for category in categories
+        ),
+        vote_url=reverse("election:vote", kwargs=slug),
+        finalists={c: tuple(ids) for c, ids in finalists.items()},
+        packet_url=(
+            reverse("hugopacket:election_packet", kwargs=slug) if packet else None
+        ),
+        packet_file_urls=tuple(packet_file_urls),
+        double_submit_rate=double_submit_rate,
+        think_time=think_time,
+    )
+
+
+def results_table(results: LoadTestResults) -> Table:
+    table = Table(title=f"Load test results ({results.elapsed:.0f}s)")
+    table.add_column("Endpoint")
+    for column in ["Requests", "Errors", "Error rate", "p50", "p95", "p99", "Max"]:
+        table.add_column(column, justify="right")
+
+    for endpoint, summary in results.summary().items():
+        table.add_row(
+            endpoint,
+            str(summary["requests"]),
+            str(summary["errors"]),
+            f"{summary['error_rate']:.1%}",
+            *(
+                f"{summary[key]:.0f}ms"
+                for key in ["p50_ms", "p95_ms", "p99_ms", "max_ms"]
+            ),
+        )
+    return table
+
+
+@click.command()
+@click.argument("election_slug")
+@click.option(
+    "--base-url",
+    default=f"http://localhost:{os.environ.get('DEV_SERVER_PORT', '8000')}",
+    help="The running server to load (default: the `just serve` address)",
+)
+@click.option(
+    "--members",
+    default=100,
+    type=int,
+    help="Number of members to log in (default: 100)",
+)
+@click.option(
+    "--concurrency",
+    default=20,
+    type=int,
+    help="Number of members making requests at once (default: 20)",
+)
+@click.option(
+    "--duration", default=60.0, type=float, help="Seconds to run for (default: 60)"
+)
+@click.option(
+    "--scenario",
+    "scenarios",
+    multiple=True,
+    type=click.Choice(SCENARIOS),
+    help="Traffic to replay; can be given more than once. Defaults to the traffic for "
+    "the election's state.",
+)
+@click.option(
+    "--password",
+    default=SEEDED_PASSWORD,
+    help="The members' password (default: the one seed_nominations uses)",
+)
+@click.option(
+    "--prepare",
+    is_flag=True,
+    help="Set the members' password and add them to the Nominator and Voter groups first",
+)
+@click.option(
+    "--i-know-this-is-not-production",
+    "not_production",
+    is_flag=True,
+    help="Allow --prepare without DEBUG on",
+)
+@click.option(
+    "--double-submit-rate",
+    default=0.05,
+    type=float,
+    help="Fraction of ballot saves that are sent twice, like a double-click",
+)
+@click.option(
+    "--think-time",
+    default=0.0,
+    type=float,
+    help="Mean seconds each member waits between scenarios (default: none)",
+)
+@click.option("--seed", type=int, help="Random seed, for a repeatable run")
+@click.option("--json", "json_path", help="Also write the results as JSON to this file")
+def main(
+    election_slug: str,
+    base_url: str,
+    members: int,
+    concurrency: int,
+    duration: float,
+    scenarios: tuple[str, ...],
+    password: str,
+    prepare: bool,
+    not_production: bool,
+    double_submit_rate: float,
+    think_time: float,
+    seed: int | None,
+    json_path: str | None,
+):
+    """Replay nominate, vote and packet traffic against a running server.
+
+    Example:
+        python manage.py load_test yugo-awards --prepare
+        python manage.py load_test yugo-awards --scenario vote --concurrency 100
+    """
+    console = Console()
+
+    if not settings.NOMNOM_ALLOW_USERNAME_LOGIN_FOR_MEMBERS:
+        console.print(
+            "[red]❌ Members log in by username; set NOMNOM_ALLOW_USERNAME_LOGIN_FOR_MEMBERS[/red]"
+        )
+        return
+
+    if prepare and not (settings.DEBUG or not_production):
+        console.print(
+            "[red]❌ --prepare resets members' passwords; it only runs with DEBUG on, "
+            "or with --i-know-this-is-not-production[/red]"
+        )
+        return
+
+    if seed is not None:
+        random.seed(seed)
+
+    with suppress_sql_logging():
+        try:
+            election = Election.objects.get(slug=election_slug)
+        except Election.DoesNotExist:
+            console.print(f"[red]❌ Election '{election_slug}' not found[/red]")
+            return
+
+        scenarios = scenarios or default_scenarios(election)
+        if not scenarios:
+            console.print(
+                f"[red]❌ Nothing to replay while {election.name} is {election.state}; "
+                "pass --scenario[/red]"
+            )
+            return
+
+        member_profiles = list(
+            seeded_members().select_related("user").order_by("id")[:members]
+        )
+        if not member_profiles:
+            console.print("[red]❌ No members found. Run seed_nominations first![/red]")
+            return
+
+        if prepare:
+            prepare_members(member_profiles, password)
+            console.print(
+                f"[green]   ✓ Prepared {len(member_profiles)} members to log in[/green]"
+            )
+
+        plan = build_plan(
+            election,
+            member_profiles,
+            password,
+            scenarios,
+            double_submit_rate,
+            think_time,
+        )
+
+    if "packet" in scenarios and plan.packet_url is None:
+        console.print(
+            "[yellow]⚠️  The election has no packet; run seed_packet first[/yellow]"
+        )
+        plan = replace(
+            plan, scenarios={s: w for s, w in plan.scenarios.items() if s != "packet"}
+        )
+        if not plan.scenarios:
+            return
+
+    console.print(
+        f"[cyan bold]🔥 Loading {base_url} for {duration:.0f}s: "
+        f"{', '.join(plan.scenarios)} with {len(plan.members)} members, "
+        f"{concurrency} at a time[/cyan bold]"
+    )
+
+    with console.status("Running...") as status:
+        results = run_load_test(
+            plan,
+            base_url,
+            concurrency,
+            duration,
+            on_progress=lambda r: status.update(
+                f"Running... {sum(s.requests for s in r.endpoints.values())} requests"
+            ),
+        )
+
+    console.print(results_table(results))
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(
+                {
+                    "base_url": base_url,
+                    "election": election.slug,
+                    "scenarios": list(plan.scenarios),
+                    "members": len(plan.members),
+                    "concurrency": concurrency,
+                    "elapsed": results.elapsed,
+                    "endpoints": results.summary(),
+                },
+                f,
+                indent=2,
+            )
+        console.print(f"[green]   ✓ Wrote results to {json_path}[/green]")
@@ -26,6 +26,7 @@ from rich.progress import (
 
 from nomnom.convention_admin.management.commands._seed_base import suppress_sql_logging
 from nomnom.convention_admin.utils import select_random_ip
+from nomnom.nominate import tallies
 from nomnom.nominate.models import (
     Category,
     Election,
@@ -234,7 +235,10 @@ def main(
             return
 
         if clear:
-            with transaction.atomic():
+            with (
+                transaction.atomic(),
+                tallies.updating_tallies(categories.values_list("pk", flat=True)),
+            ):
                 deleted = Rank.objects.filter(
                     finalist__category__election=election
                 ).delete()[0]
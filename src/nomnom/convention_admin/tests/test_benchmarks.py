@@ -0,0 +1,67 @@
+"""
+Tests for the count benchmarks.
+"""
+
+import json
+from dataclasses import replace
+
+from nomnom.convention_admin.benchmarks import (
+    BENCHMARKS,
+    compare_results,
+    nominating_ballots,
+    results_to_json,
+    run_benchmarks,
+    seeded,
+    synthetic_works,
+)
+
+
+def test_synthetic_works_have_distinct_titles():
+    for count in [5, 50, 5000]:
+        works = synthetic_works(count)
+        assert len({w["canonical"]["field_1"] for w in works}) == count
+
+
+def test_ballots_are_repeatable():
+    works = synthetic_works(50)
+
+    with seeded(1):
+        first = nominating_ballots(100, works)
+    with seeded(1):
+        second = nominating_ballots(100, works)
+
+    assert first == second
+    assert all(1 <= ballot.total() <= 5 for ballot in first)
+
+
+def test_uncanonicalized_ballots_name_variations():
+    works = synthetic_works(5)
+    names = {w["canonical"]["field_1"] for w in works}
+
+    with seeded(1):
+        ballots = nominating_ballots(200, works, canonicalized=False)
+
+    assert {name for ballot in ballots for name in ballot} - names
+
+
+def test_benchmarks_match_the_reference():
+    results = run_benchmarks(nominator_counts=(200,), work_counts=(5, 50), repeat=1)
+
+    assert {r.benchmark for r in results} == set(BENCHMARKS)
+    assert all(r.matches_reference is not False for r in results)
+    assert all(r.seconds >= 0 and r.peak_memory_bytes > 0 for r in results)
+
+    saved = json.loads(json.dumps(results_to_json(results, seed=0)))
+    assert len(saved["results"]) == len(results)
+
+
+def test_compare_results_finds_regressions():
+    results = run_benchmarks(
+        nominator_counts=(50,), work_counts=(5,), benchmarks=("eph",), repeat=1
+    )
+    baseline = results_to_json(results)
+
+    slower = [replace(r, seconds=r.seconds * 2 + 1) for r in results]
+
+    assert compare_results(baseline, results) == []
+    assert [r for r, _ in compare_results(baseline, slower)] == slower
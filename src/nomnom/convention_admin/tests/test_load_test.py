@@ -0,0 +1,188 @@
+"""
+Tests for the load-test harness.
+"""
+
+import pytest
+from django.contrib.auth.models import Group, Permission
+from django.core.management import call_command
+from django.urls import reverse
+
+from nomnom.convention_admin.load_test import (
+    CategoryPlan,
+    EndpointStats,
+    LoadTestPlan,
+    nominating_ballot_data,
+    percentile,
+    run_load_test,
+    voting_ballot_data,
+)
+from nomnom.convention_admin.management.commands.load_test import (
+    MEMBER_GROUPS,
+    prepare_members,
+    seeded_members,
+)
+from nomnom.convention_admin.management.commands.seed_nominations import create_member
+from nomnom.nominate import factories, models
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile(values, 100) == 100
+
+    def test_small_samples_use_the_largest_value(self):
+        assert percentile([0.1, 0.2, 0.3], 99) == 0.3
+
+    def test_empty(self):
+        assert percentile([], 50) == 0.0
+
+
+def test_endpoint_summary():
+    stats = EndpointStats(latencies=[0.01, 0.02, 0.03, 0.04], errors=1)
+
+    summary = stats.summary()
+
+    assert summary["requests"] == 4
+    assert summary["error_rate"] == 0.25
+    assert summary["p50_ms"] == pytest.approx(20)
+    assert summary["max_ms"] == pytest.approx(40)
+
+
+def test_nominating_ballot_data_skips_incomplete_works():
+    works = (
+        {"canonical": {"field_1": "A Novel", "field_2": "An Author"}},
+        {"canonical": {"field_1": "A Title Alone"}},
+    )
+    category = CategoryPlan(id=7, fields=2, required=(True, True), works=works)
+
+    for _ in range(20):
+        data = nominating_ballot_data((category,), participation=1.0)
+        assert all(key.startswith("7-") for key in data)
+        assert set(data.values()) <= {"A Novel", "An Author"}
+
+
+def test_nominating_ballot_data_keys():
+    works = ({"canonical": {"field_1": "A Novel", "field_2": "An Author"}},)
+    category = CategoryPlan(id=7, fields=2, required=(True, False), works=works)
+
+    data = nominating_ballot_data((category,), participation=1.0)
+
+    assert data["7-0-field_1"] == "A Novel"
+    assert data["7-0-field_2"] == "An Author"
+
+
+def test_voting_ballot_data_ranks_each_finalist_once():
+    data = voting_ballot_data({3: (10, 11, 12)}, participation=1.0)
+
+    assert set(data) <= {"3_10", "3_11", "3_12"}
+    assert sorted(int(p) for p in data.values()) == list(range(1, len(data) + 1))
+
+
+@pytest.fixture(name="member")
+def make_member():
+    member = factories.NominatingMemberProfileFactory.create()
+    member.user.set_password("load-test")
+    member.user.save()
+    member.user.user_permissions.add(
+        *Permission.objects.filter(
+            codename__in=["nominate", "vote"], content_type__app_label="nominate"
+        )
+    )
+    return member
+
+
+def plan_for(election, member, scenario, **kwargs) -> LoadTestPlan:
+    slug = {"election_id": election.slug}
+    return LoadTestPlan(
+        login_url=reverse("login"),
+        members=((member.user.username, "load-test"),),
+        scenarios={scenario: 1.0},
+        nominate_url=reverse("election:nominate", kwargs=slug),
+        vote_url=reverse("election:vote", kwargs=slug),
+        category_participation=1.0,
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_nominate_scenario_saves_ballots(live_server, member):
+    election = factories.ElectionFactory.create(state="nominating")
+    category = factories.CategoryFactory.create(election=election, fields=1)
+    works = ({"canonical": {"field_1": "A Novel"}},)
+    plan = plan_for(
+        election,
+        member,
+        "nominate",
+        nominating_categories=(
+            CategoryPlan(id=category.id, fields=1, required=(True,), works=works),
+        ),
+    )
+
+    results = run_load_test(plan, live_server.url, concurrency=1, duration=0.5)
+
+    summary = results.summary()
+    assert summary["login"]["errors"] == 0
+    assert summary["nominate: save"]["requests"] > 0
+    assert summary["nominate: save"]["errors"] == 0
+    assert models.Nomination.objects.filter(nominator=member).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_vote_scenario_casts_ballots(live_server, member):
+    election = factories.ElectionFactory.create(state="voting")
+    category = factories.CategoryFactory.create(election=election)
+    finalists = factories.FinalistFactory.create_batch(3, category=category)
+    plan = plan_for(
+        election,
+        member,
+        "vote",
+        finalists={category.id: tuple(f.id for f in finalists)},
+    )
+
+    results = run_load_test(plan, live_server.url, concurrency=1, duration=0.5)
+
+    summary = results.summary()
+    assert summary["vote: save"]["requests"] > 0
+    assert summary["vote: save"]["errors"] == 0
+    assert models.Rank.objects.filter(membership=member).exists()
+
+
+@pytest.mark.django_db
+def test_only_seeded_members_are_load_tested():
+    seeded = create_member(1)
+    factories.NominatingMemberProfileFactory.create()
+
+    assert list(seeded_members()) == [seeded]
+
+
+@pytest.mark.django_db
+def test_prepared_members_share_one_password_hash():
+    for name in MEMBER_GROUPS:
+        Group.objects.create(name=name)
+    members = [create_member(i) for i in range(3)]
+
+    prepare_members(members, "load-test")
+
+    users = [member.user for member in members]
+    for user in users:
+        user.refresh_from_db()
+        assert user.check_password("load-test")
+        assert sorted(user.groups.values_list("name", flat=True)) == MEMBER_GROUPS
+    assert len({user.password for user in users}) == 1
+
+
+@pytest.mark.django_db
+def test_prepare_is_refused_outside_debug(settings):
+    settings.DEBUG = False
+    settings.NOMNOM_ALLOW_USERNAME_LOGIN_FOR_MEMBERS = True
+    election = factories.ElectionFactory.create(state="nominating")
+    member = create_member(1)
+    password = member.user.password
+
+    call_command("load_test", election.slug, "--prepare", "--duration", "0")
+
+    member.user.refresh_from_db()
+    assert member.user.password == password
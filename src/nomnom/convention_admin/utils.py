@@ -3,6 +3,7 @@ Utility functions for seeding Hugo Awards data.
 """
 
 import random
+from itertools import accumulate
 
 
 class WorkSelector:
@@ -32,6 +33,16 @@ class WorkSelector:
             w for w in works if w.get("popularity_weight", 0) < popular_threshold
         ]
 
+        # Cumulative weights for each pool, so that a selection is a binary search
+        # rather than a pass over every work
+        self._popular_cum_weights = self._cum_weights(self.popular_works)
+        self._other_pool = self.other_works if self.other_works else self.works
+        self._other_cum_weights = self._cum_weights(self._other_pool)
+
+    @staticmethod
+    def _cum_weights(works: list[dict]) -> list[int]:
+        return list(accumulate(w.get("popularity_weight", 1) for w in works))
+
     def select_work(self, use_popular: bool = True) -> dict:
         """
         Select a work based on popularity weights.
@@ -44,14 +55,15 @@ class WorkSelector:
         """
         if use_popular and self.popular_works:
             # Weighted selection from popular works
-            weights = [w.get("popularity_weight", 1) for w in self.popular_works]
-            return random.choices(self.popular_works, weights=weights, k=1)[0]
+            return random.choices(
+                self.popular_works, cum_weights=self._popular_cum_weights, k=1
+            )[0]
         else:
             # Select from other works or all works
-            pool = self.other_works if self.other_works else self.works
-            if pool:
-                weights = [w.get("popularity_weight", 1) for w in pool]
-                return random.choices(pool, weights=weights, k=1)[0]
+            if self._other_pool:
+                return random.choices(
+                    self._other_pool, cum_weights=self._other_cum_weights, k=1
+                )[0]
             return random.choice(self.works)
 
     def select_works_for_member(self, count: int = 5) -> list[dict]:
@@ -25,7 +25,7 @@ from django_admin_action_forms.forms import ActionForm
 
 from nomnom.nominate.decorators import user_passes_test_or_forbidden
 
-from . import models
+from . import changes, models, tallies
 
 UserModel = get_user_model()
 
@@ -66,6 +66,12 @@ def set_validation(queryset: QuerySet, valid: bool) -> None:
         ]
     )
 
+    # neither write sends signals, so note the change to the categories' nominations
+    changes.note_changes(
+        models.CategoryChange.Kind.NOMINATIONS,
+        queryset.values_list("category_id", flat=True).distinct(),
+    )
+
 
 class NominatingMemberFilter(AutocompleteFilter):
     title = "Member"
@@ -280,7 +286,8 @@ def delete_category_with_related(modeladmin, request, queryset, data):
     category_id = category.id
 
     # Delete the category (this will cascade to finalists, but we need to handle others)
-    with transaction.atomic():
+    # Its ranking tallies go with it, so there's nothing to rebuild afterwards.
+    with transaction.atomic(), tallies.updating_tallies([]):
         # Delete ranks first
         deleted_ranks = models.Rank.objects.filter(
             finalist__category=category
@@ -408,7 +415,7 @@ def reset_ranks(modeladmin, request, queryset, data):
         return
 
     # Delete ranks
-    with transaction.atomic():
+    with transaction.atomic(), tallies.updating_tallies([c.pk for c in queryset]):
         # deletion here also deletes the related rank admin objects, which means we
         # will report 2x the number of records. So, we query it to get the count right.
         rank_queryset = models.Rank.objects.filter(finalist__category__in=queryset)
@@ -672,20 +679,26 @@ def validate_ranking(
 
 
 def set_rank_valid(queryset: QuerySet, validation: bool) -> None:
-    models.RankAdminData.objects.filter(rank__in=queryset).update(
-        invalidated=not validation
-    )
+    affected = set(queryset.values_list("membership_id", "finalist__category_id"))
+
+    with tallies.updating_tallies(
+        {category_id for _, category_id in affected},
+        {member_id for member_id, _ in affected},
+    ):
+        models.RankAdminData.objects.filter(rank__in=queryset).update(
+            invalidated=not validation
+        )
 
-    # find the ones that don't already have info
-    without_admin = queryset.exclude(admin__isnull=False)
+        # find the ones that don't already have info
+        without_admin = queryset.exclude(admin__isnull=False)
 
-    # create the missing ones
-    models.RankAdminData.objects.bulk_create(
-        [
-            models.RankAdminData(rank=rank, invalidated=not validation)
-            for rank in without_admin
-        ]
-    )
+        # create the missing ones
+        models.RankAdminData.objects.bulk_create(
+            [
+                models.RankAdminData(rank=rank, invalidated=not validation)
+                for rank in without_admin
+            ]
+        )
 
 
 class RankAdmin(admin.ModelAdmin):
@@ -0,0 +1,63 @@
+"""Changes to what each category's results are counted from.
+
+Results that take a while to count (the finalists, the winners) are stored along with
+the id of the latest `CategoryChange` they were counted through. Telling whether a
+stored result is current is then one index lookup per category, however many
+nominations or ranks there are.
+"""
+
+from collections.abc import Iterable
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from nomnom.nominate import models
+
+
+def note_changes(kind: str, category_ids: Iterable[int]) -> None:
+    """Note a change of *kind* to each of *category_ids*, once the current transaction
+    commits.
+
+    Changes are numbered after the writes they are for can be seen, so a result read
+    after its category's latest change has seen every write noted up to that change,
+    whatever order concurrent transactions commit in.
+    """
+    category_ids = set(category_ids)
+    if not category_ids:
+        return
+
+    def note():
+        # a category may have been deleted in the transaction that changed it
+        models.CategoryChange.objects.bulk_create(
+            models.CategoryChange(category_id=category_id, kind=kind)
+            for category_id in models.Category.objects.filter(
+                pk__in=category_ids
+            ).values_list("id", flat=True)
+        )
+
+    transaction.on_commit(note)
+
+
+def latest_changes(kind: str, category_ids: Iterable[int]) -> dict[int, int]:
+    """The id of the latest change of *kind* to each of *category_ids*, for those that
+    have changed."""
+    latest = models.CategoryChange.objects.filter(
+        category=OuterRef("pk"), kind=kind
+    ).order_by("-id")
+    return {
+        category_id: change_id
+        for category_id, change_id in models.Category.objects.filter(
+            pk__in=list(category_ids)
+        )
+        .annotate(latest=Subquery(latest.values("id")[:1]))
+        .values_list("id", "latest")
+        if change_id is not None
+    }
+
+
+def forget_changes(kind: str, category_id: int, before: int) -> None:
+    """Drop the changes of *kind* to a category older than *before*, which a result has
+    been counted through; the latest change is always kept."""
+    models.CategoryChange.objects.filter(
+        category_id=category_id, kind=kind, id__lt=before
+    ).delete()
@@ -1,5 +1,6 @@
 from collections.abc import Iterable
 from dataclasses import dataclass
+from functools import lru_cache
 from itertools import groupby
 from operator import attrgetter
 from typing import Any, cast
@@ -8,7 +9,6 @@ from django import forms
 from django.db import models
 from django.utils.translation import gettext as _
 from django_svcs.apps import svcs_from
-from markdownify.templatetags.markdownify import markdownify
 
 from nomnom.convention import HugoAwards
 
@@ -21,6 +21,96 @@ class RankedFinalist:
     finalist: Finalist
 
 
+type CategoryLayout = tuple[int, int, str, str | None, str | None, bool, bool]
+
+NOMINATION_FIELD_IDS = ["field_1", "field_2", "field_3"]
+
+
+@dataclass(frozen=True)
+class NominationFieldSpec:
+    """What a nominating ballot's form field is built from."""
+
+    # the Nomination field it fills in
+    field_id: str
+    label: str | None
+
+    def formfield(self) -> forms.Field:
+        model_field = Nomination._meta.get_field(self.field_id)
+        return model_field.formfield(label=self.label, required=False)
+
+
+@dataclass(frozen=True)
+class NominationFormSchema:
+    """The fields of a nominating ballot, compiled from its categories.
+
+    The schema is shared by every form built from it, so it holds the specs of the
+    fields rather than the fields themselves; each form builds its own from them.
+    """
+
+    fields: dict[str, NominationFieldSpec]
+    # the form field IDs of each nomination in each category, by category ID
+    fieldsets: dict[int, list[list[str]]]
+    # whether each of a category's fields must be filled in, by category ID
+    required: dict[int, list[bool]]
+
+
+def category_layout(category: Category) -> CategoryLayout:
+    return (
+        category.pk,
+        category.fields,
+        category.field_1_description,
+        category.field_2_description,
+        category.field_3_description,
+        category.field_2_required,
+        category.field_3_required,
+    )
+
+
+def nomination_form_schema(
+    categories: Iterable[Category], nominations_per_member: int
+) -> NominationFormSchema:
+    """The schema for a ballot of *categories*.
+
+    Schemas are cached by the layout of their categories, so changing a category's
+    fields, labels or requirements gets a freshly compiled one.
+    """
+    return _compile_nomination_form_schema(
+        tuple(category_layout(c) for c in categories), nominations_per_member
+    )
+
+
+@lru_cache(maxsize=64)
+def _compile_nomination_form_schema(
+    layouts: tuple[CategoryLayout, ...], nominations_per_member: int
+) -> NominationFormSchema:
+    fields: dict[str, NominationFieldSpec] = {}
+    fieldsets: dict[int, list[list[str]]] = {}
+    required: dict[int, list[bool]] = {}
+    for (
+        category_id,
+        field_count,
+        *descriptions,
+        field_2_required,
+        field_3_required,
+    ) in layouts:
+        field_ids = NOMINATION_FIELD_IDS[0:field_count]
+        required[category_id] = [True, field_2_required, field_3_required][
+            0:field_count
+        ]
+
+        fieldset_list = fieldsets.setdefault(category_id, [])
+        for nomination_entry in range(nominations_per_member):
+            fieldset = []
+            fieldset_list.append(fieldset)
+
+            for field_id, description in zip(field_ids, descriptions):
+                form_field_id = f"{category_id}-{nomination_entry}-{field_id}"
+                fields[form_field_id] = NominationFieldSpec(field_id, description)
+                fieldset.append(form_field_id)
+
+    return NominationFormSchema(fields=fields, fieldsets=fieldsets, required=required)
+
+
 class NominationForm(forms.BaseForm):
     base_fields = []
 
@@ -29,63 +119,71 @@ class NominationForm(forms.BaseForm):
         *args,
         categories: list[Category],
         queryset: models.QuerySet | None = None,
+        nominations: Iterable[Nomination] | None = None,
         **kwargs,
     ):
         self.categories = categories
         if "initial" not in kwargs:
             if queryset is not None:
-                kwargs["initial"] = self._data_from_queryset(queryset)
+                nominations = queryset.select_related("category").order_by(
+                    "category", "id"
+                )
+            if nominations is not None:
+                kwargs["initial"] = self._data_from_nominations(nominations)
+
+        constitution = svcs_from().get(HugoAwards)
+        self.schema = nomination_form_schema(
+            self.categories, constitution.hugo_nominations_per_member
+        )
 
         super().__init__(*args, **kwargs)
 
-        category_field_definitions: dict[str, models.Field] = {
-            f.name: f
-            for f in Nomination._meta.get_fields()
-            if f.name.startswith("field_")
+        # Building the fields from their specs is much cheaper than deep-copying
+        # compiled fields, which is what BaseForm would do with base_fields.
+        self.fields = {
+            name: spec.formfield() for name, spec in self.schema.fields.items()
         }
 
-        fieldsets: dict[Category, list[list[forms.BoundField]]] = {}
-        self.fieldsets_grouped_by_category = fieldsets
-
-        constitution = svcs_from().get(HugoAwards)
-
-        self.fields = {}
-        for category in self.categories:
-            field_descriptions = {
-                "field_1": category.field_1_description,
-                "field_2": category.field_2_description,
-                "field_3": category.field_3_description,
-            }
-            fieldset_list = fieldsets.setdefault(category, [])
-            for nomination_entry in range(constitution.hugo_nominations_per_member):
-                fieldset = []
-                fieldset_list.append(fieldset)
-
-                for field_id in ["field_1", "field_2", "field_3"][0 : category.fields]:
-                    form_field_id = f"{category.id}-{nomination_entry}-{field_id}"
-                    kwargs = {
-                        "label": field_descriptions[field_id],
-                    }
-                    field = category_field_definitions[field_id].formfield(**kwargs)
-                    field.required = False
-                    self.fields[form_field_id] = field
-
-                    # we go into the __getitem__ here because this is how the fields are bound.
-                    # We could hack around this, but this way we're following the Django API.
-                    fieldset.append(self[form_field_id])
+        self.fieldsets_grouped_by_category = self._bound_fieldsets()
 
         # autofocus all error fields; the browser will jump to the first one
         for field in self.errors:
-            self[field].field.widget.attrs.update({"autofocus": ""})
+            if field in self.fields:
+                self[field].field.widget.attrs.update({"autofocus": ""})
 
-    def _data_from_queryset(self, queryset: models.QuerySet) -> dict[str, Any]:
+    @property
+    def category_field_names(self) -> dict[int, str]:
+        """The names of each category's fields, by category ID, comma separated."""
+        return {
+            category.pk: ",".join(
+                name
+                for fieldset in self.schema.fieldsets[category.pk]
+                for name in fieldset
+            )
+            for category in self.categories
+        }
+
+    def _bound_fieldsets(self) -> dict[Category, list[list[forms.BoundField]]]:
+        # we go into the __getitem__ here because this is how the fields are bound.
+        # We could hack around this, but this way we're following the Django API.
+        return {
+            category: [
+                [self[form_field_id] for form_field_id in fieldset]
+                for fieldset in self.schema.fieldsets[category.pk]
+            ]
+            for category in self.categories
+        }
+
+    def _data_from_nominations(
+        self, nominations: Iterable[Nomination]
+    ) -> dict[str, Any]:
+        """The initial data for *nominations*, which must be in ballot order."""
         initial = {}
-        for category, nominations in groupby(
-            queryset.select_related("category").order_by("category", "id"),
-            attrgetter("category"),
+        for category, category_nominations in groupby(
+            nominations, attrgetter("category")
         ):
-            for i, nomination in enumerate(nominations):
-                for field_id in ["field_1", "field_2", "field_3"][0 : category.fields]:
+            for i, nomination in enumerate(category_nominations):
+                for field_id in NOMINATION_FIELD_IDS[0 : category.fields]:
                     field_name = f"{category.id}-{i}-{field_id}"
                     initial[field_name] = getattr(nomination, field_id)
 
@@ -95,14 +193,14 @@ class NominationForm(forms.BaseForm):
         nominations: list[Nomination] = []
         for category in self.categories:
             fieldset_list = self.fieldsets_grouped_by_category[category]
+            required_fields = self.schema.required[category.pk]
             for fieldset in fieldset_list:
                 # for each fieldset, either all fields are blank or none are blank
                 set_values = [bf.value() for bf in fieldset]
-                required = [
-                    category.field_required(i + 1) for i, _ in enumerate(fieldset)
-                ]
                 set_required_values = [
-                    value for value, required in zip(set_values, required) if required
+                    value
+                    for value, required in zip(set_values, required_fields)
+                    if required
                 ]
 
                 if all(set_required_values):
@@ -177,7 +275,7 @@ class RankForm(forms.BaseForm):
             self[field].field.widget.attrs.update({"autofocus": ""})
 
     def field_for_finalist(self, finalist: Finalist) -> forms.Field:
-        label = markdownify(finalist.name, custom_settings="admin-label")
+        label = finalist.rendered_name
         field = forms.ChoiceField(
             label=label,
             initial=self.ranks[finalist],
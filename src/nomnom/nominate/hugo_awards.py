@@ -1,6 +1,8 @@
+from collections.abc import Iterator
 from io import StringIO
 
 import pyrankvote
+from django.core.cache import cache
 from django.utils.safestring import mark_safe
 from pyrankvote.helpers import (
     CandidateStatus,
@@ -9,25 +11,79 @@ from pyrankvote.helpers import (
 )
 
 from nomnom.convention import HugoAwards
-from nomnom.nominate import models
+from nomnom.nominate import changes, models
 from nomnom.wsfs.rules.constitution_2023 import (
     ElectionBallots,
     NoFinalists,
     ballots_from_category,
+    ballots_from_tallies,
 )
 
+RESULTS_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 def get_winners_for_election(
     awards: HugoAwards, election: models.Election
 ) -> dict[models.Category, ElectionResults | None]:
-    category_results: dict[models.Category, ElectionResults | None] = {}
-    for c in election.category_set.all():
-        try:
-            category_results[c] = run_election(awards, c)
-        except NoFinalists:
-            category_results[c] = None
+    """Count the winner of every category in *election*.
+
+    Each category's results are cached against its rank watermark, so only the categories
+    whose ballots have changed since they were last counted are counted again.
+    """
+    categories = list(election.category_set.all())
+    watermarks = rank_watermarks(categories)
+    keys = {c: f"nominate:results:{c.pk}:{watermarks.get(c.pk, 0)}" for c in categories}
+
+    cached = cache.get_many(keys.values())
+    counted = count_winners(awards, [c for c in categories if keys[c] not in cached])
+    cache.set_many(
+        {keys[c]: results for c, results in counted.items()}, RESULTS_CACHE_TIMEOUT
+    )
+    for category in counted:
+        if category.pk in watermarks:
+            changes.forget_changes(
+                models.CategoryChange.Kind.RANKS,
+                category.pk,
+                before=watermarks[category.pk],
+            )
+
+    return {c: counted[c] if c in counted else cached[keys[c]] for c in categories}
+
+
+def rank_watermarks(categories: list[models.Category]) -> dict[int, int]:
+    """A watermark for the ballots of each of *categories*, by category ID, for those
+    whose ballots have ever changed.
+
+    The watermark is the latest `CategoryChange` of the category's ranks. One is noted
+    whenever the category's ranking tallies, which the results are counted from,
+    change (see `nomnom.nominate.tallies`), and whenever one of its finalists is saved
+    or deleted. Reading the watermarks is one index lookup per category, however many
+    ranks there are.
+    """
+    return changes.latest_changes(
+        models.CategoryChange.Kind.RANKS, [category.pk for category in categories]
+    )
+
+
+def count_winners(
+    awards: HugoAwards, categories: list[models.Category]
+) -> dict[models.Category, ElectionResults | None]:
+    """Count the winner of each of *categories*, one after another.
 
-    return category_results
+    Counting is CPU-bound, so threads wouldn't count the categories any faster. Each is
+    counted from its ranking tallies, which keeps it quick however many ballots there
+    are.
+    """
+    return {c: first_place(awards, c) for c in categories}
+
+
+def first_place(
+    awards: HugoAwards, category: models.Category
+) -> ElectionResults | None:
+    try:
+        return next(all_places(awards, category), None)
+    except NoFinalists:
+        return None
 
 
 def run_election(
@@ -45,19 +101,76 @@ def run_election(
 def run_election_with_ballots(
     awards: HugoAwards, category: models.Category, election_ballots: ElectionBallots
 ) -> ElectionResults:
+    return count_ballots(awards, election_ballots, no_award_candidate(category))
+
+
+def no_award_candidate(category: models.Category) -> pyrankvote.Candidate | None:
     maybe_no_award = [c for c in category.finalist_set.all() if c.name == "No Award"]
     if maybe_no_award:
-        no_award = pyrankvote.Candidate(str(maybe_no_award[0]))
+        return pyrankvote.Candidate(str(maybe_no_award[0]))
     else:
-        no_award = None
+        return None
+
 
+def count_ballots(
+    awards: HugoAwards,
+    election_ballots: ElectionBallots,
+    runoff_candidate: pyrankvote.Candidate | None,
+) -> ElectionResults:
     return awards.counter(
         ballots=election_ballots.ballots,
         candidates=election_ballots.candidates,
-        runoff_candidate=no_award,
+        runoff_candidate=runoff_candidate,
     )
 
 
+def all_places(
+    awards: HugoAwards,
+    category: models.Category,
+    election_ballots: ElectionBallots | None = None,
+) -> Iterator[ElectionResults]:
+    """Count every place in a category: first, then second, and so on.
+
+    Each place is counted without the finalists who won the places before it. The
+    ballots are loaded once, and the winners are removed from them in memory, so
+    counting a place doesn't go back to the database.
+
+    The places are counted as they are consumed; stop early to count fewer of them.
+    Unless *election_ballots* are given, they are read from the category's ranking
+    tallies.
+    """
+    if election_ballots is None:
+        election_ballots = ballots_from_tallies(category)
+    no_award = no_award_candidate(category)
+
+    # we will count at most N places, where N is the number of finalists
+    for _i in range(len(election_ballots.candidates)):
+        results = count_ballots(awards, election_ballots, no_award)
+        winning_round = results.rounds[-1]
+
+        winners = [
+            cr.candidate
+            for cr in winning_round.candidate_results
+            if cr.status == CandidateStatus.Elected
+        ]
+        winning_votes = int(
+            sum(
+                cr.number_of_votes
+                for cr in winning_round.candidate_results
+                if cr.status == CandidateStatus.Elected
+            )
+        )
+
+        yield results
+
+        election_ballots = election_ballots.without(winners)
+
+        # we are done if we have excluded all finalists OR if we have stopped finding
+        # winners to exclude, or if there were no votes in the "winning" round.
+        if not election_ballots.candidates or not winners or winning_votes == 0:
+            break
+
+
 class SlantTable:
     def __init__(self, results: list[RoundResult], title: str):
         self.results = results
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:49
+
+import markdownfield.models
+from django.db import migrations, models
+
+from nomnom.nominate.models import markdown_content, markdown_label, markdown_text
+
+
+def render_names(apps, schema_editor):
+    Category = apps.get_model("nominate", "Category")
+    Finalist = apps.get_model("nominate", "Finalist")
+
+    categories = list(Category.objects.all())
+    for category in categories:
+        category.rendered_name = markdown_label(category.name)
+        category.name_text = markdown_text(category.name)
+        category.rendered_description = markdown_content(category.description)
+        category.description_text = markdown_text(category.description)
+    Category.objects.bulk_update(
+        categories,
+        ["rendered_name", "name_text", "rendered_description", "description_text"],
+    )
+
+    finalists = list(Finalist.objects.all())
+    for finalist in finalists:
+        finalist.rendered_name = markdown_label(finalist.name)
+        finalist.name_text = markdown_text(finalist.name)
+        if finalist.short_name is not None:
+            finalist.rendered_short_name = markdown_label(finalist.short_name)
+            finalist.short_name_text = markdown_text(finalist.short_name)
+    Finalist.objects.bulk_update(
+        finalists,
+        ["rendered_name", "name_text", "rendered_short_name", "short_name_text"],
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nominate", "0028_category_field_1_used_for_canonicalization_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="description_text",
+            field=models.TextField(default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="name_text",
+            field=models.TextField(default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="rendered_description",
+            field=markdownfield.models.RenderedMarkdownField(default=""),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="rendered_name",
+            field=markdownfield.models.RenderedMarkdownField(default=""),
+        ),
+        migrations.AddField(
+            model_name="finalist",
+            name="name_text",
+            field=models.TextField(default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="finalist",
+            name="rendered_name",
+            field=markdownfield.models.RenderedMarkdownField(default=""),
+        ),
+        migrations.AddField(
+            model_name="finalist",
+            name="rendered_short_name",
+            field=markdownfield.models.RenderedMarkdownField(default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name="finalist",
+            name="short_name_text",
+            field=models.TextField(default=None, editable=False, null=True),
+        ),
+        migrations.RunPython(render_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:52
+
+from collections import Counter
+from itertools import groupby
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def count_rankings(apps, schema_editor):
+    Rank = apps.get_model("nominate", "Rank")
+    MemberRanking = apps.get_model("nominate", "MemberRanking")
+    RankingTally = apps.get_model("nominate", "RankingTally")
+
+    rows = (
+        Rank.objects.filter(Q(admin__invalidated=False) | Q(admin__isnull=True))
+        .order_by("membership_id", "finalist__category_id", "position", "id")
+        .values_list("membership_id", "finalist__category_id", "finalist_id")
+    )
+    rankings = {
+        key: ",".join(str(finalist_id) for _, _, finalist_id in ranked)
+        for key, ranked in groupby(rows.iterator(), key=lambda row: row[:2])
+    }
+
+    MemberRanking.objects.bulk_create(
+        (
+            MemberRanking(
+                membership_id=member_id, category_id=category_id, signature=sig
+            )
+            for (member_id, category_id), sig in rankings.items()
+        ),
+        batch_size=5000,
+    )
+    tallies = Counter((category_id, sig) for (_, category_id), sig in rankings.items())
+    RankingTally.objects.bulk_create(
+        (
+            RankingTally(category_id=category_id, signature=sig, count=count)
+            for (category_id, sig), count in tallies.items()
+        ),
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nominate", "0029_rendered_names"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MemberRanking",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("signature", models.TextField()),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="nominate.category",
+                    ),
+                ),
+                (
+                    "membership",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="nominate.nominatingmemberprofile",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("membership", "category"), name="unique_member_ranking"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="RankingTally",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("signature", models.TextField()),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="nominate.category",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("category", "signature"), name="unique_ranking_tally"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(count_rankings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:33
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+def proposed_work_name(nomination) -> str:
+    # Nomination.proposed_work_name, which the historical model doesn't have
+    category = nomination.category
+    fields = [nomination.field_1]
+    if category.fields >= 2 and category.field_2_used_for_canonicalization:
+        fields.append(nomination.field_2)
+    if category.fields >= 3 and category.field_3_used_for_canonicalization:
+        fields.append(nomination.field_3)
+    return " ".join(f for f in fields if f)
+
+
+def set_normalized_names(apps, schema_editor):
+    Nomination = apps.get_model("nominate", "Nomination")
+
+    nominations = []
+    for nomination in Nomination.objects.select_related("category").iterator():
+        nomination.normalized_name = proposed_work_name(nomination).strip().lower()
+        nominations.append(nomination)
+    Nomination.objects.bulk_update(nominations, ["normalized_name"], batch_size=5000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nominate", "0031_ballot_submissions"),
+    ]
+
+    operations = [
+        # for the trigram index; canonicalize enables it too, but nominate doesn't
+        # depend on canonicalize
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="nomination",
+            name="normalized_name",
+            field=models.TextField(default="", editable=False),
+        ),
+        migrations.RunPython(set_normalized_names, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="nomination",
+            index=models.Index(
+                fields=["category", "normalized_name"], name="nomination_name_lookup"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="nomination",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["normalized_name"],
+                name="nomination_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
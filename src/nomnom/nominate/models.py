@@ -4,20 +4,24 @@ from datetime import UTC, datetime
 from django.apps import apps
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractBaseUser
+from django.contrib.postgres.indexes import GinIndex
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Q
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from django.http.request import HttpRequest
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import pgettext
 from django_fsm import FSMField
 from markdown import markdown
+from markdownfield.models import RenderedMarkdownField
+from markdownify.templatetags.markdownify import markdownify
 from pyrankvote import Candidate
 from waffle import switch_is_active
 
 from nomnom.base.feature_switches import SWITCH_HUGO_PACKET
+from nomnom.base.signals import nomination_names_changed
 from nomnom.model_utils import AdminMetadata
 from nomnom.nominate.templatetags.nomnom_filters import html_text
 
@@ -349,8 +353,18 @@ class Category(models.Model):
         help_text="Use as part of the canonicalization process",
     )
 
+    # The name and description rendered from markdown, refreshed on every save by
+    # `render_category_markdown`.
+    rendered_name = RenderedMarkdownField(default="")
+    name_text = models.TextField(editable=False, default="")
+    rendered_description = RenderedMarkdownField(default="")
+    description_text = models.TextField(editable=False, default="")
+
     def __str__(self):
-        return html_text(markdown(self.name))
+        if self.name_text or not self.name:
+            return self.name_text
+
+        return markdown_text(self.name)
 
     def field_required(self, field_number: int) -> bool:
         if field_number == 1:
@@ -377,6 +391,34 @@ class NominationsManager(models.Manager):
     def get_queryset(self) -> models.QuerySet:
         return super().get_queryset().prefetch_related("category", "nominator")
 
+    # Bulk writes skip the pre_save receiver that sets the normalized name, so set it
+    # here instead.
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = self._with_categories(objs)
+        for nomination in objs:
+            nomination.update_normalized_name()
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if set(fields) & {"field_1", "field_2", "field_3"}:
+            objs = self._with_categories(objs)
+            for nomination in objs:
+                nomination.update_normalized_name()
+            fields = [*fields, "normalized_name"]
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def _with_categories(self, objs) -> list["Nomination"]:
+        # the normalized name depends on the category, so load all of the categories
+        # the nominations don't have yet at once, rather than one per nomination
+        objs = list(objs)
+        missing = [n for n in objs if not self.model.category.is_cached(n)]
+        categories = Category.objects.in_bulk({n.category_id for n in missing})
+        for nomination in missing:
+            if nomination.category_id in categories:
+                nomination.category = categories[nomination.category_id]
+        return objs
+
 
 class NominationValidManager(NominationsManager):
     def get_queryset(self) -> models.QuerySet:
@@ -387,11 +429,26 @@ class NominationValidManager(NominationsManager):
         )
 
 
+def normalize_work_name(name: str) -> str:
+    """The form of a work name that nominations and works are matched on."""
+    return name.strip().lower()
+
+
 class Nomination(models.Model):
     class Meta:
         permissions = [
             ("edit_ballot", "Can edit the ballot as an admin"),
         ]
+        indexes = [
+            models.Index(
+                fields=["category", "normalized_name"], name="nomination_name_lookup"
+            ),
+            GinIndex(
+                fields=["normalized_name"],
+                name="nomination_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
     field_1 = models.CharField(max_length=200)
     field_2 = models.CharField(max_length=200)
@@ -405,6 +462,11 @@ class Nomination(models.Model):
     nomination_date = models.DateTimeField(null=False, auto_now=True)
     nomination_ip_address = models.CharField(max_length=64)
 
+    # The proposed work name, normalized for matching against works; refreshed on every
+    # save by `set_normalized_name` (or by the manager's bulk writes), and when the
+    # category's canonicalization fields change by `refresh_normalized_names`.
+    normalized_name = models.TextField(editable=False, default="")
+
     # this ties the method into canonicalize; ignore it if the canonicalize app
     # is not installed.
     @property
@@ -463,6 +525,9 @@ class Nomination(models.Model):
         fields = self.fields_for_canonicalization
         return " ".join(f for f in fields if f)
 
+    def update_normalized_name(self) -> None:
+        self.normalized_name = normalize_work_name(self.proposed_work_name())
+
     def canonicalization_display_name(self) -> str:
         fields = self.fields_for_canonicalization
         return " | ".join(f for f in fields if f)
@@ -506,11 +571,107 @@ class Finalist(models.Model):
         null=True,
     )
 
+    # The names rendered from markdown, refreshed on every save by
+    # `render_finalist_markdown`.
+    rendered_name = RenderedMarkdownField(default="")
+    name_text = models.TextField(editable=False, default="")
+    rendered_short_name = RenderedMarkdownField(null=True, default=None)
+    short_name_text = models.TextField(editable=False, null=True, default=None)
+
     def __str__(self):
         return self.short_name if self.short_name else self.name
 
+    @property
+    def text(self) -> str:
+        """This finalist's display name, as plain text."""
+        if self.short_name:
+            return self.short_name_text or markdown_text(self.short_name)
+
+        return self.name_text or markdown_text(self.name)
+
     def as_candidate(self) -> Candidate:
-        return Candidate(html_text(markdown(str(self))))
+        return Candidate(self.text)
+
+
+def markdown_label(text: str) -> str:
+    return markdownify(text, custom_settings="admin-label")
+
+
+def markdown_content(text: str) -> str:
+    return markdownify(text, custom_settings="admin-content")
+
+
+def markdown_text(text: str) -> str:
+    return html_text(markdown(text))
+
+
+@receiver(pre_save, sender=Category)
+def render_category_markdown(sender, instance: Category, **kwargs):
+    instance.rendered_name = markdown_label(instance.name)
+    instance.name_text = markdown_text(instance.name)
+    instance.rendered_description = markdown_content(instance.description)
+    instance.description_text = markdown_text(instance.description)
+
+
+CANONICALIZATION_FIELDS = [
+    "fields",
+    "field_1_used_for_canonicalization",
+    "field_2_used_for_canonicalization",
+    "field_3_used_for_canonicalization",
+]
+
+
+@receiver(pre_save, sender=Category)
+def note_canonicalization_change(sender, instance: Category, raw=False, **kwargs):
+    instance._canonicalization_changed = False
+    if raw or instance.pk is None:
+        return
+
+    before = (
+        Category.objects.filter(pk=instance.pk).values(*CANONICALIZATION_FIELDS).first()
+    )
+    instance._canonicalization_changed = before is not None and any(
+        before[field] != getattr(instance, field) for field in CANONICALIZATION_FIELDS
+    )
+
+
+@receiver(post_save, sender=Category)
+def refresh_normalized_names(sender, instance: Category, **kwargs):
+    # which fields make up the proposed work name has changed for every nomination
+    if not getattr(instance, "_canonicalization_changed", False):
+        return
+
+    nominations = []
+    for nomination in (
+        Nomination.objects.filter(category=instance)
+        .prefetch_related(None)
+        .only("id", "field_1", "field_2", "field_3")
+        .iterator()
+    ):
+        nomination.category = instance
+        nomination.update_normalized_name()
+        nominations.append(nomination)
+    Nomination.objects.bulk_update(nominations, ["normalized_name"], batch_size=5000)
+    nomination_names_changed.send(sender=Category, category=instance)
+
+
+@receiver(pre_save, sender=Nomination)
+def set_normalized_name(sender, instance: Nomination, raw=False, **kwargs):
+    if raw:
+        return
+
+    instance.update_normalized_name()
+
+
+@receiver(pre_save, sender=Finalist)
+def render_finalist_markdown(sender, instance: Finalist, **kwargs):
+    instance.rendered_name = markdown_label(instance.name)
+    instance.name_text = markdown_text(instance.name)
+    if instance.short_name is None:
+        instance.rendered_short_name = instance.short_name_text = None
+    else:
+        instance.rendered_short_name = markdown_label(instance.short_name)
+        instance.short_name_text = markdown_text(instance.short_name)
 
 
 class ValidManager(models.Manager):
@@ -552,6 +713,88 @@ class RankAdminData(AdminMetadata):
     rank = models.OneToOneField(Rank, on_delete=models.CASCADE, related_name="admin")
 
 
+class MemberRanking(models.Model):
+    """A member's valid ranks in a category, as a ranking signature.
+
+    The signature is the IDs of the ranked finalists, in ranked order, separated by
+    commas. These are kept in step with `Rank` by `nomnom.nominate.tallies`; knowing what
+    each member was last counted as lets the `RankingTally` counts be refreshed safely
+    any number of times.
+    """
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["membership", "category"], name="unique_member_ranking"
+            ),
+        ]
+
+    membership = models.ForeignKey(NominatingMemberProfile, on_delete=models.CASCADE)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    signature = models.TextField()
+
+
+class RankingTally(models.Model):
+    """The number of members who cast each distinct ranking in a category."""
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["category", "signature"], name="unique_ranking_tally"
+            ),
+        ]
+
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    signature = models.TextField()
+    count = models.IntegerField(default=0)
+
+
+class BallotSubmission(models.Model):
+    """A saved submission of a member's ballot, by the idempotency key of its form.
+
+    Each rendering of a ballot form carries a fresh key; a submission whose key is
+    already here is a repeat (a double-click, or a retry) and isn't saved again. See
+    `nomnom.nominate.submissions`.
+    """
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["member", "key"], name="unique_ballot_submission"
+            ),
+        ]
+
+    election = models.ForeignKey(Election, on_delete=models.CASCADE)
+    member = models.ForeignKey(NominatingMemberProfile, on_delete=models.CASCADE)
+    key = models.UUIDField()
+    submitted_at = models.DateTimeField(auto_now_add=True)
+
+
+class CategoryChange(models.Model):
+    """A change to what a category's results are counted from.
+
+    Rows are only ever added, never updated, so noting a change never waits on another
+    one. A result remembers the latest change it was counted through, and is stale once
+    there's a later one. See `nomnom.nominate.changes`.
+    """
+
+    class Kind(models.TextChoices):
+        # the canonicalized nominations the finalists are counted from
+        NOMINATIONS = "nominations"
+        # the ranks the winners are counted from
+        RANKS = "ranks"
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["category", "kind", "-id"], name="category_change_lookup"
+            ),
+        ]
+
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=16, choices=Kind.choices)
+
+
 # These models are configuration models specifically for admin operations.
 class ReportRecipient(models.Model):
     report_name = models.CharField(max_length=200)
@@ -19,11 +19,9 @@ from django.http import (
 )
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
-from markdown import markdown
 
 from nomnom.nominate import models, tasks
 from nomnom.nominate.decorators import user_passes_test_or_forbidden
-from nomnom.nominate.templatetags.nomnom_filters import html_text
 from nomnom.reporting import Report, ReportView
 
 report_decorators = [
@@ -196,13 +194,13 @@ class RanksReport(Report):
                 member_email=F("membership__user__email"),
                 member_number=F("membership__member_number"),
                 updated=F("rank_date"),
-                category=F("finalist__category__name"),
+                category=F("finalist__category__name_text"),
                 finalist_name=Case(
                     When(
                         finalist__short_name__isnull=False,
-                        then=F("finalist__short_name"),
+                        then=F("finalist__short_name_text"),
                     ),
-                    default=F("finalist__name"),
+                    default=F("finalist__name_text"),
                     output_field=TextField(),
                 ),
                 ip_address=Case(
@@ -243,8 +241,6 @@ class RanksReport(Report):
             row_dict: dict[str, str] = {
                 fn: getattr(row, fn) for fn in self.get_field_names()
             }
-            row_dict["category"] = html_text(markdown(row_dict["category"]))
-            row_dict["finalist_name"] = html_text(markdown(row_dict["finalist_name"]))
 
             out = StringIO()
             writer = csv.writer(out)
@@ -1,11 +1,22 @@
+from weakref import WeakKeyDictionary
+
 from django.contrib.auth.models import Group
-from django.db.models.signals import m2m_changed
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django_svcs.apps import svcs_from
 
 from nomnom.convention import ConventionConfiguration
-from nomnom.nominate import admin
-from nomnom.nominate.models import NominatingMemberProfile, Nomination
+from nomnom.nominate import admin, tallies
+from nomnom.nominate.changes import note_changes
+from nomnom.nominate.models import (
+    CategoryChange,
+    Finalist,
+    NominatingMemberProfile,
+    Nomination,
+    Rank,
+    RankAdminData,
+)
 
 
 @receiver(m2m_changed, sender=Group.user_set.through)
@@ -40,3 +51,84 @@ def user_added_or_removed_from_group(sender, instance, action, pk_set, **kwargs)
                     Nomination.objects.filter(nominator=instance.convention_profile),
                     False,
                 )
+
+
+def _deletes_ranks(origin) -> bool:
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, Rank)
+
+
+# What is being deleted, by the object or queryset the delete started from. Every row of
+# a model is deleted before any of its post_delete signals are sent, so the first of
+# them refreshes the rankings for the whole delete.
+_deleted_ranks: WeakKeyDictionary = WeakKeyDictionary()
+_deleted_rank_admin_data: WeakKeyDictionary = WeakKeyDictionary()
+
+
+@receiver(post_save, sender=Rank)
+def rank_saved(sender, instance: Rank, raw: bool = False, **kwargs):
+    if raw or tallies.in_bulk_changes():
+        return
+
+    tallies.refresh_ranks([(instance.membership_id, instance.finalist_id)])
+
+
+@receiver(pre_delete, sender=Rank)
+def rank_deleting(sender, instance: Rank, origin=None, **kwargs):
+    if origin is None or tallies.in_bulk_changes():
+        return
+
+    _deleted_ranks.setdefault(origin, set()).add(
+        (instance.membership_id, instance.finalist_id)
+    )
+
+
+@receiver(post_delete, sender=Rank)
+def rank_deleted(sender, instance: Rank, origin=None, **kwargs):
+    if origin is None or tallies.in_bulk_changes():
+        return
+
+    tallies.refresh_ranks(_deleted_ranks.pop(origin, ()))
+
+
+def _rank_admin_data_ranks(rank_ids) -> list[tuple[int, int]]:
+    return list(
+        Rank.objects.filter(pk__in=rank_ids).values_list("membership_id", "finalist_id")
+    )
+
+
+@receiver(post_save, sender=RankAdminData)
+def rank_admin_data_saved(sender, instance: RankAdminData, raw: bool = False, **kwargs):
+    if raw or tallies.in_bulk_changes():
+        return
+
+    tallies.refresh_ranks(_rank_admin_data_ranks([instance.rank_id]))
+
+
+@receiver(pre_delete, sender=RankAdminData)
+def rank_admin_data_deleting(sender, instance: RankAdminData, origin=None, **kwargs):
+    # when the ranks themselves are being deleted, their receivers refresh the rankings
+    if origin is None or tallies.in_bulk_changes() or _deletes_ranks(origin):
+        return
+
+    _deleted_rank_admin_data.setdefault(origin, set()).add(instance.rank_id)
+
+
+@receiver(post_delete, sender=RankAdminData)
+def rank_admin_data_deleted(sender, instance: RankAdminData, origin=None, **kwargs):
+    if origin is None or tallies.in_bulk_changes():
+        return
+
+    rank_ids = _deleted_rank_admin_data.pop(origin, None)
+    if rank_ids:
+        tallies.refresh_ranks(_rank_admin_data_ranks(rank_ids))
+
+
+@receiver(post_save, sender=Finalist)
+@receiver(post_delete, sender=Finalist)
+def finalist_changed(sender, instance: Finalist, raw: bool = False, **kwargs):
+    # the results name the finalists, so they're counted again when one changes
+    if raw:
+        return
+
+    note_changes(CategoryChange.Kind.RANKS, [instance.category_id])
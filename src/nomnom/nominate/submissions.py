@@ -0,0 +1,110 @@
+"""Serializing and de-duplicating ballot submissions.
+
+A member's ballot in an election is only ever saved by one request at a time: each save
+takes a Postgres advisory lock on (election, member) for the length of its transaction,
+so a double-click queues the second request behind the first rather than having them
+contend for the same rows.
+
+Ballot forms also carry an idempotency key, fresh each time they are rendered. Saving a
+ballot records its key; a submission whose key was already recorded has been saved,
+and is answered without saving it again. Keys are only recorded once the ballot is
+saved, so a submission that fails validation can be sent again, and they are kept for
+`SUBMISSION_KEY_LIFETIME`: a member's older keys are dropped as new ones are recorded.
+
+Each category of a nominating ballot can also be saved on its own, so each carries a
+key of its own too (see `category_key_field`), fresh each time the category is
+rendered; saving a category leaves the ballot's key unrecorded.
+"""
+
+import uuid
+from datetime import timedelta
+
+from django.db import connection
+from django.http import HttpRequest
+from django.utils import timezone
+
+from nomnom.nominate import models
+
+SUBMISSION_KEY = "submission_key"
+
+# Long enough to cover any retry of a submission
+SUBMISSION_KEY_LIFETIME = timedelta(days=1)
+
+
+def new_submission_key() -> str:
+    return str(uuid.uuid4())
+
+
+def lock_ballot(
+    election: models.Election, profile: models.NominatingMemberProfile
+) -> None:
+    """Wait for any other save of *profile*'s ballot in *election* to finish.
+
+    This must be called in a transaction; the lock is released when it ends.
+    """
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(%s, %s)", [election.pk, profile.pk]
+        )
+
+
+def category_key_field(category: models.Category) -> str:
+    """The form field a save of *category* alone carries its key in."""
+    return f"{category.pk}-{SUBMISSION_KEY}"
+
+
+def submission_key(
+    request: HttpRequest, key_field: str = SUBMISSION_KEY
+) -> uuid.UUID | None:
+    try:
+        return uuid.UUID(request.POST.get(key_field, ""))
+    except ValueError:
+        return None
+
+
+def is_replay(
+    request: HttpRequest,
+    election: models.Election,
+    profile: models.NominatingMemberProfile,
+    key_field: str = SUBMISSION_KEY,
+) -> bool:
+    """Whether *request* repeats a submission of the ballot that was already saved.
+
+    Call this with the ballot locked, so that a repeat waits for the original to be
+    saved.
+    """
+    key = submission_key(request, key_field)
+    if key is None:
+        return False
+
+    return models.BallotSubmission.objects.filter(
+        member=profile,
+        key=key,
+        submitted_at__gte=timezone.now() - SUBMISSION_KEY_LIFETIME,
+    ).exists()
+
+
+def record_submission(
+    request: HttpRequest,
+    election: models.Election,
+    profile: models.NominatingMemberProfile,
+    key_field: str = SUBMISSION_KEY,
+) -> None:
+    """Record the key of *request* once its ballot has been saved, in the same
+    transaction, and drop *profile*'s expired keys.
+
+    Call this with the ballot still locked.
+    """
+    key = submission_key(request, key_field)
+    if key is None:
+        return
+
+    models.BallotSubmission.objects.filter(
+        member=profile, submitted_at__lt=timezone.now() - SUBMISSION_KEY_LIFETIME
+    ).delete()
+    models.BallotSubmission.objects.get_or_create(
+        election=election, member=profile, key=key
+    )
@@ -0,0 +1,222 @@
+"""Ranking tallies: how many members cast each distinct ranking in a category.
+
+The final ballot is counted from `RankingTally` rows, one per distinct ranking, rather
+than from every `Rank`. The tallies are kept in step with the ranks:
+
+* saving a single `Rank` or `RankAdminData` refreshes that member's ranking (see
+  `nomnom.nominate.signals`), so a loop of saves costs a refresh per save;
+* deleting ranks, or their admin data, refreshes the rankings of every member whose
+  ranks were deleted together once, after they are all gone;
+* bulk writes are made inside `updating_tallies`, which refreshes the members it is
+  given, or rebuilds the categories from scratch, once the writes are done. Loops of
+  saves belong in there too.
+
+All of this happens in the same transaction as the writes to the ranks, or in a
+transaction of its own for a rank saved outside of one, which also notes a
+`CategoryChange` of the ranks of every category whose tallies changed. Tallies are shared by every
+member who cast the same ranking, so they are always updated in the same order, to keep
+concurrent ballot saves from deadlocking on them.
+"""
+
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import F, QuerySet
+
+from nomnom.nominate import models
+from nomnom.nominate.changes import note_changes
+
+type RankingKey = tuple[int, int]  # (membership ID, category ID)
+
+# Set while bulk writes are being made; the per-rank receivers leave the tallies alone.
+_bulk_changes: ContextVar[bool] = ContextVar("bulk_rank_changes", default=False)
+
+
+def signature(finalist_ids: Iterable[int]) -> str:
+    return ",".join(str(finalist_id) for finalist_id in finalist_ids)
+
+
+def finalist_ids(signature: str) -> list[int]:
+    return [int(finalist_id) for finalist_id in signature.split(",")]
+
+
+def in_bulk_changes() -> bool:
+    return _bulk_changes.get()
+
+
+def current_rankings(ranks: QuerySet[models.Rank]) -> dict[RankingKey, str]:
+    """The signature of each member's ranks in each category, among *ranks*.
+
+    *ranks* should come from `Rank.valid`."""
+    rows = ranks.order_by(
+        "membership_id", "finalist__category_id", "position", "id"
+    ).values_list("membership_id", "finalist__category_id", "finalist_id")
+
+    return {
+        key: signature(finalist_id for _, _, finalist_id in ranked)
+        for key, ranked in groupby(rows.iterator(), key=lambda row: (row[0], row[1]))
+    }
+
+
+@transaction.atomic
+def refresh_rankings(member_ids: Iterable[int], category_ids: Iterable[int]) -> None:
+    """Bring the rankings of *member_ids* in *category_ids*, and their tallies, up to
+    date with their ranks.
+
+    This is safe to call more than once for the same change.
+    """
+    member_ids = set(member_ids)
+    category_ids = set(category_ids)
+    if not member_ids or not category_ids:
+        return
+
+    current = current_rankings(
+        models.Rank.valid.filter(
+            membership_id__in=member_ids, finalist__category_id__in=category_ids
+        )
+    )
+    stored = {
+        (ranking.membership_id, ranking.category_id): ranking
+        for ranking in models.MemberRanking.objects.select_for_update().filter(
+            membership_id__in=member_ids, category_id__in=category_ids
+        )
+    }
+
+    changes: Counter[tuple[int, str]] = Counter()
+    updated: list[models.MemberRanking] = []
+    removed: list[int] = []
+    for key in sorted(stored.keys() | current.keys()):
+        old = stored[key].signature if key in stored else None
+        new = current.get(key)
+        if old == new:
+            continue
+
+        member_id, category_id = key
+        if old is not None:
+            changes[category_id, old] -= 1
+        if new is None:
+            removed.append(stored[key].pk)
+        else:
+            changes[category_id, new] += 1
+            updated.append(
+                models.MemberRanking(
+                    membership_id=member_id, category_id=category_id, signature=new
+                )
+            )
+
+    models.MemberRanking.objects.filter(pk__in=removed).delete()
+    models.MemberRanking.objects.bulk_create(
+        updated,
+        update_conflicts=True,
+        unique_fields=["membership", "category"],
+        update_fields=["signature"],
+    )
+    apply_tally_changes(changes)
+
+
+def refresh_ranks(ranks: Iterable[tuple[int, int]]) -> None:
+    """Refresh the rankings that *ranks*, as (membership ID, finalist ID) pairs, are
+    part of, looking up their categories in one query."""
+    ranks = set(ranks)
+    if not ranks:
+        return
+
+    categories = dict(
+        models.Finalist.objects.filter(
+            pk__in={finalist_id for _, finalist_id in ranks}
+        ).values_list("id", "category_id")
+    )
+    refresh_rankings(
+        {member_id for member_id, _ in ranks},
+        {
+            categories[finalist_id]
+            for _, finalist_id in ranks
+            if finalist_id in categories
+        },
+    )
+
+
+def apply_tally_changes(changes: Counter[tuple[int, str]]) -> None:
+    changes = Counter({key: change for key, change in changes.items() if change})
+    if not changes:
+        return
+
+    # in key order, so that concurrent refreshes lock the shared tallies in the same order
+    ordered = sorted(changes.items())
+    models.RankingTally.objects.bulk_create(
+        [
+            models.RankingTally(category_id=category_id, signature=sig, count=0)
+            for (category_id, sig), change in ordered
+            if change > 0
+        ],
+        ignore_conflicts=True,
+    )
+    for (category_id, sig), change in ordered:
+        models.RankingTally.objects.filter(
+            category_id=category_id, signature=sig
+        ).update(count=F("count") + change)
+
+    category_ids = {category_id for category_id, _ in changes}
+    models.RankingTally.objects.filter(
+        category_id__in=category_ids, count__lte=0
+    ).delete()
+    note_changes(models.CategoryChange.Kind.RANKS, category_ids)
+
+
+@transaction.atomic
+def rebuild_tallies(category_ids: Iterable[int]) -> None:
+    """Recount the rankings and tallies of *category_ids* from their ranks."""
+    category_ids = set(category_ids)
+    if not category_ids:
+        return
+
+    current = current_rankings(
+        models.Rank.valid.filter(finalist__category_id__in=category_ids)
+    )
+
+    models.MemberRanking.objects.filter(category_id__in=category_ids).delete()
+    models.RankingTally.objects.filter(category_id__in=category_ids).delete()
+
+    models.MemberRanking.objects.bulk_create(
+        (
+            models.MemberRanking(
+                membership_id=member_id, category_id=category_id, signature=sig
+            )
+            for (member_id, category_id), sig in current.items()
+        ),
+        batch_size=5000,
+    )
+    tallies = Counter((category_id, sig) for (_, category_id), sig in current.items())
+    models.RankingTally.objects.bulk_create(
+        (
+            models.RankingTally(category_id=category_id, signature=sig, count=count)
+            for (category_id, sig), count in tallies.items()
+        ),
+        batch_size=5000,
+    )
+    note_changes(models.CategoryChange.Kind.RANKS, category_ids)
+
+
+@contextmanager
+def updating_tallies(
+    category_ids: Iterable[int], member_ids: Iterable[int] | None = None
+) -> Iterator[None]:
+    """Make bulk writes to ranks, then bring the tallies of *category_ids* up to date.
+
+    The tallies aren't refreshed rank by rank inside the block. Afterwards, the rankings of
+    *member_ids* are refreshed; if no members are given, the categories are rebuilt.
+    """
+    token = _bulk_changes.set(True)
+    try:
+        yield
+    finally:
+        _bulk_changes.reset(token)
+
+    if member_ids is None:
+        rebuild_tallies(category_ids)
+    else:
+        refresh_rankings(member_ids, category_ids)
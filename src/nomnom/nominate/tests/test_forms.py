@@ -0,0 +1,78 @@
+import pytest
+
+from nomnom.nominate.forms import NominationForm, nomination_form_schema
+from nomnom.nominate.models import Category
+
+
+@pytest.fixture(name="categories")
+def make_categories() -> list[Category]:
+    return [
+        Category(
+            pk=pk,
+            name=f"Category {pk}",
+            fields=2,
+            field_1_description="Title",
+            field_2_description="Author",
+            field_2_required=field_2_required,
+        )
+        for pk, field_2_required in [(1, True), (2, False)]
+    ]
+
+
+def test_schema_is_compiled_once(categories):
+    assert nomination_form_schema(categories, 5) is nomination_form_schema(
+        categories, 5
+    )
+
+
+def test_changing_a_category_compiles_a_new_schema(categories):
+    before = nomination_form_schema(categories, 5)
+
+    categories[0].field_1_description = "Name"
+    after = nomination_form_schema(categories, 5)
+
+    assert after is not before
+    assert after.fields["1-0-field_1"].label == "Name"
+    assert before.fields["1-0-field_1"].label == "Title"
+
+
+def test_schema_lays_out_every_nomination(categories):
+    schema = nomination_form_schema(categories, 3)
+
+    assert schema.fieldsets[2] == [
+        ["2-0-field_1", "2-0-field_2"],
+        ["2-1-field_1", "2-1-field_2"],
+        ["2-2-field_1", "2-2-field_2"],
+    ]
+    assert schema.required == {1: [True, True], 2: [True, False]}
+
+
+def test_form_requires_the_required_fields(categories):
+    form = NominationForm(
+        categories=categories,
+        data={"1-0-field_1": "a title", "2-0-field_1": "another title"},
+    )
+
+    assert not form.is_valid()
+    assert list(form.errors) == ["1-0-field_2"]
+
+
+def test_autofocus_stays_on_the_form_with_the_error(categories):
+    invalid = NominationForm(categories=categories, data={"1-0-field_1": "a title"})
+    valid = NominationForm(categories=categories, data={})
+
+    assert "autofocus" in invalid["1-0-field_2"].field.widget.attrs
+    assert "autofocus" not in valid["1-0-field_2"].field.widget.attrs
+    [first_fieldset, *_] = invalid.fieldsets_grouped_by_category[categories[0]]
+    assert "autofocus" in first_fieldset[1].field.widget.attrs
+
+
+def test_changing_a_form_s_field_leaves_other_forms_alone(categories):
+    changed = NominationForm(categories=categories)
+    changed.fields["1-0-field_1"].label = "Changed"
+    changed.fields["1-0-field_1"].widget.attrs["class"] = "changed"
+
+    other = NominationForm(categories=categories)
+
+    assert other.fields["1-0-field_1"].label == "Title"
+    assert "class" not in other.fields["1-0-field_1"].widget.attrs
@@ -1,7 +1,19 @@
+import dataclasses
+
 import pytest
+from django.core.cache import cache
+from pyrankvote.helpers import CandidateStatus
 
 from nomnom.nominate import factories, models
-from nomnom.wsfs.rules.constitution_2023 import ballots_from_category
+from nomnom.nominate.admin import set_rank_valid
+from nomnom.nominate.hugo_awards import (
+    all_places,
+    count_winners,
+    get_winners_for_election,
+    rank_watermarks,
+    run_election,
+)
+from nomnom.wsfs.rules.constitution_2023 import ballots_from_category, hugo_awards
 
 # mark all tests in the module with @pytest.mark.django_db
 pytestmark = pytest.mark.django_db
@@ -63,6 +75,22 @@ def test_exact_ballot_first_places(category, ranked_finalists):
     assert eb.ballots[5].ranked_candidates[0] == ranked_finalists[4]
 
 
+def test_ballots_from_category_reads_finalists_and_ranks_once(
+    category, ranked_finalists, django_assert_num_queries
+):
+    with django_assert_num_queries(2):
+        ballots_from_category(category)
+
+
+def test_ballots_are_in_ranked_order(category, ranked_finalists, ballot_data):
+    eb = ballots_from_category(category)
+
+    # the second row of the ballot data ranks the columns in reverse
+    assert eb.ballots[1].ranked_candidates == tuple(
+        f.as_candidate() for f in [*ranked_finalists[3::-1], ranked_finalists[4]]
+    )
+
+
 def test_excluded_candidate(category, ranked_finalists):
     eb = ballots_from_category(category, excluded_finalists=[ranked_finalists[0]])
 
@@ -87,3 +115,172 @@ def make_category(election) -> models.Category:
         category=category, name="no award", ballot_position=5
     )
     return category
+
+
+def round_results(results):
+    return [
+        [
+            (cr.candidate.name, cr.number_of_votes, cr.status)
+            for cr in r.candidate_results
+        ]
+        for r in results.rounds
+    ]
+
+
+def test_all_places_matches_excluding_each_winner(category, ranked_finalists):
+    finalists_by_candidate = {f.as_candidate(): f for f in ranked_finalists}
+
+    expected = []
+    excluded: list[models.Finalist] = []
+    for _ in ranked_finalists:
+        results = run_election(hugo_awards, category, excluded_finalists=excluded)
+        expected.append(round_results(results))
+        winners = [
+            finalists_by_candidate[cr.candidate]
+            for cr in results.rounds[-1].candidate_results
+            if cr.status == CandidateStatus.Elected
+        ]
+        excluded.extend(winners)
+        if len(excluded) == len(ranked_finalists) or not winners:
+            break
+
+    assert [round_results(r) for r in all_places(hugo_awards, category)] == expected
+
+
+def test_all_places_loads_the_ballots_once(
+    category, ranked_finalists, django_assert_max_num_queries
+):
+    # loading the ballots reads the finalists and the ranks; finding No Award reads the
+    # finalists again. No place after the first goes back for more.
+    with django_assert_max_num_queries(3):
+        places = list(all_places(hugo_awards, category))
+
+    assert len(places) > 1
+
+
+@pytest.fixture(name="counted_awards")
+def get_counted_awards():
+    cache.clear()
+    counted = []
+
+    def counter(**kwargs):
+        counted.append(kwargs["candidates"])
+        return hugo_awards.counter(**kwargs)
+
+    return dataclasses.replace(hugo_awards, counter=counter), counted
+
+
+class TestWinnersForElection:
+    def test_matches_the_first_place(self, election, category, ranked_finalists):
+        cache.clear()
+        winners = get_winners_for_election(hugo_awards, election)
+
+        assert round_results(winners[category]) == round_results(
+            run_election(hugo_awards, category)
+        )
+
+    def test_unchanged_categories_are_not_recounted(
+        self, election, category, ranked_finalists, counted_awards
+    ):
+        awards, counted = counted_awards
+        first = get_winners_for_election(awards, election)
+        second = get_winners_for_election(awards, election)
+
+        assert len(counted) == 1
+        assert round_results(second[category]) == round_results(first[category])
+
+    def test_a_new_rank_moves_the_watermark(
+        self,
+        election,
+        category,
+        ranked_finalists,
+        counted_awards,
+        django_capture_on_commit_callbacks,
+    ):
+        awards, counted = counted_awards
+        get_winners_for_election(awards, election)
+        with django_capture_on_commit_callbacks(execute=True):
+            factories.RankFactory.create(
+                membership=factories.NominatingMemberProfileFactory.create(),
+                finalist=ranked_finalists[1],
+                position=1,
+            )
+        get_winners_for_election(awards, election)
+
+        assert len(counted) == 2
+
+    def test_a_cache_hit_does_not_read_the_ranks(
+        self,
+        election,
+        category,
+        ranked_finalists,
+        counted_awards,
+        django_assert_num_queries,
+    ):
+        awards, counted = counted_awards
+        get_winners_for_election(awards, election)
+
+        # the categories, and their watermarks
+        with django_assert_num_queries(2):
+            get_winners_for_election(awards, election)
+
+        assert len(counted) == 1
+
+    def test_invalidating_a_rank_moves_the_watermark(
+        self, category, ranked_finalists, django_capture_on_commit_callbacks
+    ):
+        before = rank_watermarks([category])
+        with django_capture_on_commit_callbacks(execute=True):
+            set_rank_valid(
+                models.Rank.objects.filter(finalist=ranked_finalists[0]), False
+            )
+
+        assert rank_watermarks([category])[category.pk] != before.get(category.pk)
+
+    def test_renaming_a_finalist_moves_the_watermark(
+        self, category, ranked_finalists, django_capture_on_commit_callbacks
+    ):
+        before = rank_watermarks([category])
+        finalist = ranked_finalists[0]
+        finalist.name = "A New Name"
+        with django_capture_on_commit_callbacks(execute=True):
+            finalist.save()
+
+        assert rank_watermarks([category])[category.pk] != before.get(category.pk)
+
+    def test_watermarks_are_per_category(
+        self, election, category, ranked_finalists, django_capture_on_commit_callbacks
+    ):
+        other = factories.CategoryFactory.create(election=election)
+        with django_capture_on_commit_callbacks(execute=True):
+            factories.FinalistFactory.create(category=other, ballot_position=1)
+        before = rank_watermarks([category, other])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            factories.RankFactory.create(
+                membership=factories.NominatingMemberProfileFactory.create(),
+                finalist=ranked_finalists[0],
+                position=1,
+            )
+        after = rank_watermarks([category, other])
+
+        assert after[category.pk] != before.get(category.pk)
+        assert after[other.pk] == before[other.pk]
+
+
+def test_count_winners_counts_the_first_place(election, category, ranked_finalists):
+    other = factories.CategoryFactory.create(election=election)
+    finalist = factories.FinalistFactory.create(category=other, ballot_position=1)
+    factories.RankFactory.create(
+        membership=factories.NominatingMemberProfileFactory.create(),
+        finalist=finalist,
+        position=1,
+    )
+    categories = [category, other]
+
+    counted = count_winners(hugo_awards, categories)
+    first = {c: next(all_places(hugo_awards, c)) for c in categories}
+
+    assert {c: round_results(r) for c, r in counted.items()} == {
+        c: round_results(r) for c, r in first.items()
+    }
@@ -6,10 +6,11 @@ from nomnom.convention import ConventionConfiguration
 from nomnom.nominate.factories import (
     CategoryFactory,
     ElectionFactory,
+    FinalistFactory,
     NominatingMemberProfileFactory,
     NominationFactory,
 )
-from nomnom.nominate.models import Election, Nomination
+from nomnom.nominate.models import Category, Election, Finalist, Nomination
 
 pytestmark = pytest.mark.usefixtures("db")
 
@@ -302,3 +303,104 @@ def test_removing_nomination_permissions_via_group_invalidates_nominations(
 
     assert Nomination.valid.filter(nominator=nominator).count() == 0
     assert Nomination.valid.count() == 2
+
+
+class TestRenderedNames:
+    def test_category_names_are_rendered_on_save(self, category):
+        category.name = "Best *Novel*"
+        category.description = "Over **40,000** words"
+        category.save()
+
+        category = Category.objects.get(pk=category.pk)
+        assert "Best <em>Novel</em>" in category.rendered_name
+        assert category.name_text == "Best Novel"
+        assert "Over <strong>40,000</strong> words" in category.rendered_description
+        assert str(category) == "Best Novel"
+
+    def test_finalist_candidate_uses_the_stored_text(self, category):
+        finalist = FinalistFactory(
+            category=category, name="*The* Book", ballot_position=1
+        )
+
+        finalist = Finalist.objects.get(pk=finalist.pk)
+        assert finalist.name_text == "The Book"
+        assert finalist.short_name_text is None
+        assert finalist.as_candidate().name == "The Book"
+
+    def test_finalist_short_name_is_preferred(self, category):
+        finalist = FinalistFactory(
+            category=category,
+            name="*The* Book, by An Author",
+            short_name="*The* Book",
+            ballot_position=1,
+        )
+
+        finalist = Finalist.objects.get(pk=finalist.pk)
+        assert "<em>The</em> Book" in finalist.rendered_short_name
+        assert finalist.as_candidate().name == "The Book"
+
+    def test_renaming_refreshes_the_stored_text(self, category):
+        finalist = FinalistFactory(category=category, name="Old", ballot_position=1)
+        finalist.name = "New"
+        finalist.save()
+
+        assert Finalist.objects.get(pk=finalist.pk).name_text == "New"
+
+
+class TestNormalizedNames:
+    def test_nominations_store_their_normalized_name(self, db):
+        cat = CategoryFactory.create(
+            fields=3,
+            field_2_used_for_canonicalization=False,
+            field_3_used_for_canonicalization=True,
+        )
+        nom = NominationFactory.create(
+            category=cat, field_1=" The Title", field_2="Author", field_3="PUB "
+        )
+
+        assert Nomination.objects.get(pk=nom.pk).normalized_name == "the title pub"
+
+    def test_bulk_writes_store_the_normalized_name(self, db, nominator):
+        cat = CategoryFactory.create(fields=1)
+        nom = NominationFactory.build(
+            category=cat, nominator=nominator, field_1="The Title"
+        )
+        (nom,) = Nomination.objects.bulk_create([nom])
+        assert Nomination.objects.get(pk=nom.pk).normalized_name == "the title"
+
+        nom.field_1 = "Another Title"
+        Nomination.objects.bulk_update([nom], ["field_1"])
+        assert Nomination.objects.get(pk=nom.pk).normalized_name == "another title"
+
+    def test_bulk_writes_load_the_categories_at_once(
+        self, db, nominator, django_assert_num_queries
+    ):
+        categories = CategoryFactory.create_batch(3, fields=1)
+        noms = [
+            NominationFactory.build(
+                category_id=category.pk, nominator=nominator, field_1=f"Title {i}"
+            )
+            for i, category in enumerate(categories * 2)
+        ]
+
+        # the categories, then the nominations
+        with django_assert_num_queries(2):
+            noms = Nomination.objects.bulk_create(noms)
+
+        for nom in noms:
+            nom.field_1 = nom.field_1.upper()
+            nom.category = Category(pk=nom.category_id)
+        Nomination.objects.bulk_update(noms, ["field_1"])
+        assert {n.normalized_name for n in Nomination.objects.all()} == {
+            f"title {i}" for i in range(6)
+        }
+
+    def test_changing_canonicalization_fields_renames_nominations(self, db):
+        cat = CategoryFactory.create(fields=2, field_2_used_for_canonicalization=False)
+        nom = NominationFactory.create(category=cat, field_1="Title", field_2="Author")
+        assert Nomination.objects.get(pk=nom.pk).normalized_name == "title"
+
+        cat.field_2_used_for_canonicalization = True
+        cat.save()
+
+        assert Nomination.objects.get(pk=nom.pk).normalized_name == "title author"
@@ -0,0 +1,154 @@
+import pytest
+
+from nomnom.nominate import factories, models, tallies
+from nomnom.nominate.admin import set_rank_valid
+from nomnom.wsfs.rules.constitution_2023 import (
+    ballots_from_category,
+    ballots_from_tallies,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(name="category")
+def make_category():
+    category = factories.CategoryFactory.create()
+    factories.FinalistFactory.create_batch(4, category=category)
+    return category
+
+
+def rank(member, finalists):
+    for position, finalist in enumerate(finalists, start=1):
+        factories.RankFactory.create(
+            membership=member, finalist=finalist, position=position
+        )
+
+
+def signature(finalists) -> str:
+    return tallies.signature(f.pk for f in finalists)
+
+
+def category_tallies(category) -> dict[str, int]:
+    return dict(
+        models.RankingTally.objects.filter(category=category).values_list(
+            "signature", "count"
+        )
+    )
+
+
+@pytest.fixture(name="ranked")
+def make_ranked(category):
+    a, b, c, d = category.finalist_set.all()
+    for _ in range(3):
+        rank(factories.NominatingMemberProfileFactory.create(), [a, b, c])
+    rank(factories.NominatingMemberProfileFactory.create(), [d, a])
+    return a, b, c, d
+
+
+def test_saving_ranks_tallies_them(category, ranked):
+    a, b, c, d = ranked
+
+    assert category_tallies(category) == {
+        signature([a, b, c]): 3,
+        signature([d, a]): 1,
+    }
+
+
+def test_deleting_a_rank_moves_the_tally(category, ranked):
+    a, b, c, d = ranked
+
+    models.Rank.objects.get(finalist=d).delete()
+
+    assert category_tallies(category) == {
+        signature([a, b, c]): 3,
+        signature([a]): 1,
+    }
+
+
+@pytest.mark.parametrize("members", [5, 40])
+def test_deleting_a_finalist_s_ranks_takes_a_bounded_number_of_queries(
+    category, members, django_assert_max_num_queries
+):
+    a, b, *_ = category.finalist_set.all()
+    for _ in range(members):
+        rank(factories.NominatingMemberProfileFactory.create(), [a, b])
+    for ranked in models.Rank.objects.filter(finalist=b):
+        models.RankAdminData.objects.create(rank=ranked)
+
+    with django_assert_max_num_queries(20):
+        models.Rank.objects.filter(finalist=b).delete()
+        b.delete()
+
+    assert category_tallies(category) == {signature([a]): members}
+
+
+def test_invalidating_ranks_removes_them_from_the_tally(category, ranked):
+    a, b, c, d = ranked
+
+    set_rank_valid(models.Rank.objects.filter(finalist=d), False)
+    assert category_tallies(category) == {
+        signature([a, b, c]): 3,
+        signature([a]): 1,
+    }
+
+    set_rank_valid(models.Rank.objects.filter(finalist=d), True)
+    assert category_tallies(category) == {
+        signature([a, b, c]): 3,
+        signature([d, a]): 1,
+    }
+
+
+def test_refreshing_twice_changes_nothing(category, ranked):
+    before = category_tallies(category)
+
+    member_ids = models.Rank.objects.values_list("membership_id", flat=True)
+    tallies.refresh_rankings(member_ids, [category.pk])
+    tallies.refresh_rankings(member_ids, [category.pk])
+
+    assert category_tallies(category) == before
+
+
+def test_rebuilding_matches_the_maintained_tallies(category, ranked):
+    before = category_tallies(category)
+
+    tallies.rebuild_tallies([category.pk])
+
+    assert category_tallies(category) == before
+
+
+@pytest.mark.django_db(transaction=True)
+def test_ranks_saved_outside_a_transaction_are_tallied(category):
+    a, b, *_ = category.finalist_set.all()
+
+    rank(factories.NominatingMemberProfileFactory.create(), [a, b])
+
+    assert category_tallies(category) == {signature([a, b]): 1}
+
+
+def test_bulk_changes_are_tallied_once_done(category, ranked):
+    a, b, c, d = ranked
+
+    with tallies.updating_tallies([category.pk]):
+        models.Rank.objects.filter(finalist=a).delete()
+        assert category_tallies(category)[signature([a, b, c])] == 3
+
+    assert category_tallies(category) == {
+        signature([b, c]): 3,
+        signature([d]): 1,
+    }
+
+
+def test_ballots_from_tallies_match_the_ranks(category, ranked):
+    def rankings(election_ballots):
+        return sorted(
+            tuple(c.name for c in ballot.ranked_candidates)
+            for ballot in election_ballots.ballots
+        )
+
+    a, *_ = ranked
+    assert rankings(ballots_from_tallies(category)) == rankings(
+        ballots_from_category(category)
+    )
+    assert rankings(ballots_from_tallies(category, excluded_finalists=[a])) == (
+        rankings(ballots_from_category(category, excluded_finalists=[a]))
+    )
@@ -1,4 +1,5 @@
 import itertools
+import uuid
 from collections.abc import Iterable
 from unittest import mock
 
@@ -8,8 +9,11 @@ from django.contrib.messages import get_messages
 from django.core import mail
 from django.test import TestCase
 from django.urls import reverse
+from django.utils import timezone
 
-from nomnom.nominate import factories, models
+from nomnom.canonicalize.factories import WorkFactory
+from nomnom.canonicalize.models import CanonicalizedNomination
+from nomnom.nominate import factories, models, submissions
 
 pytestmark = pytest.mark.usefixtures("db")
 
@@ -338,6 +342,62 @@ class NominationViewInvariants(TestCase):
         assert response.status_code == self.success_status_code
         assert models.Nomination.objects.count() == 4
 
+    def test_repeated_submission_is_not_saved_again(self):
+        key = str(uuid.uuid4())
+        data = {"submission_key": key, **field_data(self.c1, 0, "title 1", "a 1")}
+        response = self.submit_nominations(data)
+        assert response.status_code == self.success_status_code
+        saved = models.Nomination.objects.get()
+
+        data = {"submission_key": key, **field_data(self.c1, 0, "title 2", "a 2")}
+        response = self.submit_nominations(data)
+
+        assert response.status_code == self.success_status_code
+        assert list(models.Nomination.objects.all()) == [saved]
+        assert models.BallotSubmission.objects.filter(key=key).count() == 1
+
+    def test_rejected_submission_can_be_sent_again(self):
+        key = str(uuid.uuid4())
+        data = {"submission_key": key, **field_data(self.c1, 0, "title 1", "")}
+        response = self.submit_nominations(data)
+        assert response.status_code == 200
+        assert not models.BallotSubmission.objects.filter(key=key).exists()
+
+        data = {"submission_key": key, **field_data(self.c1, 0, "title 1", "a 1")}
+        response = self.submit_nominations(data)
+
+        assert response.status_code == self.success_status_code
+        assert models.Nomination.objects.get().field_2 == "a 1"
+
+    def test_expired_submission_keys_are_dropped(self):
+        expired = models.BallotSubmission.objects.create(
+            election=self.election, member=self.nominating_profile, key=uuid.uuid4()
+        )
+        models.BallotSubmission.objects.filter(pk=expired.pk).update(
+            submitted_at=timezone.now() - submissions.SUBMISSION_KEY_LIFETIME * 2
+        )
+
+        data = {
+            "submission_key": str(uuid.uuid4()),
+            **field_data(self.c1, 0, "title 1", "a 1"),
+        }
+        self.submit_nominations(data)
+
+        assert not models.BallotSubmission.objects.filter(pk=expired.pk).exists()
+        assert (
+            models.BallotSubmission.objects.filter(
+                member=self.nominating_profile
+            ).count()
+            == 1
+        )
+
+    def test_submission_keys_are_fresh_for_each_form(self):
+        self.client.force_login(self.user)
+        first = self.client.get(self.view_url()).context_data["submission_key"]
+        second = self.client.get(self.view_url()).context_data["submission_key"]
+
+        assert first != second
+
     def test_order_of_values_is_preserved(self):
         data = field_data(self.c1, 0, "title 1", "author 1")
         data.update(field_data(self.c1, 1, "title 2", "author 2"))
@@ -349,6 +409,34 @@ class NominationViewInvariants(TestCase):
         assert self.nominating_profile.nomination_set.first().field_1 == "title 1"
         assert self.nominating_profile.nomination_set.last().field_1 == "title 3"
 
+    def test_resubmitting_keeps_unchanged_nominations(self):
+        data = field_data(self.c1, 0, "title 1", "author 1")
+        data.update(field_data(self.c1, 1, "title 2", "author 2"))
+        self.submit_nominations(data)
+        kept = models.Nomination.objects.get(field_1="title 1")
+
+        data.update(field_data(self.c1, 1, "title 3", "author 3"))
+        response = self.submit_nominations(data)
+
+        assert response.status_code == self.success_status_code
+        assert sorted(
+            self.nominating_profile.nomination_set.values_list("field_1", flat=True)
+        ) == ["title 1", "title 3"]
+        assert models.Nomination.objects.filter(pk=kept.pk).exists()
+
+    def test_resubmitting_keeps_canonicalization_links(self):
+        data = field_data(self.c1, 0, "title 1", "author 1")
+        self.submit_nominations(data)
+        nomination = models.Nomination.objects.get()
+        work = WorkFactory.create(category=self.c1)
+        CanonicalizedNomination.objects.create(work=work, nomination=nomination)
+
+        data.update(field_data(self.c2, 0, "title 2", "author 2"))
+        self.submit_nominations(data)
+
+        assert models.Nomination.objects.count() == 2
+        assert models.Nomination.objects.get(pk=nomination.pk).work == work
+
 
 class TestNominationViewFull(NominationViewInvariants, NominationViewSubmitMixin):
     __test__ = True
@@ -586,6 +674,23 @@ class TestNominationViewOnCommit(TestCase):
         assert response.status_code == 302
         assert delay.called
 
+    def test_resubmitting_only_links_changed_nominations(self):
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.view_url(), data=self.valid_data())
+        first = models.Nomination.objects.get()
+
+        data = self.valid_data()
+        data.update(field_data(self.c1, 1, "t2", "a2"))
+        with mock.patch(
+            "nomnom.nominate.tasks.link_nominations_to_works.delay"
+        ) as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(self.view_url(), data=data)
+
+        second = models.Nomination.objects.exclude(pk=first.pk).get()
+        delay.assert_called_once_with([second.pk])
+
     def test_submitting_runs_post_save_hook(self):
         self.client.force_login(self.user)
         with self.captureOnCommitCallbacks(execute=True):
@@ -595,6 +700,160 @@ class TestNominationViewOnCommit(TestCase):
         assert any("Your set of nominations was saved" in m for m in messages)
 
 
+class TestNominationViewQueries(TestCase):
+    """The ballot page reads the member's ballot once, however big it is."""
+
+    def setup_method(self, test_method):
+        self.election = factories.ElectionFactory.create(state="nominating")
+        self.member = factories.NominatingMemberProfileFactory.create()
+        self.user = self.member.user
+        self.user.user_permissions.add(
+            Permission.objects.get(
+                codename="nominate", content_type__app_label="nominate"
+            )
+        )
+
+    def view_url(self):
+        return reverse("election:nominate", kwargs={"election_id": self.election.slug})
+
+    def add_category(self, nominations: int):
+        category = factories.CategoryFactory.create(election=self.election, fields=2)
+        factories.NominationFactory.create_batch(
+            nominations, category=category, nominator=self.member
+        )
+
+    def test_get_query_count_is_fixed(self):
+        self.client.force_login(self.user)
+        self.add_category(nominations=1)
+        # warm the caches that aren't per-request, like waffle's switches
+        self.client.get(self.view_url())
+
+        # session, user, election, profile, 2x permissions, categories, nominations,
+        # admin message
+        with self.assertNumQueries(9):
+            response = self.client.get(self.view_url())
+        assert response.status_code == 200
+
+        for _ in range(4):
+            self.add_category(nominations=5)
+
+        with self.assertNumQueries(9):
+            response = self.client.get(self.view_url())
+        assert response.status_code == 200
+        assert len(response.context_data["nominations"]) == 5
+        assert response.context_data["most_recent"] == (
+            models.Nomination.objects.latest("nomination_date").nomination_date
+        )
+
+
+class TestNominationViewCategorySave(TestCase):
+    """Saving one category of the ballot with "save as you go" writes and re-renders
+    only that category.
+    """
+
+    def setup_method(self, test_method):
+        self.election = factories.ElectionFactory.create(state="nominating")
+        self.member = factories.NominatingMemberProfileFactory.create()
+        self.user = self.member.user
+        self.user.user_permissions.add(
+            Permission.objects.get(
+                codename="nominate", content_type__app_label="nominate"
+            )
+        )
+        self.c1 = factories.CategoryFactory.create(
+            election=self.election, fields=2, ballot_position=1
+        )
+        self.c2 = factories.CategoryFactory.create(
+            election=self.election, fields=2, ballot_position=2
+        )
+
+    def view_url(self):
+        return reverse("election:nominate", kwargs={"election_id": self.election.slug})
+
+    def save_category(self, category, data):
+        self.client.force_login(self.user)
+        return self.client.post(
+            self.view_url(),
+            data={"save_category": category.id, **data},
+            headers={"HX-Request": "true"},
+        )
+
+    def test_saving_a_category_leaves_the_others_alone(self):
+        other = factories.NominationFactory.create(
+            category=self.c2, nominator=self.member
+        )
+
+        response = self.save_category(self.c1, field_data(self.c1, 0, "t1", "a1"))
+
+        assert response.status_code == 200
+        assert models.Nomination.objects.filter(pk=other.pk).exists()
+        assert self.member.nomination_set.filter(category=self.c1).get().field_1 == (
+            "t1"
+        )
+
+    def test_saving_a_category_renders_only_that_category(self):
+        response = self.save_category(self.c1, field_data(self.c1, 0, "t1", "a1"))
+
+        content = response.content.decode()
+        assert f'id="category_{self.c1.id}"' in content
+        assert f'id="category_{self.c2.id}"' not in content
+        assert "nominating_ballot" not in content
+
+    def test_saving_an_invalid_category_does_not_save(self):
+        response = self.save_category(self.c1, field_data(self.c1, 0, "t1", ""))
+
+        assert response.status_code == 200
+        assert "is-invalid" in response.content.decode()
+        assert models.Nomination.objects.count() == 0
+
+    def test_repeated_category_save_is_not_saved_again(self):
+        key_field = submissions.category_key_field(self.c1)
+        key = str(uuid.uuid4())
+        self.save_category(
+            self.c1, {key_field: key, **field_data(self.c1, 0, "t1", "a1")}
+        )
+        saved = models.Nomination.objects.get()
+
+        response = self.save_category(
+            self.c1, {key_field: key, **field_data(self.c1, 0, "t2", "a2")}
+        )
+
+        assert response.status_code == 200
+        assert list(models.Nomination.objects.all()) == [saved]
+        assert 'value="t1"' in response.content.decode()
+        assert models.BallotSubmission.objects.filter(key=key).count() == 1
+
+    def test_saving_a_category_renders_a_fresh_key(self):
+        key_field = submissions.category_key_field(self.c1)
+        key = str(uuid.uuid4())
+
+        response = self.save_category(
+            self.c1, {key_field: key, **field_data(self.c1, 0, "t1", "a1")}
+        )
+
+        content = response.content.decode()
+        assert f'name="{key_field}"' in content
+        assert key not in content
+
+    def test_saving_a_category_and_emailing_sends_the_ballot(self):
+        with mock.patch("nomnom.nominate.tasks.send_ballot.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.save_category(
+                    self.c1,
+                    {"save_and_email": "", **field_data(self.c1, 0, "t1", "a1")},
+                )
+
+        delay.assert_called_once_with(self.election.id, self.member.id)
+
+    def test_saving_a_category_from_another_election_is_not_found(self):
+        elsewhere = factories.CategoryFactory.create(fields=2)
+
+        response = self.save_category(elsewhere, field_data(elsewhere, 0, "t1", "a1"))
+
+        assert response.status_code == 404
+        assert models.Nomination.objects.count() == 0
+
+
 class TestNominationViewClosed(TestCase):
     """When a member with nominating rights POSTs to an election whose
     nominations have closed, the view rejects the submission with an error
@@ -1,3 +1,4 @@
+import uuid
 from itertools import chain
 from typing import Protocol, cast
 
@@ -176,6 +177,68 @@ def test_submitting_clears_blank_ranks(c1, member, submit_votes: Submit):
     assert models.Rank.objects.count() == 4
 
 
+def tallies(category: models.Category) -> dict[str, int]:
+    return dict(
+        models.RankingTally.objects.filter(category=category).values_list(
+            "signature", "count"
+        )
+    )
+
+
+@with_submitters
+def test_submitting_votes_tallies_the_ranking(c1, member, submit_votes: Submit):
+    submit_votes(basic_ranks(c1))
+
+    finalist_ids = c1.finalist_set.values_list("id", flat=True)
+    assert tallies(c1) == {",".join(map(str, finalist_ids)): 1}
+
+
+@with_submitters
+def test_resubmitting_votes_moves_the_tally(c1, member, submit_votes: Submit):
+    submit_votes(basic_ranks(c1))
+
+    ranks = basic_ranks(c1)
+    last = c1.finalist_set.last()
+    del ranks[f"{c1.id}_{last.id}"]
+    submit_votes(ranks)
+
+    finalist_ids = c1.finalist_set.exclude(pk=last.pk).values_list("id", flat=True)
+    assert tallies(c1) == {",".join(map(str, finalist_ids)): 1}
+
+
+@with_submitters
+def test_repeated_submission_is_not_saved_again(c1, member, submit_votes: Submit):
+    key = str(uuid.uuid4())
+    ranks = basic_ranks(c1)
+    response = submit_votes({"submission_key": key, **ranks})
+    assert response.status_code == submit_votes.success_status_code
+
+    first = c1.finalist_set.first()
+    del ranks[f"{c1.id}_{first.id}"]
+    response = submit_votes({"submission_key": key, **ranks})
+
+    assert response.status_code == submit_votes.success_status_code
+    assert models.Rank.objects.filter(membership=member).count() == (
+        c1.finalist_set.count()
+    )
+
+
+@with_submitters
+def test_rejected_submission_can_be_sent_again(
+    c1, member, duplicate_ranks, submit_votes: Submit
+):
+    key = str(uuid.uuid4())
+    submit_votes({"submission_key": key, **duplicate_ranks})
+    assert not models.Rank.objects.filter(membership=member).exists()
+
+    response = submit_votes({"submission_key": key, **basic_ranks(c1)})
+
+    assert response.status_code == submit_votes.success_status_code
+    assert models.Rank.objects.filter(membership=member).count() == (
+        c1.finalist_set.count()
+    )
+
+
 @pytest.fixture
 def duplicate_ranks(c1):
     ranks = basic_ranks(c1)
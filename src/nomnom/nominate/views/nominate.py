@@ -1,5 +1,7 @@
-from collections.abc import Callable
+from collections import defaultdict
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
+from datetime import datetime
 from itertools import groupby
 from operator import attrgetter
 from typing import TYPE_CHECKING, Any
@@ -11,15 +13,18 @@ from django.contrib.auth.decorators import (
 )
 from django.core.exceptions import PermissionDenied
 from django.db import transaction
-from django.http import HttpRequest, HttpResponse
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.http import Http404, HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
+from django.template.loader import render_to_string
 from django.template.response import TemplateResponse
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext as _
 from ipware import get_client_ip
 from render_block import render_block_to_string
 
-from nomnom.nominate import models
+from nomnom.nominate import models, submissions
 
 if TYPE_CHECKING:
     from django_stubs_ext import _AnyUser as UserModel
@@ -47,30 +52,78 @@ def require_profile(user: UserModel) -> models.NominatingMemberProfile:
         raise PermissionDenied("You do not have a nominating profile.")
 
 
+@dataclass(frozen=True)
+class BallotSnapshot:
+    """A member's nominating ballot in an election, read once per request.
+
+    The page context, the form's initial data and the time of the latest change are
+    all derived from it.
+    """
+
+    election: models.Election
+    profile: models.NominatingMemberProfile
+    categories: list[models.Category]
+    nominations: list[models.Nomination]
+
+    @classmethod
+    def load(
+        cls,
+        election: models.Election,
+        profile: models.NominatingMemberProfile,
+        categories: list[models.Category] | None = None,
+    ) -> "BallotSnapshot":
+        if categories is None:
+            categories = list(models.Category.objects.filter(election=election))
+        categories_by_id = {c.pk: c for c in categories}
+
+        nominations = list(
+            models.Nomination.objects.filter(
+                nominator=profile, category__in=categories_by_id
+            )
+            .prefetch_related(None)
+            .order_by("category__ballot_position", "category_id", "id")
+        )
+        for nomination in nominations:
+            nomination.category = categories_by_id[nomination.category_id]
+            nomination.nominator = profile
+
+        return cls(election, profile, categories, nominations)
+
+    @property
+    def nominations_by_category(
+        self,
+    ) -> dict[models.Category, list[models.Nomination]]:
+        return {
+            category: list(nominations)
+            for category, nominations in groupby(
+                self.nominations, attrgetter("category")
+            )
+        }
+
+    @property
+    def most_recent(self) -> datetime | None:
+        return max((n.nomination_date for n in self.nominations), default=None)
+
+
 def build_nominating_context(
-    election: models.Election,
-    profile: models.NominatingMemberProfile,
-    form: NominationForm,
+    snapshot: BallotSnapshot, form: NominationForm
 ) -> dict[str, Any]:
-    nomination_groups = groupby(
-        profile.nomination_set.filter(category__election=election),
-        attrgetter("category"),
-    )
-    nominations = {cat: list(noms) for cat, noms in nomination_groups}
+    nominations = snapshot.nominations_by_category
 
     context: dict[str, Any] = {
-        "election": election,
-        "categories": models.Category.objects.filter(election=election),
+        "election": snapshot.election,
+        "categories": snapshot.categories,
         "nominations": nominations,
         "form": form,
     }
 
+    context[submissions.SUBMISSION_KEY] = submissions.new_submission_key()
+    context["category_submission_keys"] = {
+        category.pk: submissions.new_submission_key() for category in form.categories
+    }
+
     if nominations:
-        context["most_recent"] = (
-            profile.nomination_set.filter(category__election=election)
-            .latest("nomination_date")
-            .nomination_date
-        )
+        context["most_recent"] = snapshot.most_recent
 
     return context
 
@@ -86,13 +139,9 @@ def get_template_name(election: models.Election, user: UserModel) -> str:
         return "nominate/election_closed.html"
 
 
-def initial_nomination_form(
-    election: models.Election,
-    profile: models.NominatingMemberProfile,
-) -> NominationForm:
+def initial_nomination_form(snapshot: BallotSnapshot) -> NominationForm:
     return NominationForm(
-        categories=list(models.Category.objects.filter(election=election)),
-        queryset=profile.nomination_set.filter(category__election=election),
+        categories=snapshot.categories, nominations=snapshot.nominations
     )
 
 
@@ -105,6 +154,91 @@ def submitted_nomination_form(
     )
 
 
+def save_ballot_changes(
+    profile: models.NominatingMemberProfile,
+    categories: Iterable[models.Category],
+    nominations: list[models.Nomination],
+    ip_address: str | None,
+) -> list[int]:
+    """Make *nominations* the member's ballot in *categories*, touching only the rows
+    that changed.
+
+    Stored nominations that were submitted again are left alone, along with their
+    canonicalization links and admin data. Stored nominations that weren't are reused
+    for the new ones in the same category where nothing else refers to them, and
+    deleted otherwise; anything left over is inserted.
+
+    Returns the IDs of the nominations that were inserted or rewritten, which are the
+    ones that need linking to works.
+    """
+    stored = (
+        models.Nomination.objects.filter(nominator=profile, category__in=categories)
+        .prefetch_related(None)
+        .annotate(
+            referenced=ExpressionWrapper(
+                Q(canonicalizednomination__isnull=False) | Q(admin__isnull=False),
+                output_field=BooleanField(),
+            )
+        )
+        .order_by("id")
+        .values_list("id", "category_id", "field_1", "field_2", "field_3", "referenced")
+    )
+
+    unchanged: defaultdict[tuple, list[tuple[int, bool]]] = defaultdict(list)
+    for pk, category_id, field_1, field_2, field_3, referenced in stored:
+        unchanged[category_id, field_1, field_2, field_3].append((pk, referenced))
+
+    changed: list[models.Nomination] = []
+    for nomination in nominations:
+        key = (
+            nomination.category_id,
+            nomination.field_1,
+            nomination.field_2,
+            nomination.field_3,
+        )
+        if unchanged[key]:
+            unchanged[key].pop(0)
+        else:
+            changed.append(nomination)
+
+    reusable: defaultdict[int, list[int]] = defaultdict(list)
+    removed: list[int] = []
+    for (category_id, *_fields), rows in unchanged.items():
+        for pk, referenced in rows:
+            (removed if referenced else reusable[category_id]).append(pk)
+
+    now = timezone.now()
+    updated: list[models.Nomination] = []
+    created: list[models.Nomination] = []
+    for nomination in changed:
+        nomination.nominator = profile
+        nomination.nomination_ip_address = ip_address
+        if reusable[nomination.category_id]:
+            nomination.pk = reusable[nomination.category_id].pop(0)
+            nomination.nomination_date = now
+            updated.append(nomination)
+        else:
+            created.append(nomination)
+    removed.extend(pk for pks in reusable.values() for pk in pks)
+
+    if removed:
+        models.Nomination.objects.filter(pk__in=removed).delete()
+    if updated:
+        models.Nomination.objects.bulk_update(
+            updated,
+            [
+                "field_1",
+                "field_2",
+                "field_3",
+                "nomination_date",
+                "nomination_ip_address",
+            ],
+        )
+    created = models.Nomination.objects.bulk_create(created)
+
+    return [n.pk for n in updated + created]
+
+
 def member_post_save_hook(
     request: HttpRequest, flow: BallotFlow, did_email: bool = False
 ) -> None:
@@ -133,15 +267,17 @@ def _ballot(request: HttpRequest, flow: BallotFlow) -> HttpResponse:
     if request.method == "POST":
         return _submit_ballot(request, flow)
 
-    form = initial_nomination_form(flow.election, flow.profile)
-    context = build_nominating_context(flow.election, flow.profile, form)
+    snapshot = BallotSnapshot.load(flow.election, flow.profile)
+    form = initial_nomination_form(snapshot)
+    context = build_nominating_context(snapshot, form)
     return TemplateResponse(request, flow.template_name, context)
 
 
 def _render_form_block(
     request: HttpRequest, flow: BallotFlow, form: NominationForm
 ) -> HttpResponse:
-    context = build_nominating_context(flow.election, flow.profile, form)
+    snapshot = BallotSnapshot.load(flow.election, flow.profile, form.categories)
+    context = build_nominating_context(snapshot, form)
     return HttpResponse(
         render_block_to_string(
             flow.template_name,
@@ -167,6 +303,19 @@ def _submit_ballot(request: HttpRequest, flow: BallotFlow) -> HttpResponse:
             )
         return redirect("election:index")
 
+    # one save of a member's ballot at a time; a repeat of one that was already saved
+    # gets the saved ballot back.
+    submissions.lock_ballot(election, profile)
+
+    if "save_category" in request.POST:
+        return _submit_category(request, flow)
+
+    if submissions.is_replay(request, election, profile):
+        if request.htmx:
+            form = initial_nomination_form(BallotSnapshot.load(election, profile))
+            return _render_form_block(request, flow, form)
+        return _redirect_to_ballot(request, election)
+
     form = submitted_nomination_form(request, election)
 
     if not form.is_valid():
@@ -174,36 +323,45 @@ def _submit_ballot(request: HttpRequest, flow: BallotFlow) -> HttpResponse:
         if request.htmx:
             return _render_form_block(request, flow, form)
 
-        context = build_nominating_context(election, profile, form)
+        snapshot = BallotSnapshot.load(election, profile, form.categories)
+        context = build_nominating_context(snapshot, form)
         return TemplateResponse(request, flow.template_name, context)
 
     client_ip_address, _ignored = get_client_ip(request=request)
-    should_email = "save_and_email" in request.POST
-
-    # first, we clear all of the existing nominations for this user and election; they've
-    # submitted a new ballot, so we're going to start from scratch.
-    profile.nomination_set.filter(category__election=election).delete()
 
-    # now, we're going to iterate through the formsets and save the nominations
-    for nomination in form.cleaned_data["nominations"]:
-        nomination.nominator = profile
-        nomination.nomination_ip_address = client_ip_address
-    nominations = models.Nomination.objects.bulk_create(
-        form.cleaned_data["nominations"]
+    # only the nominations that changed since the last save are written; the rest keep
+    # their IDs and their links to works.
+    changed_ids = save_ballot_changes(
+        profile, form.categories, form.cleaned_data["nominations"], client_ip_address
     )
+    submissions.record_submission(request, election, profile)
+    _on_ballot_saved(request, flow, changed_ids)
+
+    if request.htmx:
+        return _render_form_block(request, flow, form)
+
+    return _redirect_to_ballot(request, election)
+
+
+def _on_ballot_saved(
+    request: HttpRequest, flow: BallotFlow, changed_ids: list[int]
+) -> None:
+    should_email = "save_and_email" in request.POST
 
     def on_commit_callback():
-        link_nominations_to_works.delay([n.pk for n in nominations])
+        if changed_ids:
+            link_nominations_to_works.delay(changed_ids)
         if should_email:
-            send_ballot.delay(election.id, profile.id)
+            send_ballot.delay(flow.election.id, flow.profile.id)
 
         flow.on_saved(request, flow, should_email)
 
     transaction.on_commit(on_commit_callback)
 
-    if request.htmx:
-        return _render_form_block(request, flow, form)
 
+def _redirect_to_ballot(
+    request: HttpRequest, election: models.Election
+) -> HttpResponse:
     # Kind of hacky but works - the place on the page is passed in the submit
     category_saved = request.POST.get("save_all", None)
     url = reverse(
@@ -214,6 +372,62 @@ def _submit_ballot(request: HttpRequest, flow: BallotFlow) -> HttpResponse:
     return redirect(f"{url}{anchor}")
 
 
+def _render_category_block(
+    request: HttpRequest, category: models.Category, form: NominationForm
+) -> HttpResponse:
+    context = {
+        "category": category,
+        "fieldset_list": form.fieldsets_grouped_by_category[category],
+        "form": form,
+        "category_submission_keys": {category.pk: submissions.new_submission_key()},
+    }
+    return HttpResponse(
+        render_to_string(
+            "nominate/bits/ballot_category.html", context=context, request=request
+        )
+    )
+
+
+def _submit_category(request: HttpRequest, flow: BallotFlow) -> HttpResponse:
+    """Save the nominations for one category of the ballot.
+
+    Only that category's fields are posted, validated and written, and only its block
+    of the form is rendered in reply. The rest of the ballot is left as it is. Like a
+    save of the whole ballot, it's made with the ballot locked, and a repeat of a save
+    that was already made gets the saved category back; the category's block carries
+    its own submission key for that.
+    """
+    category_id = request.POST["save_category"]
+    if not category_id.isdigit():
+        raise Http404("No such category")
+    category = get_object_or_404(
+        models.Category, election=flow.election, pk=int(category_id)
+    )
+
+    key_field = submissions.category_key_field(category)
+    if submissions.is_replay(request, flow.election, flow.profile, key_field):
+        snapshot = BallotSnapshot.load(flow.election, flow.profile, [category])
+        return _render_category_block(
+            request, category, initial_nomination_form(snapshot)
+        )
+
+    form = NominationForm(categories=[category], data=request.POST)
+    if not form.is_valid():
+        messages.warning(
+            request, f"Something wasn't quite right with your {category} nominations"
+        )
+        return _render_category_block(request, category, form)
+
+    client_ip_address, _ignored = get_client_ip(request=request)
+    changed_ids = save_ballot_changes(
+        flow.profile, [category], form.cleaned_data["nominations"], client_ip_address
+    )
+    submissions.record_submission(request, flow.election, flow.profile, key_field)
+    _on_ballot_saved(request, flow, changed_ids)
+
+    return _render_category_block(request, category, form)
+
+
 def admin_post_save_hook(
     request: HttpRequest, flow: BallotFlow, did_email: bool = False
 ) -> None:
@@ -1,5 +1,5 @@
 import functools
-from collections.abc import Generator
+from collections.abc import Iterator
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
@@ -16,17 +16,17 @@ from django.utils.formats import localize
 from django.utils.translation import gettext as _
 from django_svcs.apps import svcs_from
 from ipware import get_client_ip
-from pyrankvote.helpers import CandidateStatus, ElectionResults
+from pyrankvote.helpers import ElectionResults
 from render_block import render_block_to_string
 
 from nomnom.convention import HugoAwards
-from nomnom.nominate import models
+from nomnom.nominate import models, submissions, tallies
 from nomnom.nominate.decorators import user_passes_test_or_forbidden
 from nomnom.nominate.forms import RankForm
 from nomnom.nominate.hugo_awards import (
     SlantTable,
+    all_places,
     get_winners_for_election,
-    run_election,
 )
 from nomnom.nominate.tasks import send_voting_ballot
 from nomnom.nominate.templatetags import nomnom_filters
@@ -70,7 +70,10 @@ class VoteView(NominatorView):
         form = kwargs.pop("form", None)
         if form is None:
             form = self.build_ballot_forms()
-        ctx = {"form": form}
+        ctx = {
+            "form": form,
+            submissions.SUBMISSION_KEY: submissions.new_submission_key(),
+        }
         ctx.update(super().get_context_data(**kwargs))
         return ctx
 
@@ -91,6 +94,21 @@ class VoteView(NominatorView):
             )
             return redirect("election:index")
 
+        # one save of a member's ballot at a time; a repeat of one that was already
+        # saved gets the saved ballot back.
+        submissions.lock_ballot(self.election(), self.profile())
+        if submissions.is_replay(request, self.election(), self.profile()):
+            if request.htmx:
+                return HttpResponse(
+                    render_block_to_string(
+                        self.template_name,
+                        "form",
+                        context=self.get_context_data(),
+                        request=request,
+                    )
+                )
+            return redirect("election:vote", election_id=self.kwargs.get("election_id"))
+
         client_ip_address, _ = get_client_ip(request=request)
         user_agent = self.request.headers.get("user-agent")
         form = self.build_ballot_forms(request.POST)
@@ -109,32 +127,38 @@ class VoteView(NominatorView):
                     rank.rank_date = datetime.now(timezone.utc)
                     ranks_to_create.append(rank)
 
-            created_ranks = models.Rank.objects.bulk_create(
-                ranks_to_create,
-                update_conflicts=True,
-                unique_fields=["finalist", "membership"],
-                update_fields=["position", "voter_ip_address", "rank_date"],
-            )
+            category_ids = {
+                finalist.category_id for finalist in form.cleaned_data["votes"]
+            }
+            with tallies.updating_tallies(category_ids, [self.profile().pk]):
+                created_ranks = models.Rank.objects.bulk_create(
+                    ranks_to_create,
+                    update_conflicts=True,
+                    unique_fields=["finalist", "membership"],
+                    update_fields=["position", "voter_ip_address", "rank_date"],
+                )
 
-            admin_records = [
-                models.RankAdminData(
-                    rank=rank, ip_address=client_ip_address, user_agent=user_agent
+                admin_records = [
+                    models.RankAdminData(
+                        rank=rank, ip_address=client_ip_address, user_agent=user_agent
+                    )
+                    for rank in created_ranks
+                ]
+                models.RankAdminData.objects.bulk_create(
+                    admin_records,
+                    update_conflicts=True,
+                    unique_fields=["rank"],
+                    update_fields=["ip_address", "user_agent"],
                 )
-                for rank in created_ranks
-            ]
-            models.RankAdminData.objects.bulk_create(
-                admin_records,
-                update_conflicts=True,
-                unique_fields=["rank"],
-                update_fields=["ip_address", "user_agent"],
-            )
 
-            # Find all ranks that are in the ranks_to_delete list in the database
-            # using the ORM.
-            models.Rank.objects.filter(
-                finalist__in=[rank.finalist for rank in ranks_to_delete],
-                membership=self.profile(),
-            ).delete()
+                # Find all ranks that are in the ranks_to_delete list in the database
+                # using the ORM.
+                models.Rank.objects.filter(
+                    finalist__in=[rank.finalist for rank in ranks_to_delete],
+                    membership=self.profile(),
+                ).delete()
+
+            submissions.record_submission(request, self.election(), self.profile())
 
             def on_commit_callback():
                 self.post_save_hook(request)
@@ -338,45 +362,9 @@ class CategoryResultsPrettyView(ElectionView):
     def category(self):
         return get_object_or_404(models.Category, id=self.kwargs.get("category_id"))
 
-    def get_all_places(self) -> Generator[ElectionResults, None, None]:
+    def get_all_places(self) -> Iterator[ElectionResults]:
         awards = svcs_from(self.request).get(HugoAwards)
-        excluded_finalists: list[models.Finalist] = []
-        all_finalists = self.category().finalist_set.all()
-        candidate_finalists = {f.as_candidate(): f for f in all_finalists}
-
-        # we will run this at most N times, where N is the number of finalists
-        for _i in range(len(all_finalists)):
-            results = run_election(
-                awards, self.category(), excluded_finalists=excluded_finalists
-            )
-            winning_round = results.rounds[-1]
-
-            winning_votes = int(
-                sum(
-                    r.number_of_votes
-                    for r in winning_round.candidate_results
-                    if r.status == CandidateStatus.Elected
-                )
-            )
-            winners = [
-                cr.candidate
-                for cr in winning_round.candidate_results
-                if cr.status == CandidateStatus.Elected
-            ]
-
-            yield results
-
-            new_exclusions = [candidate_finalists[c] for c in winners]
-            excluded_finalists.extend(new_exclusions)
-
-            # we are done if we have excluded all finalists OR if we have stopped finding
-            # winners to exclude, or if there were no votes in the "winning" round.
-            if (
-                len(excluded_finalists) == len(all_finalists)
-                or not winners
-                or winning_votes == 0
-            ):
-                break
+        return all_places(awards, self.category())
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -44,6 +44,9 @@ NPLUSONE_RAISE = True
 
 SITE_ID = 42
 
+# the live server serves static files from here
+STATIC_URL = "/static/"
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -1 +1,2 @@
 from .constitution_2023 import eph as eph
+from .constitution_2023 import incremental_eph as incremental_eph
@@ -1,16 +1,22 @@
 import math
+from array import array
 from collections import Counter
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, replace
+from heapq import heapify, heappop, heappush
 from itertools import groupby
-from operator import attrgetter
+from operator import attrgetter, itemgetter
 from typing import Protocol
 
 import structlog
 from pyrankvote import Ballot, Candidate
 from pyrankvote.helpers import (
+    CandidateResult,
+    CandidateStatus,
     CompareMethodIfEqual,
     ElectionManager,
     ElectionResults,
+    RoundResult,
 )
 
 from nomnom.convention import HugoAwards
@@ -24,51 +30,402 @@ class ElectionBallots:
     candidates: list[Candidate]
     ballots: list[Ballot]
 
+    def without(self, candidates: Iterable[Candidate]) -> "ElectionBallots":
+        """These ballots, as if *candidates* had never been finalists.
+
+        Like `ballots_from_category` with excluded finalists, a ballot that ranked
+        nobody else is dropped.
+        """
+        excluded = set(candidates)
+        ballots = []
+        for ballot in self.ballots:
+            if excluded.isdisjoint(ballot.ranked_candidates):
+                ballots.append(ballot)
+                continue
+
+            ranking = [c for c in ballot.ranked_candidates if c not in excluded]
+            if ranking:
+                ballots.append(Ballot(ranking))
+
+        return ElectionBallots(
+            candidates=[c for c in self.candidates if c not in excluded],
+            ballots=ballots,
+        )
+
 
 type NominatingBallotType = Counter[str]
 type NominatingBallots = list[NominatingBallotType]
+# A distinct ballot, and the number of members who cast exactly that ballot
+type WeightedBallots = list[tuple[NominatingBallotType, int]]
 
 
 class NoFinalists(Exception): ...
 
 
+# Ranks are read from the database in chunks of this many rows.
+RANK_CHUNK_SIZE = 5000
+
+
 def ballots_from_category(
     category: models.Category, excluded_finalists: list[models.Finalist] | None = None
 ) -> ElectionBallots:
     exclude = excluded_finalists if excluded_finalists is not None else []
     exclude_pks = [e.pk for e in exclude]
 
-    finalist_query = category.finalist_set.exclude(pk__in=exclude_pks)
-    candidates_by_finalist = {
-        finalist: finalist.as_candidate() for finalist in finalist_query
+    candidates_by_finalist_id = {
+        finalist.pk: finalist.as_candidate()
+        for finalist in category.finalist_set.exclude(pk__in=exclude_pks)
     }
 
-    finalist_ids = [finalist.id for finalist in finalist_query]
-
-    ballots = []
+    # Only the member and finalist of each rank are read, already in ballot order, and
+    # streamed in chunks; each member's run of ranks is one ballot.
+    category_ranks = (
+        models.Rank.valid.filter(finalist_id__in=list(candidates_by_finalist_id))
+        .order_by("membership_id", "position", "id")
+        .values_list("membership_id", "finalist_id")
+        .iterator(chunk_size=RANK_CHUNK_SIZE)
+    )
+    ballots = [
+        Ballot([candidates_by_finalist_id[finalist_id] for _, finalist_id in ranks])
+        for _member_id, ranks in groupby(category_ranks, key=itemgetter(0))
+    ]
 
-    # group our ranks by nominating member, and then make a ballot for each one.
-    category_ranks = models.Rank.valid.select_related("finalist").filter(
-        finalist_id__in=finalist_ids
+    return ElectionBallots(
+        candidates=list(candidates_by_finalist_id.values()), ballots=ballots
     )
-    for member_id, ranks in groupby(
-        sorted(category_ranks, key=lambda r: r.membership_id),
-        key=attrgetter("membership_id"),
-    ):
-        ranks = sorted(ranks, key=attrgetter("position"))
-        ballot = Ballot([candidates_by_finalist[rank.finalist] for rank in ranks])
-        ballots.append(ballot)
+
+
+def ballots_from_tallies(
+    category: models.Category, excluded_finalists: list[models.Finalist] | None = None
+) -> ElectionBallots:
+    """The same ballots as `ballots_from_category`, read from the category's ranking
+    tallies: one row per distinct ranking, rather than one per rank.
+
+    Members who cast the same ranking share a single `Ballot`.
+    """
+    exclude = excluded_finalists if excluded_finalists is not None else []
+    exclude_pks = [e.pk for e in exclude]
+
+    candidates_by_finalist_id = {
+        finalist.pk: finalist.as_candidate()
+        for finalist in category.finalist_set.exclude(pk__in=exclude_pks)
+    }
+
+    ballots = []
+    tallies = models.RankingTally.objects.filter(category=category).order_by("pk")
+    for signature, count in tallies.values_list("signature", "count"):
+        ranking = [
+            candidates_by_finalist_id[finalist_id]
+            for finalist_id in map(int, signature.split(","))
+            if finalist_id in candidates_by_finalist_id
+        ]
+        if ranking:
+            ballots.extend([Ballot(ranking)] * count)
 
     return ElectionBallots(
-        candidates=list(candidates_by_finalist.values()), ballots=ballots
+        candidates=list(candidates_by_finalist_id.values()), ballots=ballots
     )
 
 
+class InstantRunoff:
+    """The state of a single-winner instant-runoff count.
+
+    Ballots with identical rankings are grouped, and each group is counted once with the
+    number of voters who cast it. Every group sits on the pile of its highest-ranked
+    candidate still in the race, so rejecting a candidate only moves the groups on that
+    candidate's pile.
+
+    This keeps the same books as pyrankvote's `ElectionManager` (which `hugo_voting` used
+    to drive), with integer counts: the round results list the candidates in the same
+    order, and ties for a place in the race are broken by the same preferences.
+    """
+
+    def __init__(self, candidates: list[Candidate], ballots: Iterable[Ballot]):
+        self.candidates = list(dict.fromkeys(candidates))
+        # pyrankvote looks this deep into the ballots to break ties
+        self.tiebreak_depth = len(candidates)
+        index = {candidate: i for i, candidate in enumerate(self.candidates)}
+
+        # Candidate hashes in Python, so group on the identity of the candidate objects
+        # and only look each distinct object up once.
+        groups: dict[tuple[int, ...], int] = {}
+        rankings: dict[tuple[int, ...], tuple[Candidate, ...]] = {}
+        for ballot in ballots:
+            key = tuple(map(id, ballot.ranked_candidates))
+            if key in groups:
+                groups[key] += 1
+            else:
+                groups[key] = 1
+                rankings[key] = ballot.ranked_candidates
+
+        indices: dict[int, int] = {}
+        for ranking in rankings.values():
+            for candidate in ranking:
+                if id(candidate) not in indices:
+                    if candidate not in index:
+                        raise ValueError(
+                            f"Ballot ranks {candidate}, who is not a candidate"
+                        )
+                    indices[id(candidate)] = index[candidate]
+        self.rankings = [tuple(map(indices.__getitem__, key)) for key in groups]
+        self.counts = list(groups.values())
+        self.ballot_count = sum(self.counts)
+
+        count = len(self.candidates)
+        self.votes = [0] * count
+        self.first_places = [0] * count
+        self.status = [CandidateStatus.Hopeful] * count
+        self.piles: list[list[int]] = [[] for _ in range(count)]
+        self.positions = [0] * len(self.rankings)
+        self.exhausted = 0
+
+        for group, (ranking, voters) in enumerate(zip(self.rankings, self.counts)):
+            if ranking:
+                self.votes[ranking[0]] += voters
+                self.first_places[ranking[0]] += voters
+                self.piles[ranking[0]].append(group)
+            else:
+                self.exhausted += voters
+
+        self.race = list(range(count))
+        self.elected: list[int] = []
+        self.rejected: list[int] = []
+        self.sort_race()
+
+    def non_exhausted_ballots(self) -> int:
+        return self.ballot_count - self.exhausted
+
+    def elect(self, candidate: int) -> None:
+        self.status[candidate] = CandidateStatus.Elected
+        self.elected.append(candidate)
+        self.race.remove(candidate)
+
+    def reject(self, candidate: int) -> None:
+        self.status[candidate] = CandidateStatus.Rejected
+        self.rejected.append(candidate)
+        self.race.remove(candidate)
+
+    def transfer(self, candidate: int) -> bool:
+        """Move a rejected candidate's groups to their next choices still in the race.
+
+        Returns whether any votes moved."""
+        if self.votes[candidate] == 0:
+            return False
+
+        status, piles, votes = self.status, self.piles, self.votes
+        for group in piles[candidate]:
+            ranking = self.rankings[group]
+            # everyone ranked above the current choice is already out of the race
+            position = self.positions[group] + 1
+            while (
+                position < len(ranking)
+                and status[ranking[position]] != CandidateStatus.Hopeful
+            ):
+                position += 1
+            self.positions[group] = position
+
+            if position < len(ranking):
+                votes[ranking[position]] += self.counts[group]
+                piles[ranking[position]].append(group)
+            else:
+                self.exhausted += self.counts[group]
+
+        votes[candidate] = 0
+        piles[candidate] = []
+        return True
+
+    def sort_race(self) -> None:
+        """Order the race by votes, most first.
+
+        Candidates tied on votes are ordered by how many ballots rank them second among
+        the candidates still in the race, then third, and so on."""
+        votes = self.votes
+        race = sorted(self.race, key=lambda c: -votes[c])
+
+        tied = set()
+        for previous, candidate in zip(race, race[1:]):
+            if votes[previous] == votes[candidate]:
+                tied.update((previous, candidate))
+        if tied:
+            depth = self.tiebreak_depth
+            preferences = {c: [0] * depth for c in tied}
+            for ranking, voters in zip(self.rankings, self.counts):
+                hopeful = [
+                    c for c in ranking if self.status[c] == CandidateStatus.Hopeful
+                ]
+                for place in range(1, min(len(hopeful), depth)):
+                    if hopeful[place] in preferences:
+                        preferences[hopeful[place]][place] -= voters
+            race.sort(key=lambda c: (-votes[c], preferences.get(c, ())))
+
+        self.race = race
+
+    def round_result(self) -> RoundResult:
+        return RoundResult(
+            [
+                CandidateResult(
+                    self.candidates[c], float(self.votes[c]), self.status[c]
+                )
+                for c in self.elected + self.race + self.rejected[::-1]
+            ],
+            float(self.exhausted),
+        )
+
+    def runoff_result(
+        self, winners: list[Candidate], runoff_candidate: Candidate
+    ) -> RoundResult:
+        """Tally the winners against *runoff_candidate*, on every ballot's ranking of them."""
+        runoff = list(dict.fromkeys([*winners, runoff_candidate]))
+        index = {candidate: i for i, candidate in enumerate(self.candidates)}
+        runoff_ids = {index[c]: c for c in runoff if c in index}
+
+        votes = {candidate: 0 for candidate in runoff}
+        blank = 0
+        for ranking, voters in zip(self.rankings, self.counts):
+            choice = next((c for c in ranking if c in runoff_ids), None)
+            if choice is None:
+                blank += voters
+            else:
+                votes[runoff_ids[choice]] += voters
+
+        if (
+            runoff_candidate not in winners
+            and votes[runoff_candidate] > votes[winners[0]]
+        ):
+            elected = [runoff_candidate]
+            rejected = winners
+        else:
+            elected = winners
+            rejected = [] if runoff_candidate in winners else [runoff_candidate]
+
+        return RoundResult(
+            [
+                CandidateResult(candidate, float(votes[candidate]), status)
+                for candidates, status in (
+                    (elected, CandidateStatus.Elected),
+                    (rejected[::-1], CandidateStatus.Rejected),
+                )
+                for candidate in candidates
+            ],
+            float(blank),
+        )
+
+
 def hugo_voting(
     candidates: list[Candidate],
     ballots: list[Ballot],
     runoff_candidate: Candidate | None = None,
 ) -> ElectionResults:
+    """Count the final ballot for one category by instant runoff.
+
+    The count is run on an `InstantRunoff`, and produces the same results as
+    `pyrankvote_hugo_voting`."""
+    if runoff_candidate is None:
+        maybe_no_award = [c for c in candidates if c.name.lower() == "no award"]
+        if maybe_no_award:
+            runoff_candidate = maybe_no_award[0]
+
+    count = InstantRunoff(candidates, ballots)
+    results = ElectionResults()
+    winners_allowed = 1
+
+    while True:
+        log = logger.bind(round=len(results.rounds) + 1)
+
+        # the race is kept sorted by votes, most first
+        finalists = list(count.race)
+        if not finalists:
+            raise NoFinalists("Cannot run an election with no finalists")
+
+        majority_threshold = math.ceil(count.non_exhausted_ballots() / 2)
+        log.debug(
+            "Starting round",
+            finalists=len(finalists),
+            majority_threshold=majority_threshold,
+        )
+
+        finalists_to_elect = [
+            c for c in finalists if count.votes[c] >= majority_threshold
+        ]
+
+        # * reject the finalist with the fewest votes.
+        # * if there are multiple candidates with the same number of votes,
+        #   reject the one that had the fewest original first place votes.
+        # * if there are multiple candidates tied for fewest votes and
+        #   fewest first place votes, reject them all.
+        fewest_votes = all_min(finalists, key=lambda c: count.votes[c])
+        first_place_tiebreak = all_min(
+            fewest_votes, key=lambda c: count.first_places[c]
+        )
+        finalists_to_reject = [
+            c for c in first_place_tiebreak if c not in finalists_to_elect
+        ]
+
+        # if we have reached this point and all of the candidates have been rejected,
+        # then the rules are that these remaining candidates, if they don't meet the
+        # majority threshold, still have to go into a runoff against No Award.
+        if len(finalists_to_elect) == 0 and len(finalists_to_reject) == len(finalists):
+            finalists_to_reject = []
+            finalists_to_elect = list(finalists)
+            log.debug("Tie would reject all finalists. Punting to runoff")
+
+        for finalist in finalists_to_elect:
+            count.elect(finalist)
+
+        # reject finalists in reverse order, as pyrankvote's results list them
+        for finalist in finalists_to_reject[::-1]:
+            count.reject(finalist)
+
+        # If we leave that loop with only one finalist remaining, they win
+        seats_left = winners_allowed - len(count.elected)
+        if len(count.race) <= seats_left:
+            for finalist in list(count.race):
+                finalists_to_elect.append(finalist)
+                count.elect(finalist)
+
+        # if we've run out of winner slots (1), nobody else can win
+        if seats_left <= 0:
+            for finalist in count.race[::-1]:
+                finalists_to_reject.append(finalist)
+                count.reject(finalist)
+
+        results.register_round_results(count.round_result())
+        log.debug(
+            "Round complete",
+            elected=len(finalists_to_elect),
+            rejected=len(finalists_to_reject),
+        )
+
+        if not count.race:
+            break
+
+        # transfer votes from rejected finalists to the remaining ones.
+        transferred = [count.transfer(finalist) for finalist in finalists_to_reject]
+        if any(transferred):
+            count.sort_race()
+
+    # by here we must have _a_ winner at least. Maybe more.
+    if len(results.get_winners()) == 0:
+        raise RuntimeError("No winners were elected")
+
+    # We have a runoff against No Award; any ballot that ranked the runoff candidate over
+    # the winner here is tallied. If that wins, then no award is granted in the category.
+    if runoff_candidate is not None:
+        results.register_round_results(
+            count.runoff_result(results.get_winners(), runoff_candidate)
+        )
+
+    return results
+
+
+def pyrankvote_hugo_voting(
+    candidates: list[Candidate],
+    ballots: list[Ballot],
+    runoff_candidate: Candidate | None = None,
+) -> ElectionResults:
+    """Count the final ballot by driving pyrankvote's `ElectionManager`.
+
+    This was the implementation of `hugo_voting`, and is kept as its reference."""
     # Because we're working with floating point, we need to account for rounding errors.
     # TODO: see how performance is affected if we switch to Decimal
     rounding_error = 1e-6
@@ -296,9 +653,8 @@ def hugo_voting(
     return results
 
 
-hugo_awards = HugoAwards(
-    results_class=ElectionResults, counter=hugo_voting, hugo_nominations_per_member=5
-)
+# chosen because it means we don't need to deal with floating-point math.
+POINTS_PER_BALLOT = 60
 
 
 @dataclass
@@ -325,9 +681,269 @@ def null_recorder(
     pass
 
 
-def eliminate_works(
-    ballots: NominatingBallots, eliminations: list[str]
-) -> NominatingBallots:
+def records_ballots(record_steps: StepRecorder) -> bool:
+    """Whether *record_steps* looks at the ballots it is handed.
+
+    Recorders that only keep counts set ``records_ballots = False``, so the counting
+    engines can skip building a list of surviving ballots every round."""
+    return getattr(record_steps, "records_ballots", True)
+
+
+class StepLog:
+    """A compact log of the rounds of an EPH count, usable as a `StepRecorder`.
+
+    Rather than a copy of every round's ballots and counts, this keeps the first
+    round's counts and, for each later round, only the counts that changed and the
+    works that dropped out, along with that round's eliminations. Eliminating a work
+    only moves points on the ballots it was on, so most rounds change very few counts.
+
+    Rounds are rebuilt on demand, as ``(ballots, counts, eliminations)`` steps; the
+    ballots are not kept, so each step's ballots are an empty list.
+    """
+
+    records_ballots = False
+
+    def __init__(self):
+        self._current: dict[str, CountData] = {}
+        self._changed: list[dict[str, CountData]] = []
+        self._removed: list[list[str]] = []
+        self._eliminations: list[list[str]] = []
+        self._sizes: list[int] = []
+
+    def __call__(
+        self,
+        ballots: NominatingBallots,
+        counts: dict[str, CountData],
+        eliminations: list[str],
+    ) -> None:
+        current = self._current
+        removed = [work for work in current if work not in counts]
+        changed = {
+            work: replace(data)
+            for work, data in counts.items()
+            if current.get(work) != data
+        }
+        for work in removed:
+            del current[work]
+        current.update(changed)
+
+        self._changed.append(changed)
+        self._removed.append(removed)
+        self._eliminations.append(list(eliminations))
+        self._sizes.append(len(counts))
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def sizes(self) -> list[int]:
+        """The number of works counted in each round."""
+        return list(self._sizes)
+
+    def __iter__(self) -> Iterator[tuple[list, dict[str, CountData], list[str]]]:
+        return self.steps()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, stride = index.indices(len(self))
+            if stride != 1:
+                return list(self.steps(start, stop))[::stride]
+            return list(self.steps(start, stop))
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("step index out of range")
+        return next(self.steps(index, index + 1))
+
+    def steps(
+        self, start: int = 0, stop: int | None = None
+    ) -> Iterator[tuple[list, dict[str, CountData], list[str]]]:
+        """Rebuild the rounds from *start* up to *stop*, one at a time.
+
+        Each yielded round has its own counts dict; the rounds before *start* are
+        replayed into a single dict without being handed out."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        counts: dict[str, CountData] = {}
+        for round_idx in range(stop):
+            if round_idx > start:
+                counts = dict(counts)
+            for work in self._removed[round_idx]:
+                del counts[work]
+            counts.update(self._changed[round_idx])
+            if round_idx >= start:
+                yield [], counts, self._eliminations[round_idx]
+
+
+class InternedBallots:
+    """A compact, read-only set of nominating ballots.
+
+    Work names are interned to dense integer ids, assigned in the order the works
+    first appear, and the ballots are stored as flat arrays: ballot ``b`` holds the
+    entries from ``offsets[b]`` up to ``offsets[b + 1]``, each naming a work id and
+    the number of times the member wrote it down. ``weights[b]`` is the number of
+    members who cast that ballot.
+
+    Because ids follow first appearance, counts keyed by id come out in the same
+    order as counts keyed by name would, so ties are broken identically.
+    """
+
+    def __init__(
+        self,
+        works: list[str],
+        offsets: array,
+        entries: array,
+        written: array,
+        weights: array,
+    ):
+        self.works = works
+        self.offsets = offsets
+        self.entries = entries
+        self.written = written
+        self.weights = weights
+
+    @classmethod
+    def from_ballots(cls, ballots: Iterable[NominatingBallotType]) -> "InternedBallots":
+        return cls.from_weighted_ballots((ballot, 1) for ballot in ballots)
+
+    @classmethod
+    def from_weighted_ballots(
+        cls, ballots: Iterable[tuple[NominatingBallotType, int]]
+    ) -> "InternedBallots":
+        works: list[str] = []
+        work_ids: dict[str, int] = {}
+        offsets = array("L", [0])
+        entries = array("L")
+        written = array("L")
+        weights = array("L")
+
+        for ballot, weight in ballots:
+            for work, count in ballot.items():
+                work_id = work_ids.get(work)
+                if work_id is None:
+                    work_id = work_ids[work] = len(works)
+                    works.append(work)
+                entries.append(work_id)
+                written.append(count)
+            offsets.append(len(entries))
+            weights.append(weight)
+
+        return cls(works, offsets, entries, written, weights)
+
+    def __len__(self) -> int:
+        """The number of distinct ballots."""
+        return len(self.offsets) - 1
+
+    def ballot_count(self) -> int:
+        """The number of ballots cast, counting each distinct ballot by its weight."""
+        return sum(self.weights)
+
+    def __iter__(self):
+        """Yield each ballot as a Counter of work ids."""
+        offsets, entries, written = self.offsets, self.entries, self.written
+        for start, end in zip(offsets, offsets[1:]):
+            yield Counter(dict(zip(entries[start:end], written[start:end])))
+
+    def names(self, work_ids: Iterable[int]) -> list[str]:
+        return [self.works[work_id] for work_id in work_ids]
+
+    def without(self, eliminations: Iterable[int]) -> "InternedBallots":
+        """Return these ballots with the eliminated works removed.
+
+        Ballots left with no works are dropped, as `eliminate_works` does."""
+        eliminated = set(eliminations)
+        offsets = array("L", [0])
+        entries = array("L")
+        written = array("L")
+        weights = array("L")
+
+        old_offsets, old_entries, old_written = (
+            self.offsets,
+            self.entries,
+            self.written,
+        )
+        for start, end, weight in zip(old_offsets, old_offsets[1:], self.weights):
+            for i in range(start, end):
+                if old_entries[i] not in eliminated:
+                    entries.append(old_entries[i])
+                    written.append(old_written[i])
+            if len(entries) > offsets[-1]:
+                offsets.append(len(entries))
+                weights.append(weight)
+
+        return InternedBallots(self.works, offsets, entries, written, weights)
+
+    def named_recorder(self, record_steps: StepRecorder) -> StepRecorder:
+        """Wrap *record_steps* so it sees work names rather than ids.
+
+        The recorder may be handed either interned ballots or Counters of work ids;
+        both are translated back to named ballots. Weighted interned ballots are
+        repeated once for each member who cast them."""
+        if record_steps is null_recorder:
+            return null_recorder
+
+        works = self.works
+        with_ballots = records_ballots(record_steps)
+        # The incremental engine hands over the same, unchanged ballot objects round
+        # after round, so each one is only translated once. The source ballot is kept
+        # alongside its translation so that its id can't be reused.
+        translated: dict[int, tuple[Counter, NominatingBallotType]] = {}
+
+        def named(ballot: Counter) -> NominatingBallotType:
+            cached = translated.get(id(ballot))
+            if cached is not None and cached[0] is ballot:
+                return cached[1]
+            result = Counter({works[w]: n for w, n in ballot.items()})
+            translated[id(ballot)] = (ballot, result)
+            return result
+
+        def recorder(ballots, counts, eliminations):
+            if not with_ballots:
+                named_ballots = []
+            elif isinstance(ballots, InternedBallots):
+                named_ballots = [
+                    named_ballot
+                    for ballot, weight in zip(ballots, ballots.weights)
+                    for named_ballot in [
+                        Counter({works[w]: n for w, n in ballot.items()})
+                    ]
+                    * weight
+                ]
+            else:
+                named_ballots = [named(ballot) for ballot in ballots]
+            record_steps(
+                named_ballots,
+                {works[w]: data for w, data in counts.items()},
+                [works[w] for w in eliminations],
+            )
+
+        recorder.records_ballots = with_ballots
+        return recorder
+
+
+type EPHBallots = NominatingBallots | InternedBallots
+
+
+def deduplicate_ballots(ballots: Iterable[NominatingBallotType]) -> WeightedBallots:
+    """Collapse identical ballots into one, weighted by the number of members who cast it.
+
+    Ballots are kept in the order they first appear, so each work still first appears
+    on the same ballot, and the counts come out in the same order."""
+    weighted: dict[frozenset, list] = {}
+    for ballot in ballots:
+        key = frozenset(ballot.items())
+        entry = weighted.get(key)
+        if entry is None:
+            weighted[key] = [ballot, 1]
+        else:
+            entry[1] += 1
+
+    return [(ballot, weight) for ballot, weight in weighted.values()]
+
+
+def eliminate_works(ballots: EPHBallots, eliminations: Sequence) -> EPHBallots:
+    if isinstance(ballots, InternedBallots):
+        return ballots.without(eliminations)
+
     eliminations_set = set(eliminations)
     cleaned_ballots = [
         Counter({w: n for w, n in ballot.items() if w not in eliminations_set})
@@ -339,13 +955,24 @@ def eliminate_works(
 def eph(
     # Each ballot is one member's nominations, keyed by work with the number of times
     # they wrote it down.
-    ballots: NominatingBallots,
+    ballots: EPHBallots,
     finalist_count: int = 6,
     record_steps: StepRecorder = null_recorder,
 ):
-    """Implement the EPH ballot construction algorithm."""
-    nominating = list(ballots)
+    """Implement the EPH ballot construction algorithm.
+
+    Interned ballots are counted by work id throughout; the finalists and recorded
+    steps are translated back to work names."""
+    if isinstance(ballots, InternedBallots):
+        finalists = _eph(ballots, finalist_count, ballots.named_recorder(record_steps))
+        return None if finalists is None else ballots.names(finalists)
 
+    return _eph(list(ballots), finalist_count, record_steps)
+
+
+def _eph(
+    nominating: EPHBallots, finalist_count: int, record_steps: StepRecorder
+) -> list | None:
     while len(nominating) > 0:
         counts = count_nominations(nominating)
         eliminations = nominations_for_elimination(counts)
@@ -370,10 +997,231 @@ def eph(
         nominating = eliminate_works(nominating, eliminations)
 
 
-def count_nominations(ballots: NominatingBallots) -> dict[str, CountData]:
-    points_per_ballot = (
-        60  # chosen because it means we don't need to deal with floating-point math.
-    )
+class EliminationQueue:
+    """The surviving works of an EPH count, ordered by (points, ballot_count).
+
+    This is a heap over a live counts dict, kept alongside it as points change. Rather
+    than reordering the heap when a work's points change, `update` pushes a fresh entry;
+    entries for eliminated works, or for points a work no longer has, are discarded as
+    they surface.
+    """
+
+    def __init__(self, counts: dict[str, CountData]):
+        self.counts = counts
+        # Ties are reported in the order the works appear in the counts.
+        self.order = {work: index for index, work in enumerate(counts)}
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        self.heap = [
+            (data.points, data.ballot_count, self.order[work], work)
+            for work, data in self.counts.items()
+        ]
+        heapify(self.heap)
+
+    def update(self, works: Iterable[str]) -> None:
+        """Re-queue *works*, whose points have changed."""
+        for work in works:
+            data = self.counts.get(work)
+            if data is not None:
+                heappush(
+                    self.heap, (data.points, data.ballot_count, self.order[work], work)
+                )
+
+        if len(self.heap) > 2 * len(self.counts) + 64:
+            self._rebuild()
+
+    def _pop_live(self) -> tuple | None:
+        while self.heap:
+            entry = heappop(self.heap)
+            data = self.counts.get(entry[3])
+            if data is not None and data.points == entry[0]:
+                return entry
+        return None
+
+    def nominations_for_elimination(self) -> list[str]:
+        """`nominations_for_elimination` for the live counts.
+
+        Only the works with the lowest and second-lowest point totals are taken off the
+        heap, rather than scanning every count."""
+        if len(self.counts) <= 2:
+            candidates = list(self.counts)
+        else:
+            popped: list[tuple] = []
+            selected: list[tuple] = []
+            seen: set[str] = set()
+            group_points: list[int] = []
+            while (entry := self._pop_live()) is not None:
+                if entry[3] in seen:
+                    continue
+                seen.add(entry[3])
+                popped.append(entry)
+                if not group_points or entry[0] != group_points[-1]:
+                    # This entry starts a new points group; the constitution only looks
+                    # past the lowest group when a single work holds it.
+                    if len(group_points) == 2 or (
+                        len(group_points) == 1 and len(selected) >= 2
+                    ):
+                        break
+                    group_points.append(entry[0])
+                selected.append(entry)
+
+            for entry in popped:
+                heappush(self.heap, entry)
+
+            # the lowest group, then the second-lowest, each in the order of the counts
+            selected.sort(key=lambda entry: (entry[0], entry[2]))
+            candidates = [entry[3] for entry in selected]
+
+        fewest = nominations_with_fewest_nominations(
+            {work: self.counts[work] for work in candidates}
+        )
+        return list(fewest.keys())
+
+
+class NominationIndex:
+    """The live state of an EPH count, kept up to date one elimination at a time.
+
+    Alongside the surviving ballots and their counts, this keeps an inverted index from
+    each work to the ballots it appears on, so eliminating a work only has to revisit
+    the ballots that nominated it rather than recounting every ballot in the category.
+    """
+
+    def __init__(
+        self, ballots: Iterable[Counter], weights: Sequence[int] | None = None
+    ):
+        self.ballots: list[Counter | None] = list(ballots)
+        self.weights = [1] * len(self.ballots) if weights is None else list(weights)
+        self.counts = _count_weighted_nominations(self.ballots, self.weights)
+        self.live_ballots = len(self.ballots)
+
+        self.queue = EliminationQueue(self.counts)
+
+        self.ballots_by_work: dict[str, list[int]] = {}
+        for index, ballot in enumerate(self.ballots):
+            for work in ballot:
+                self.ballots_by_work.setdefault(work, []).append(index)
+
+    def eliminate(self, eliminations: list[str]) -> None:
+        """Remove the eliminated works, redistributing points on the affected ballots.
+
+        Eliminating a work never changes how many ballots name a surviving work, or how
+        many times it was written down; only the point share of the ballots it was on
+        changes."""
+        eliminations_set = set(eliminations)
+        affected = sorted(
+            {
+                index
+                for work in eliminations_set
+                for index in self.ballots_by_work.pop(work, [])
+            }
+        )
+
+        changed: set[str] = set()
+        for index in affected:
+            ballot = self.ballots[index]
+            if ballot is None:
+                continue
+
+            old_points = POINTS_PER_BALLOT // len(ballot)
+            # Never mutate a ballot in place; recorders may hold on to earlier rounds.
+            cleaned = Counter(
+                {w: n for w, n in ballot.items() if w not in eliminations_set}
+            )
+            if not cleaned:
+                self.ballots[index] = None
+                self.live_ballots -= 1
+                continue
+
+            self.ballots[index] = cleaned
+            gained = (POINTS_PER_BALLOT // len(cleaned) - old_points) * self.weights[
+                index
+            ]
+            if gained:
+                changed.update(cleaned)
+                for work in cleaned:
+                    self.counts[work].points += gained
+
+        for work in eliminations_set:
+            self.counts.pop(work, None)
+        self.queue.update(changed)
+
+    def nominations_for_elimination(self) -> list[str]:
+        return self.queue.nominations_for_elimination()
+
+    def snapshot(
+        self, with_ballots: bool = True
+    ) -> tuple[NominatingBallots, dict[str, CountData]]:
+        """The surviving ballots and a copy of the counts, as `eph` records them."""
+        ballots = (
+            [
+                repeated
+                for ballot, weight in zip(self.ballots, self.weights)
+                if ballot is not None
+                for repeated in [ballot] * weight
+            ]
+            if with_ballots
+            else []
+        )
+        counts = {work: replace(data) for work, data in self.counts.items()}
+        return ballots, counts
+
+
+def incremental_eph(
+    ballots: EPHBallots,
+    finalist_count: int = 6,
+    record_steps: StepRecorder = null_recorder,
+):
+    """Implement the EPH ballot construction algorithm incrementally.
+
+    This produces the same finalists, and records the same steps, as `eph`, but only
+    recounts the ballots touched by each round's eliminations.
+    """
+    if isinstance(ballots, InternedBallots):
+        finalists = _incremental_eph(
+            NominationIndex(ballots, ballots.weights),
+            finalist_count,
+            ballots.named_recorder(record_steps),
+        )
+        return None if finalists is None else ballots.names(finalists)
+
+    return _incremental_eph(NominationIndex(ballots), finalist_count, record_steps)
+
+
+def _incremental_eph(
+    index: NominationIndex, finalist_count: int, record_steps: StepRecorder
+) -> list | None:
+    recording = record_steps is not null_recorder
+    with_ballots = records_ballots(record_steps)
+
+    while index.live_ballots > 0:
+        eliminations = index.nominations_for_elimination()
+        next_size = len(index.counts) - len(eliminations)
+        if recording:
+            record_steps(
+                *index.snapshot(with_ballots),
+                [] if next_size < finalist_count else eliminations,
+            )
+        if next_size == finalist_count:
+            index.eliminate(eliminations)
+            if recording:
+                record_steps(*index.snapshot(with_ballots), [])
+            return list(index.counts.keys())
+
+        if next_size < finalist_count:
+            return list(index.counts.keys())
+
+        index.eliminate(eliminations)
+
+
+def count_nominations(ballots: EPHBallots) -> dict:
+    """Count the nominations, ballots and points for each work on *ballots*.
+
+    Named ballots are counted by work name; interned ballots by work id."""
+    if isinstance(ballots, InternedBallots):
+        return _count_interned_nominations(ballots)
+
+    points_per_ballot = POINTS_PER_BALLOT
     counts: dict[str, CountData] = {}
     for ballot in ballots:
         divisor = len(ballot)
@@ -392,6 +1240,53 @@ def count_nominations(ballots: NominatingBallots) -> dict[str, CountData]:
     return counts
 
 
+def _count_interned_nominations(ballots: InternedBallots) -> dict[int, CountData]:
+    work_count = len(ballots.works)
+    nominations = [0] * work_count
+    ballot_counts = [0] * work_count
+    points = [0] * work_count
+
+    offsets, entries, written = ballots.offsets, ballots.entries, ballots.written
+    for start, end, weight in zip(offsets, offsets[1:], ballots.weights):
+        nomination_points = POINTS_PER_BALLOT // (end - start) * weight
+        for i in range(start, end):
+            work_id = entries[i]
+            nominations[work_id] += written[i] * weight
+            ballot_counts[work_id] += weight
+            points[work_id] += nomination_points
+
+    return {
+        work_id: CountData(
+            nominations=nominations[work_id],
+            ballot_count=ballot_counts[work_id],
+            points=points[work_id],
+        )
+        for work_id in range(work_count)
+        if ballot_counts[work_id]
+    }
+
+
+def _count_weighted_nominations(
+    ballots: Iterable[Counter], weights: Iterable[int]
+) -> dict:
+    """`count_nominations`, where each ballot stands for *weight* identical ballots."""
+    counts: dict = {}
+    for ballot, weight in zip(ballots, weights):
+        nomination_points = POINTS_PER_BALLOT // len(ballot) * weight
+
+        for work, written_down in ballot.items():
+            count = counts.get(work)
+            if count is None:
+                count = CountData()
+                counts[work] = count
+
+            count.nominations += written_down * weight
+            count.ballot_count += weight
+            count.points += nomination_points
+
+    return counts
+
+
 def nominations_with_fewest_points(
     counts: dict[str, CountData],
 ) -> dict[str, CountData]:
@@ -477,3 +1372,11 @@ def all_min(iterable, key=lambda x: x) -> list:
     sorted_items = sorted(iterable, key=key)
     min_value = key(sorted_items[0])
     return [item for item in sorted_items if key(item) == min_value]
+
+
+hugo_awards = HugoAwards(
+    results_class=ElectionResults,
+    counter=hugo_voting,
+    hugo_nominations_per_member=5,
+    nomination_counter=incremental_eph,
+)
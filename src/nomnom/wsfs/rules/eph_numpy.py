@@ -0,0 +1,213 @@
+"""A NumPy backend for the EPH finalist selection process.
+
+The selection phase is a sparse ballots × works matrix: each ballot shares
+`POINTS_PER_BALLOT` among the works still on it, and a work's points are the sum of
+the shares of the ballots that name it. This keeps that matrix as flat NumPy arrays and
+masks out the entries for eliminated works, rather than rebuilding ballots every round.
+
+NumPy is an optional dependency (`pip install nomnom-hugoawards[numpy]`). Select this
+backend by registering `hugo_awards` from this module as the convention's `HugoAwards`
+service.
+"""
+
+from collections import Counter
+from dataclasses import replace
+
+import numpy as np
+
+from nomnom.wsfs.rules import constitution_2023
+from nomnom.wsfs.rules.constitution_2023 import (
+    POINTS_PER_BALLOT,
+    CountData,
+    EPHBallots,
+    InternedBallots,
+    StepRecorder,
+    null_recorder,
+    records_ballots,
+)
+
+
+class BallotMatrix:
+    """The ballots × works matrix for one EPH count.
+
+    Each entry of the interned ballots is one cell of the matrix. Eliminating a work
+    clears its cells from the live mask; the per-ballot sizes, and so the points, are
+    recomputed from the mask.
+    """
+
+    def __init__(self, ballots: InternedBallots):
+        offsets = np.asarray(ballots.offsets, dtype=np.int64)
+        self.work_count = len(ballots.works)
+        self.entries = np.asarray(ballots.entries, dtype=np.int64)
+        self.ballot_sizes = np.diff(offsets)
+        self.ballot_of_entry = np.repeat(
+            np.arange(len(ballots), dtype=np.int64), self.ballot_sizes
+        )
+        self.weights = np.asarray(ballots.weights, dtype=np.int64)
+        entry_weights = self.weights[self.ballot_of_entry]
+
+        if not self.ballot_sizes.all():
+            raise ZeroDivisionError("An empty ballot has no works to share points")
+
+        # Neither of these change from round to round: eliminating a work never takes a
+        # surviving work off a ballot.
+        self.nominations = np.bincount(
+            self.entries,
+            weights=np.asarray(ballots.written, dtype=np.int64) * entry_weights,
+            minlength=self.work_count,
+        ).astype(np.int64)
+        self.ballot_counts = np.bincount(
+            self.entries, weights=entry_weights, minlength=self.work_count
+        ).astype(np.int64)
+
+        self.live_entries = np.ones(len(self.entries), dtype=bool)
+        self.live_works = self.ballot_counts > 0
+        self.points = self._points()
+
+    @property
+    def live_ballots(self) -> int:
+        return int(np.count_nonzero(self.ballot_sizes))
+
+    def live_work_ids(self) -> np.ndarray:
+        return np.flatnonzero(self.live_works)
+
+    def _points(self) -> np.ndarray:
+        shares = np.zeros_like(self.ballot_sizes)
+        live = self.ballot_sizes > 0
+        shares[live] = POINTS_PER_BALLOT // self.ballot_sizes[live] * self.weights[live]
+        entry_shares = np.where(self.live_entries, shares[self.ballot_of_entry], 0)
+        # the weighted sums are well inside float64's exact integer range
+        return np.bincount(
+            self.entries, weights=entry_shares, minlength=self.work_count
+        ).astype(np.int64)
+
+    def eliminate(self, work_ids: np.ndarray) -> np.ndarray:
+        """Mask out the eliminated works, returning the ballots that lost an entry."""
+        self.live_works[work_ids] = False
+        dropped = self.live_entries & ~self.live_works[self.entries]
+        self.live_entries &= ~dropped
+
+        dropped_ballots = self.ballot_of_entry[dropped]
+        self.ballot_sizes -= np.bincount(
+            dropped_ballots, minlength=len(self.ballot_sizes)
+        )
+        self.points = self._points()
+        return np.unique(dropped_ballots)
+
+    def nominations_for_elimination(self) -> np.ndarray:
+        """The vectorised equivalent of `constitution_2023.nominations_for_elimination`.
+
+        The works are returned in the order the reference implementation returns them.
+        """
+        live = self.live_work_ids()
+        if len(live) <= 2:
+            candidates = live
+        else:
+            points = self.points[live]
+            fewest = points == points.min()
+            if np.count_nonzero(fewest) < 2:
+                fewest |= points == points[~fewest].min()
+            candidates = live[fewest]
+            # the fewest points first, then the second-fewest
+            candidates = candidates[np.argsort(self.points[candidates], kind="stable")]
+
+        ballot_counts = self.ballot_counts[candidates]
+        candidates = candidates[ballot_counts == ballot_counts.min()]
+        if len(candidates) > 1:
+            points = self.points[candidates]
+            candidates = candidates[points == points.min()]
+
+        return candidates
+
+    def counts(self) -> dict[int, CountData]:
+        live = self.live_work_ids()
+        return {
+            work_id: CountData(
+                nominations=nominations, ballot_count=ballot_count, points=points
+            )
+            for work_id, nominations, ballot_count, points in zip(
+                live.tolist(),
+                self.nominations[live].tolist(),
+                self.ballot_counts[live].tolist(),
+                self.points[live].tolist(),
+            )
+        }
+
+
+def _interned(ballots: EPHBallots) -> InternedBallots:
+    if isinstance(ballots, InternedBallots):
+        return ballots
+    return InternedBallots.from_ballots(ballots)
+
+
+def count_nominations(ballots: EPHBallots) -> dict:
+    """`constitution_2023.count_nominations`, computed as a matrix product."""
+    interned = _interned(ballots)
+    counts = BallotMatrix(interned).counts()
+    if interned is ballots:
+        return counts
+    return {interned.works[work_id]: data for work_id, data in counts.items()}
+
+
+def eph(
+    ballots: EPHBallots,
+    finalist_count: int = 6,
+    record_steps: StepRecorder = null_recorder,
+):
+    """Implement the EPH ballot construction algorithm on NumPy arrays.
+
+    This produces the same finalists, and records the same steps, as
+    `constitution_2023.eph`.
+    """
+    interned = _interned(ballots)
+    matrix = BallotMatrix(interned)
+
+    recording = record_steps is not null_recorder
+    record = interned.named_recorder(record_steps)
+    # Recorders are handed whole ballots, so keep those up to date only if asked to.
+    with_ballots = recording and records_ballots(record_steps)
+    surviving_ballots: list[Counter | None] = list(interned) if with_ballots else []
+
+    def snapshot():
+        return (
+            [
+                repeated
+                for ballot, weight in zip(surviving_ballots, interned.weights)
+                if ballot is not None
+                for repeated in [ballot] * weight
+            ],
+            matrix.counts(),
+        )
+
+    def eliminate(eliminations: np.ndarray) -> None:
+        affected = matrix.eliminate(eliminations)
+        if not with_ballots:
+            return
+
+        eliminated = set(eliminations.tolist())
+        for index in affected.tolist():
+            ballot = surviving_ballots[index]
+            cleaned = Counter({w: n for w, n in ballot.items() if w not in eliminated})
+            surviving_ballots[index] = cleaned or None
+
+    while matrix.live_ballots > 0:
+        eliminations = matrix.nominations_for_elimination()
+        next_size = np.count_nonzero(matrix.live_works) - len(eliminations)
+        if recording:
+            record(
+                *snapshot(),
+                [] if next_size < finalist_count else eliminations.tolist(),
+            )
+        if next_size == finalist_count:
+            eliminate(eliminations)
+            if recording:
+                record(*snapshot(), [])
+            return interned.names(matrix.live_work_ids().tolist())
+
+        if next_size < finalist_count:
+            return interned.names(matrix.live_work_ids().tolist())
+
+        eliminate(eliminations)
+
+
+hugo_awards = replace(constitution_2023.hugo_awards, nomination_counter=eph)
@@ -0,0 +1,28 @@
+"""Ballots and runs shared by the EPH engine tests."""
+
+import random
+from collections import Counter
+
+
+def random_ballots(seed: int) -> list[Counter[str]]:
+    rng = random.Random(seed)
+    works = [f"Work {i}" for i in range(rng.randint(5, 120))]
+    # a handful of popular works, and a long tail of one-off nominations
+    popular = rng.choices(works[:10], k=40) + works
+    weighted_choices = [5] * 60 + [4] * 20 + [3] * 10 + [2] * 7 + [1] * 3
+
+    return [
+        Counter(rng.choices(popular, k=rng.choice(weighted_choices)))
+        for _ in range(rng.randint(1, 600))
+    ]
+
+
+def run_recorded(engine, ballots, finalist_count):
+    """The finalists *engine* picks, and the steps it records on the way."""
+    steps = []
+    finalists = engine(
+        ballots,
+        finalist_count=finalist_count,
+        record_steps=lambda b, c, e: steps.append((b, c, e)),
+    )
+    return finalists, steps
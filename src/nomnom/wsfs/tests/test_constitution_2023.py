@@ -1,10 +1,17 @@
+import random
 from typing import Set
 
 import pytest
 from pyrankvote import Ballot, Candidate
+from pyrankvote import helpers as pyrankvote_helpers
 from pyrankvote.helpers import CandidateStatus
 
-from nomnom.wsfs.rules.constitution_2023 import NoFinalists, hugo_voting
+from nomnom.wsfs.rules.constitution_2023 import (
+    ElectionBallots,
+    NoFinalists,
+    hugo_voting,
+    pyrankvote_hugo_voting,
+)
 
 ELECTION_DATA = {
     "candidates": [
@@ -227,3 +234,100 @@ class TestEdgeCases:
         assert rejected(elimination_round) - ignored_eliminations == {d}, (
             f"Unexpected rejected candidates: {rejected(elimination_round)}"
         )
+
+
+def random_election(seed: int) -> tuple[list[Candidate], list[Ballot]]:
+    rng = random.Random(seed)
+    candidates = [Candidate(f"Candidate {i}") for i in range(rng.randint(1, 8))]
+    if rng.random() < 0.7:
+        candidates.append(Candidate("No Award"))
+
+    ballots = [
+        Ballot(rng.sample(candidates, rng.randint(1, len(candidates))))
+        for _ in range(rng.choice([0, 1, 2, 5, 9, 30, 200]))
+    ]
+    return candidates, ballots
+
+
+def round_results(results):
+    return [
+        (
+            [
+                (cr.candidate.name, cr.number_of_votes, cr.status)
+                for cr in round.candidate_results
+            ],
+            round.number_of_blank_votes,
+        )
+        for round in results.rounds
+    ]
+
+
+class RandomTiebreak(Exception):
+    pass
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_hugo_voting_matches_pyrankvote(seed, monkeypatch):
+    candidates, ballots = random_election(seed)
+
+    def random_choice(_):
+        raise RandomTiebreak()
+
+    # pyrankvote settles complete ties for a place in the race at random.
+    monkeypatch.setattr(pyrankvote_helpers.random, "choice", random_choice)
+    try:
+        expected = round_results(pyrankvote_hugo_voting(candidates, ballots))
+    except RandomTiebreak:
+        pytest.skip("pyrankvote broke a tie at random")
+
+    assert round_results(hugo_voting(candidates, ballots)) == expected
+
+
+def test_hugo_voting_counts_empty_ballots_as_exhausted():
+    a = Candidate("Candidate A")
+    b = Candidate("Candidate B")
+
+    results = hugo_voting([a, b], [Ballot([a]), Ballot([a]), Ballot([b]), Ballot([])])
+
+    assert results.get_winners() == [a]
+    assert results.rounds[0].number_of_blank_votes == 1.0
+
+
+def test_hugo_voting_matches_pyrankvote_on_a_large_final_ballot():
+    rng = random.Random(0)
+    candidates = [Candidate(f"Candidate {i}") for i in range(6)]
+    candidates.append(Candidate("No Award"))
+    ballots = [
+        Ballot(rng.sample(candidates, rng.randint(1, len(candidates))))
+        for _ in range(10_000)
+    ]
+
+    # how long this takes is measured by the hugo_voting benchmark in
+    # `nomnom.convention_admin.benchmarks`
+    assert round_results(hugo_voting(candidates, ballots)) == round_results(
+        pyrankvote_hugo_voting(candidates, ballots)
+    )
+
+
+def test_hugo_voting_rejects_ballots_ranking_unknown_candidates():
+    a, b, stranger = Candidate("A"), Candidate("B"), Candidate("Stranger")
+
+    with pytest.raises(ValueError, match="Stranger"):
+        hugo_voting([a, b], [Ballot([a, b]), Ballot([b, stranger])])
+
+
+def test_election_ballots_without_candidates():
+    a, b, c = Candidate("A"), Candidate("B"), Candidate("C")
+    untouched = Ballot([b, c])
+    election_ballots = ElectionBallots(
+        candidates=[a, b, c],
+        ballots=[Ballot([a, b]), untouched, Ballot([a])],
+    )
+
+    remaining = election_ballots.without([a])
+
+    assert remaining.candidates == [b, c]
+    # the ballot that only ranked A is dropped
+    assert [ballot.ranked_candidates for ballot in remaining.ballots] == [(b,), (b, c)]
+    assert remaining.ballots[1] is untouched
+    assert election_ballots.candidates == [a, b, c]
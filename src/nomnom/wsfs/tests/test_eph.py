@@ -1,3 +1,4 @@
+import pickle
 import random
 import time
 from collections import Counter
@@ -8,6 +9,7 @@ from faker import Faker
 from rich.pretty import pprint
 
 from nomnom.wsfs.rules import constitution_2023 as eph
+from nomnom.wsfs.tests.helpers import random_ballots, run_recorded
 
 
 def as_ballots(ballots: Iterable[Collection[str]]) -> list[Counter[str]]:
@@ -384,3 +386,278 @@ def test_elimination_compares_ballots_not_times_written_down():
         "the work on the fewest ballots should be eliminated"
     )
     assert "Single" in finalists
+
+
+@pytest.mark.parametrize("finalist_count", [1, 2, 4, 6])
+def test_incremental_eph_matches_eph_on_simple_ballots(ballots, finalist_count):
+    expected = run_recorded(eph.eph, ballots, finalist_count)
+    actual = run_recorded(eph.incremental_eph, ballots, finalist_count)
+
+    assert actual == expected
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_incremental_eph_matches_eph_on_random_ballots(seed):
+    rng = random.Random(seed)
+    works = [f"Work {i}" for i in range(rng.randint(5, 80))]
+    weighted_choices = [5] * 60 + [4] * 20 + [3] * 10 + [2] * 7 + [1] * 3
+
+    ballots = as_ballots(
+        rng.choices(works, k=rng.choice(weighted_choices))
+        for _ in range(rng.randint(1, 400))
+    )
+
+    expected = run_recorded(eph.eph, ballots, 6)
+    actual = run_recorded(eph.incremental_eph, ballots, 6)
+
+    assert actual == expected
+    # and the engine must not have rewritten the ballots it was handed
+    assert ballots == as_ballots(list(b.elements()) for b in ballots)
+
+
+def test_incremental_eph_does_not_rewrite_recorded_steps():
+    ballots = as_ballots(
+        [
+            ["A Meal of Thorns", "A Meal of Thorns", "Hugo, Girl!"],
+            ["A Meal of Thorns", "Octothorpe"],
+            ["Hugo, Girl!"],
+            ["Hugo, Girl!", "Hugos There"],
+        ]
+    )
+
+    _, steps = run_recorded(eph.incremental_eph, ballots, 2)
+
+    first_ballots, first_counts, first_eliminations = steps[0]
+    assert first_ballots == ballots
+    assert first_counts == eph.count_nominations(ballots)
+    assert first_eliminations
+
+
+def test_incremental_eph_without_recorder_matches_eph(ballots):
+    assert eph.incremental_eph(ballots, finalist_count=4) == eph.eph(
+        ballots, finalist_count=4
+    )
+
+
+def test_interned_ballots_round_trip():
+    ballots = as_ballots(
+        [
+            ["Octothorpe", "Octothorpe", "Hugos There"],
+            ["Hugos There"],
+            ["A Meal of Thorns", "Octothorpe"],
+        ]
+    )
+    interned = eph.InternedBallots.from_ballots(ballots)
+
+    assert len(interned) == 3
+    assert interned.works == ["Octothorpe", "Hugos There", "A Meal of Thorns"]
+    assert [interned.names(ballot.elements()) for ballot in interned] == [
+        list(ballot.elements()) for ballot in ballots
+    ]
+
+
+def test_interned_ballots_without_drops_emptied_ballots():
+    interned = eph.InternedBallots.from_ballots(
+        as_ballots([["Octothorpe", "Hugos There"], ["Hugos There"], ["Octothorpe"]])
+    )
+
+    remaining = interned.without([interned.works.index("Hugos There")])
+
+    assert len(remaining) == 2
+    assert [interned.names(ballot) for ballot in remaining] == [
+        ["Octothorpe"],
+        ["Octothorpe"],
+    ]
+
+
+def test_count_nominations_on_interned_ballots(works, ballots):
+    interned = eph.InternedBallots.from_ballots(ballots)
+
+    counts = eph.count_nominations(interned)
+
+    assert {interned.works[w]: c for w, c in counts.items()} == (
+        eph.count_nominations(ballots)
+    )
+    assert interned.names(eph.nominations_for_elimination(counts)) == (
+        eph.nominations_for_elimination(eph.count_nominations(ballots))
+    )
+
+
+@pytest.mark.parametrize("engine", [eph.eph, eph.incremental_eph])
+@pytest.mark.parametrize("seed", range(5))
+def test_eph_on_interned_ballots_matches_named_ballots(engine, seed):
+    rng = random.Random(seed)
+    works = [f"Work {i}" for i in range(rng.randint(5, 80))]
+
+    ballots = as_ballots(
+        rng.choices(works, k=rng.randint(1, 5)) for _ in range(rng.randint(1, 400))
+    )
+
+    expected = run_recorded(eph.eph, ballots, 6)
+    actual = run_recorded(engine, eph.InternedBallots.from_ballots(ballots), 6)
+
+    assert actual == expected
+
+
+def test_deduplicate_ballots_keeps_first_appearance_order():
+    ballots = as_ballots(
+        [
+            ["Octothorpe", "Hugos There"],
+            ["A Meal of Thorns"],
+            ["Hugos There", "Octothorpe"],
+            ["Octothorpe", "Octothorpe", "Hugos There"],
+            ["A Meal of Thorns"],
+            ["Hugos There", "Octothorpe"],
+        ]
+    )
+
+    assert eph.deduplicate_ballots(ballots) == [
+        (Counter(["Octothorpe", "Hugos There"]), 3),
+        (Counter(["A Meal of Thorns"]), 2),
+        (Counter(["Octothorpe", "Octothorpe", "Hugos There"]), 1),
+    ]
+
+
+def test_count_nominations_on_weighted_ballots(ballots):
+    interned = eph.InternedBallots.from_weighted_ballots(
+        eph.deduplicate_ballots(ballots)
+    )
+
+    assert len(interned) < len(ballots), "the fixture has two identical ballots"
+    assert interned.ballot_count() == len(ballots)
+    assert {
+        interned.works[w]: c for w, c in eph.count_nominations(interned).items()
+    } == eph.count_nominations(ballots)
+
+
+@pytest.mark.parametrize("engine", [eph.eph, eph.incremental_eph])
+@pytest.mark.parametrize("seed", range(5))
+def test_eph_on_weighted_ballots_matches_reference(engine, seed):
+    rng = random.Random(seed)
+    # few works and short ballots, so that many members cast identical ballots
+    works = [f"Work {i}" for i in range(rng.randint(7, 15))]
+    ballots = as_ballots(
+        rng.sample(works, k=rng.randint(1, 3)) for _ in range(rng.randint(50, 400))
+    )
+    weighted = eph.InternedBallots.from_weighted_ballots(
+        eph.deduplicate_ballots(ballots)
+    )
+
+    expected_finalists, expected_steps = run_recorded(eph.eph, ballots, 6)
+    finalists, steps = run_recorded(engine, weighted, 6)
+
+    assert finalists == expected_finalists
+    assert len(steps) == len(expected_steps)
+    for (b, c, e), (expected_b, expected_c, expected_e) in zip(steps, expected_steps):
+        assert (c, e) == (expected_c, expected_e)
+        # identical ballots are recorded together, rather than where they were cast
+        assert sorted(map(sorted, b)) == sorted(map(sorted, expected_b))
+
+
+@pytest.mark.parametrize("engine", [eph.eph, eph.incremental_eph])
+@pytest.mark.parametrize("seed", range(5))
+def test_step_log_replays_the_recorded_steps(engine, seed):
+    ballots = random_ballots(seed)
+    _, expected = run_recorded(eph.eph, ballots, 6)
+
+    log = eph.StepLog()
+    engine(ballots, finalist_count=6, record_steps=log)
+
+    assert len(log) == len(expected)
+    assert log.sizes() == [len(c) for _, c, _ in expected]
+    assert [(c, e) for _, c, e in log] == [(c, e) for _, c, e in expected]
+
+
+def test_step_log_rebuilds_any_round_on_demand():
+    ballots = random_ballots(3)
+    _, expected = run_recorded(eph.eph, ballots, 6)
+    expected = [([], c, e) for _, c, e in expected]
+
+    log = eph.StepLog()
+    eph.incremental_eph(ballots, finalist_count=6, record_steps=log)
+
+    assert log[0] == expected[0]
+    assert log[-1] == expected[-1]
+    assert log[len(log) // 2] == expected[len(expected) // 2]
+    assert log[2:] == expected[2:]
+    with pytest.raises(IndexError):
+        log[len(log)]
+
+
+def test_step_log_only_keeps_changed_counts():
+    ballots = as_ballots([["A", "B"], ["A", "C"], ["D"], ["E"], ["E", "F"]])
+
+    log = eph.StepLog()
+    log(ballots, eph.count_nominations(ballots), ["B", "C"])
+    log(ballots, eph.count_nominations(eph.eliminate_works(ballots, ["B", "C"])), [])
+
+    # only A's points change once B and C are gone
+    assert log._changed[1] == {"A": eph.CountData(2, 2, 120)}
+    assert log._removed[1] == ["B", "C"]
+    assert list(log[1][1]) == ["A", "D", "E", "F"]
+
+
+def test_step_log_is_not_handed_ballots():
+    handed = []
+
+    log = eph.StepLog()
+
+    def recorder(ballots, counts, eliminations):
+        handed.append(ballots)
+        log(ballots, counts, eliminations)
+
+    recorder.records_ballots = False
+
+    eph.incremental_eph(random_ballots(0), record_steps=recorder)
+    eph.incremental_eph(
+        eph.InternedBallots.from_ballots(random_ballots(0)), record_steps=recorder
+    )
+
+    assert handed and all(ballots == [] for ballots in handed)
+
+
+def test_step_log_can_be_pickled():
+    """Step logs are kept in the cache between requests."""
+    log = eph.StepLog()
+    eph.incremental_eph(random_ballots(2), record_steps=log)
+
+    restored = pickle.loads(pickle.dumps(log))
+
+    assert list(restored) == list(log)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_elimination_queue_matches_reference_selection(seed):
+    rng = random.Random(seed)
+    # small ranges, so that points and ballot counts tie often
+    counts = {
+        f"Work {i}": eph.CountData(
+            nominations=0, ballot_count=rng.randint(1, 4), points=rng.randint(1, 6)
+        )
+        for i in range(rng.randint(1, 12))
+    }
+    queue = eph.EliminationQueue(counts)
+
+    while counts:
+        expected = eph.nominations_for_elimination(counts)
+        assert queue.nominations_for_elimination() == expected
+
+        for work in expected:
+            del counts[work]
+        raised = rng.sample(list(counts), k=min(len(counts), 3))
+        for work in raised:
+            counts[work].points += rng.randint(0, 3)
+        queue.update(raised)
+
+
+def test_elimination_queue_discards_stale_entries():
+    counts = {f"Work {i}": eph.CountData(1, 1, i) for i in range(100)}
+    queue = eph.EliminationQueue(counts)
+
+    for _ in range(10):
+        for data in counts.values():
+            data.points += 100
+        queue.update(counts)
+
+    assert len(queue.heap) <= 2 * len(counts) + 64
+    assert queue.nominations_for_elimination() == ["Work 0"]
@@ -0,0 +1,70 @@
+import pytest
+
+from nomnom.wsfs.rules import constitution_2023 as eph
+
+pytest.importorskip("numpy")
+
+from nomnom.wsfs.rules import eph_numpy
+from nomnom.wsfs.tests.helpers import random_ballots, run_recorded
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_count_nominations_matches_reference(seed):
+    ballots = random_ballots(seed)
+
+    assert eph_numpy.count_nominations(ballots) == eph.count_nominations(ballots)
+
+    interned = eph.InternedBallots.from_ballots(ballots)
+    assert eph_numpy.count_nominations(interned) == eph.count_nominations(interned)
+
+
+@pytest.mark.parametrize("finalist_count", [1, 2, 6])
+@pytest.mark.parametrize("seed", range(20))
+def test_eph_matches_reference(seed, finalist_count):
+    ballots = random_ballots(seed)
+
+    expected = run_recorded(eph.eph, ballots, finalist_count)
+
+    assert run_recorded(eph_numpy.eph, ballots, finalist_count) == expected
+    assert (
+        run_recorded(
+            eph_numpy.eph, eph.InternedBallots.from_ballots(ballots), finalist_count
+        )
+        == expected
+    )
+
+
+def test_eph_without_recorder_matches_reference():
+    ballots = random_ballots(0)
+
+    assert eph_numpy.eph(ballots) == eph.eph(ballots)
+
+
+def test_recorded_counts_are_plain_integers():
+    """The recorded steps are serialised to JSON for the Sankey diagram."""
+    _, steps = run_recorded(eph_numpy.eph, random_ballots(1), 6)
+
+    for _ballots, counts, _eliminations in steps:
+        for data in counts.values():
+            assert type(data.points) is int
+            assert type(data.nominations) is int
+            assert type(data.ballot_count) is int
+
+
+def test_hugo_awards_selects_numpy_backend():
+    assert eph_numpy.hugo_awards.nomination_counter is eph_numpy.eph
+    assert eph_numpy.hugo_awards.counter is eph.hugo_awards.counter
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_eph_on_weighted_ballots_matches_reference(seed):
+    ballots = random_ballots(seed)
+    weighted = eph.InternedBallots.from_weighted_ballots(
+        eph.deduplicate_ballots(ballots)
+    )
+
+    expected_finalists, expected_steps = run_recorded(eph.eph, ballots, 6)
+    finalists, steps = run_recorded(eph_numpy.eph, weighted, 6)
+
+    assert finalists == expected_finalists
+    assert [(c, e) for _, c, e in steps] == [(c, e) for _, c, e in expected_steps]